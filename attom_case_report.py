@@ -4,30 +4,62 @@ ATTOM Chapter 7 Property Snapshot (One-Screen, Trust-Oriented)
 
 - Prompts for API key (hidden)
 - Prompts for a full address
-- Resolves ATTOM ID
+- Resolves ATTOM ID (skipped when any spelling of the address was resolved before;
+  the index is shared with the OCR service, see ATTOM_ID_INDEX_DB)
 - Pulls: owner, mortgage, AVM, assessment, sale history (best available)
 - Prints a clean, one-screen report suitable for a screenshot
-- Saves raw JSON responses for audit/trustee support
+- Archives raw JSON responses for audit/trustee support: compressed, stored once
+  per distinct payload, indexed by address/attomId/endpoint/time (--archive DIR)
+- --lookup ADDRESS_OR_ID lists archived evidence; --export ADDRESS_OR_ID --to DIR
+  writes the trustee support files (attom_*.json + manifest.json)
+
+Batch mode (non-interactive; API key from ATTOM_API_KEY or a prompt):
+  python3 attom_case_report.py --batch addresses.csv --out attom-batch --workers 8
+- raw responses go to the evidence archive
+- summary.jsonl and summary.csv for the whole run
+- progress checkpointed to checkpoint.jsonl: re-running the same command
+  resumes, skipping addresses already done (errors are retried; partial rows
+  too with --retry-partial)
 
 Termux notes:
   pkg install python -y
   pip install requests
 """
 
+import argparse
+import csv
 import json
+import os
 import sys
+import time
 import getpass
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timezone
 
 try:
     import requests
+    from requests.adapters import HTTPAdapter
 except ImportError:
     print("Missing dependency: requests")
     print("Fix in Termux:")
     print("  pip install requests")
     sys.exit(1)
 
-BASE = "https://api.gateway.attomdata.com/propertyapi/v1.0.0"
+# Address canonicalization and the attomId index are shared with the OCR service
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "backend", "ocr-service"))
+try:
+    from services.address_index import AttomIdIndex, canonicalize_address
+    from services.rate_limiter import RETRYABLE_STATUS, TokenBucket, backoff_delay
+    from services.evidence_archive import DEFAULT_ARCHIVE_DIR, EvidenceArchive
+    from services.attom_extractors import extract_section
+except ImportError:
+    print("Missing shared modules in backend/ocr-service/services/")
+    print("Run this script from a full checkout of the repository.")
+    sys.exit(1)
+
+# ATTOM_BASE_URL points the CLI at a mirror such as backend/ocr-service/benchmarks/attom_standin.py
+BASE = os.getenv("ATTOM_BASE_URL", "https://api.gateway.attomdata.com/propertyapi/v1.0.0").rstrip("/")
 
 
 # ---------------------------
@@ -61,14 +93,20 @@ def safe_get(d, path, default=None):
     except Exception:
         return default
 
-def save_json(filename, data):
-    with open(filename, "w") as f:
-        json.dump(data, f, indent=2)
-
-def call_attom(apikey, endpoint, params=None):
+def call_attom(apikey, endpoint, params=None, session=None, bucket=None, retries=0):
+    """
+    session: reuse pooled keep-alive connections (batch mode)
+    bucket: TokenBucket pacing requests; retries: extra attempts on 429/5xx
+    """
     url = f"{BASE}{endpoint}"
     headers = {"Accept": "application/json", "APIKey": apikey}
-    r = requests.get(url, headers=headers, params=params, timeout=30)
+    for attempt in range(retries + 1):
+        if bucket is not None:
+            bucket.acquire()
+        r = (session or requests).get(url, headers=headers, params=params, timeout=30)
+        if r.status_code not in RETRYABLE_STATUS or attempt == retries:
+            break
+        time.sleep(backoff_delay(attempt, retry_after=r.headers.get("Retry-After")))
     try:
         j = r.json()
     except Exception:
@@ -86,148 +124,332 @@ def short_status_line(name, http_code, j):
 
 
 # ---------------------------
-# Extraction (EXACT PATHS)
+# Extraction (field paths live in services/attom_extractors.py, shared with the OCR service)
 # ---------------------------
 
 def extract_owner(owner_json):
-    # attom_owner.json structure you pasted:
-    # property[0].owner.owner1.fullname etc.
-    p = safe_get(owner_json, ["property", 0], {})
-    addr = safe_get(p, ["address", "oneLine"], "N/A")
-
-    o = safe_get(p, ["owner"], {}) or {}
-    corp = safe_get(o, ["corporateindicator"], None)
-    absentee = safe_get(o, ["absenteeownerstatus"], None)
-
-    owner1 = safe_get(o, ["owner1", "fullname"], None)
-    owner2 = safe_get(o, ["owner2", "fullname"], None)
-    mailing = safe_get(o, ["mailingaddressoneline"], None)
-
-    owners = [x for x in [owner1, owner2] if x]
+    o = extract_section("owner", owner_json)
+    owners = [x for x in [o["owner1"], o["owner2"]] if x]
     owners_str = " & ".join(owners) if owners else "N/A"
 
     return {
-        "address_one_line": addr,
+        "address_one_line": o["address_one_line"] or "N/A",
         "owners": owners_str,
-        "corporateindicator": corp,
-        "absenteeownerstatus": absentee,
-        "mailing": mailing
+        "corporateindicator": o["is_corporate"],
+        "absenteeownerstatus": o["is_absentee"],
+        "mailing": o["mailing_address"]
     }
 
 def extract_profile(detail_json):
-    p = safe_get(detail_json, ["property", 0], {})
-    summary = safe_get(p, ["summary"], {}) or {}
-    building = safe_get(p, ["building"], {}) or {}
-    size = safe_get(building, ["size"], {}) or {}
-    rooms = safe_get(building, ["rooms"], {}) or {}
-    lot = safe_get(p, ["lot"], {}) or {}
-
-    prop_type = safe_get(summary, ["propertyType"], None) or safe_get(summary, ["propclass"], None)
-    year = safe_get(summary, ["yearbuilt"], None)
-    beds = safe_get(rooms, ["beds"], None)
-    baths = safe_get(rooms, ["bathstotal"], None)
-    sqft = safe_get(size, ["livingsize"], None) or safe_get(size, ["bldgsize"], None)
-
-    acres = safe_get(lot, ["lotsize1"], None)
-    lotsqft = safe_get(lot, ["lotsize2"], None)
-    pool = safe_get(lot, ["pooltype"], None)
-
+    p = extract_section("profile", detail_json)
     return {
-        "property_type": prop_type,
-        "year_built": year,
-        "beds": beds,
-        "baths": baths,
-        "living_sqft": sqft,
-        "lot_acres": acres,
-        "lot_sqft": lotsqft,
-        "pool": pool,
+        "property_type": p["type"],
+        "year_built": p["year_built"],
+        "beds": p["beds"],
+        "baths": p["baths"],
+        "living_sqft": p["sqft"],
+        "lot_acres": p["lot_acres"],
+        "lot_sqft": p["lot_sqft"],
+        "pool": p["pool"],
     }
 
 def extract_mortgage(mort_json):
-    # You pasted:
-    # property[0].mortgage.amount, date, loantypecode, interestratetype, lender.lastname, etc.
-    p = safe_get(mort_json, ["property", 0], {})
-    m = safe_get(p, ["mortgage"], {}) or {}
-
-    mort_amt = safe_get(m, ["amount"], None)
-    mort_date = safe_get(m, ["date"], None)
-    loan_type = safe_get(m, ["loantypecode"], None)
-    rate_type = safe_get(m, ["interestratetype"], None)
-
-    lender = safe_get(m, ["lender"], {}) or {}
-    lender_name = safe_get(lender, ["lastname"], None)
-    lender_city = safe_get(lender, ["city"], None)
-    lender_state = safe_get(lender, ["state"], None)
-
-    title = safe_get(m, ["title"], {}) or {}
-    title_company = safe_get(title, ["companyname"], None)
-
+    m = extract_section("mortgage", mort_json)
     return {
-        "mortgage_amount": mort_amt,
-        "mortgage_date": mort_date,
-        "loan_type": loan_type,
-        "rate_type": rate_type,
-        "lender_name": lender_name,
-        "lender_city": lender_city,
-        "lender_state": lender_state,
-        "title_company": title_company
+        "mortgage_amount": m["amount"],
+        "mortgage_date": m["date"],
+        "loan_type": m["loan_type"],
+        "rate_type": m["rate_type"],
+        "lender_name": m["lender_name"],
+        "lender_city": m["lender_city"],
+        "lender_state": m["lender_state"],
+        "title_company": m["title_company"]
     }
 
 def extract_avm(avm_json):
-    # You pasted:
-    # property[0].avm.eventDate
-    # property[0].avm.amount.value/low/high/scr/fsd
-    p = safe_get(avm_json, ["property", 0], {})
-    avm = safe_get(p, ["avm"], {}) or {}
-    amt = safe_get(avm, ["amount"], {}) or {}
-
+    a = extract_section("avm", avm_json)
     return {
-        "avm_date": safe_get(avm, ["eventDate"], None),
-        "value": safe_get(amt, ["value"], None),
-        "low": safe_get(amt, ["low"], None),
-        "high": safe_get(amt, ["high"], None),
-        "scr": safe_get(amt, ["scr"], None),
-        "fsd": safe_get(amt, ["fsd"], None),
+        "avm_date": a["date"],
+        "value": a["value"],
+        "low": a["low"],
+        "high": a["high"],
+        "scr": a["confidence_score"],
+        "fsd": a["fsd"],
     }
 
 def extract_assessment(assess_json):
-    # We’ll try to read common fields if present; if missing, show N/A.
-    p = safe_get(assess_json, ["property", 0], {})
-    a = safe_get(p, ["assessment"], {}) or {}
-
-    # Many ATTOM assessment payloads vary; we capture what exists.
-    assessed = safe_get(a, ["assessed", "assdTtlValue"], None) or safe_get(a, ["assessedValue"], None)
-    taxamt = safe_get(a, ["tax", "taxamt"], None) or safe_get(a, ["taxAmount"], None)
-    taxyear = safe_get(a, ["tax", "taxyear"], None) or safe_get(a, ["taxYear"], None)
-
-    # If your attom_assess.json is the one you already used (showed tax block),
-    # the path may be property[0].assessment.tax.taxamt etc. This covers it.
+    # Many ATTOM assessment payloads vary; the spec falls back across the known layouts
+    return extract_section("assessment", assess_json)
 
+def extract_sale(sales_json):
+    s = extract_section("sale", sales_json)
     return {
-        "assessed_value": assessed,
-        "tax_amount": taxamt,
-        "tax_year": taxyear
+        "sale_price": s["price"],
+        "sale_date": s["date"]
     }
 
-def extract_sale(sales_json):
-    # Sales history varies a lot. We'll look for a “sale” record with date/amount.
-    p = safe_get(sales_json, ["property", 0], {})
-    sale = safe_get(p, ["sale"], {}) or {}
-    # fallback: some endpoints use "saleshistory" arrays, but we’ll keep safe
-    sale_price = safe_get(sale, ["amount", "saleamt"], None) or safe_get(sale, ["saleamt"], None)
-    sale_date = safe_get(sale, ["saleTransDate"], None) or safe_get(sale, ["salesearchdate"], None) or safe_get(sale, ["date"], None)
 
-    return {
-        "sale_price": sale_price,
-        "sale_date": sale_date
-    }
+# ---------------------------
+# Batch mode
+# ---------------------------
+
+# (key, endpoint) pulled by ID for every property
+EVIDENCE_PULLS = [
+    ("owner", "/property/detailowner"),
+    ("detail", "/property/detail"),
+    ("mort_owner", "/property/detailmortgageowner"),
+    ("avm", "/attomavm/detail"),
+    ("assess", "/assessment/detail"),
+    ("sales", "/sale/detail"),
+]
+
+SUMMARY_FIELDS = [
+    "address", "canonical_address", "status", "attom_id", "owners", "mailing",
+    "avm_value", "avm_low", "avm_high", "avm_date", "mortgage_amount", "lender_name",
+    "equity", "equity_low", "equity_high", "assessed_value", "tax_amount", "tax_year",
+    "sale_date", "sale_price", "endpoints", "error", "completed_at",
+]
+
+def read_addresses(csv_path, column=None):
+    """
+    Addresses from a CSV, in file order.
+    column: header name to read; raises ValueError when the header lacks it.
+    Without one, the "address" column if there is one, else the first column
+    of a headerless file.
+    """
+    with open(csv_path, newline="", encoding="utf-8-sig") as f:
+        rows = list(csv.reader(f))
+    if not rows:
+        return []
+    header = [h.strip().lower() for h in rows[0]]
+    name = (column or "address").lower()
+    if name in header:
+        idx = header.index(name)
+        rows = rows[1:]
+    elif column:
+        raise ValueError(f"No column {column!r} in {csv_path} (header: {', '.join(rows[0])})")
+    else:
+        idx = 0
+    return [row[idx].strip() for row in rows if len(row) > idx and row[idx].strip()]
+
+def process_address(apikey, address, archive, session, id_index, bucket, retries):
+    """Pull, archive and summarize one property; never raises"""
+    canonical = canonicalize_address(address) or address
+    row = {"address": address, "canonical_address": canonical}
+    try:
+        attom_id = id_index.get(address)
+        labels = ["ID INDEX"] if attom_id else []
+        if not attom_id:
+            http_id, j_id = call_attom(apikey, "/property/id", {"address": address}, session, bucket, retries)
+            archive.put(j_id, address, safe_get(j_id, ["property", 0, "identifier", "attomId"]), "/property/id")
+            if http_id != 200 or not status_ok(j_id):
+                raise ValueError(short_status_line("ID", http_id, j_id))
+            attom_id = safe_get(j_id, ["property", 0, "identifier", "attomId"], None)
+            if not attom_id:
+                raise ValueError("No attomId found in response")
+            id_index.put(address, attom_id)
+            labels.append("ID OK")
+        row["attom_id"] = attom_id
+
+        pulls = {}
+        for key, endpoint in EVIDENCE_PULLS:
+            pulls[key] = call_attom(apikey, endpoint, {"id": attom_id}, session, bucket, retries)
+            archive.put(pulls[key][1], address, attom_id, endpoint)
+            labels.append(f"{key.upper()} {'OK' if pulls[key][0] == 200 and status_ok(pulls[key][1]) else 'CHECK'}")
+
+        owner_info = extract_owner(pulls["owner"][1])
+        mort = extract_mortgage(pulls["mort_owner"][1])
+        avm = extract_avm(pulls["avm"][1])
+        assess = extract_assessment(pulls["assess"][1])
+        sale = extract_sale(pulls["sales"][1])
+        mort_amt = mort["mortgage_amount"]
+
+        def minus_mortgage(x):
+            return (x - mort_amt) if (x is not None and mort_amt is not None) else None
+
+        row.update({
+            "status": "partial" if any(label.endswith("CHECK") for label in labels) else "ok",
+            "owners": owner_info["owners"],
+            "mailing": owner_info["mailing"],
+            "avm_value": avm["value"],
+            "avm_low": avm["low"],
+            "avm_high": avm["high"],
+            "avm_date": avm["avm_date"],
+            "mortgage_amount": mort_amt,
+            "lender_name": mort["lender_name"],
+            "equity": minus_mortgage(avm["value"]),
+            "equity_low": minus_mortgage(avm["low"]),
+            "equity_high": minus_mortgage(avm["high"]),
+            "assessed_value": assess["assessed_value"],
+            "tax_amount": assess["tax_amount"],
+            "tax_year": assess["tax_year"],
+            "sale_date": sale["sale_date"],
+            "sale_price": sale["sale_price"],
+            "endpoints": " | ".join(labels),
+        })
+    except Exception as e:
+        row.update({"status": "error", "error": str(e)})
+    row["completed_at"] = utc_now_str()
+    return row
+
+def load_checkpoint(path):
+    """canonical address -> latest row recorded for it"""
+    done = {}
+    if os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    row = json.loads(line)
+                except ValueError:
+                    continue  # torn last line from an interrupted run
+                done[row["canonical_address"]] = row
+    return done
+
+def run_batch(args):
+    apikey = os.getenv("ATTOM_API_KEY", "").strip()
+    if not apikey:
+        apikey = getpass.getpass("Enter ATTOM APIKey (input hidden): ").strip()
+    if not apikey:
+        print("No API key (set ATTOM_API_KEY).")
+        sys.exit(1)
+
+    try:
+        addresses = read_addresses(args.batch, args.column)
+    except ValueError as e:
+        print(str(e))
+        sys.exit(1)
+    if not addresses:
+        print(f"No addresses in {args.batch}")
+        sys.exit(1)
+    os.makedirs(args.out, exist_ok=True)
+
+    checkpoint_path = os.path.join(args.out, "checkpoint.jsonl")
+    done = load_checkpoint(checkpoint_path)
+    retry = {"error", "partial"} if args.retry_partial else {"error"}
+    # One run per property, even when co-debtors list it with different spellings
+    pending = {}
+    for address in addresses:
+        canonical = canonicalize_address(address) or address
+        previous = done.get(canonical)
+        if (previous is None or previous["status"] in retry) and canonical not in pending:
+            pending[canonical] = address
+    print(f"{len(addresses)} addresses, {len(pending)} to fetch ({len(addresses) - len(pending)} done or duplicate)")
+
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=args.workers)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    bucket = TokenBucket(args.rate) if args.rate else None
+    id_index = AttomIdIndex()
+    archive = EvidenceArchive(args.archive)
+    lock = threading.Lock()
+
+    started = time.time()
+    with open(checkpoint_path, "a", encoding="utf-8") as checkpoint, \
+            ThreadPoolExecutor(max_workers=args.workers) as pool:
+        futures = [
+            pool.submit(process_address, apikey, address, archive, session, id_index, bucket, args.retries)
+            for address in pending.values()
+        ]
+        for n, future in enumerate(as_completed(futures), 1):
+            row = future.result()
+            with lock:
+                checkpoint.write(json.dumps(row, default=str) + "\n")
+                checkpoint.flush()
+                done[row["canonical_address"]] = row
+            print(f"[{n}/{len(futures)}] {row['status'].upper():7} {row['address']}"
+                  + (f"  ({row['error']})" if row.get("error") else ""))
+
+    # Summary in input order (duplicates repeat their property's row under their own spelling)
+    rows = []
+    for address in addresses:
+        row = done.get(canonicalize_address(address) or address)
+        if row is not None:
+            rows.append({**row, "address": address})
+    with open(os.path.join(args.out, "summary.jsonl"), "w", encoding="utf-8") as f:
+        for row in rows:
+            f.write(json.dumps(row, default=str) + "\n")
+    with open(os.path.join(args.out, "summary.csv"), "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=SUMMARY_FIELDS, extrasaction="ignore")
+        writer.writeheader()
+        writer.writerows(rows)
+
+    counts = {}
+    for row in rows:
+        counts[row["status"]] = counts.get(row["status"], 0) + 1
+    print(f"Done in {time.time() - started:.1f}s: {counts}")
+    print(f"Summary: {os.path.join(args.out, 'summary.csv')}, {os.path.join(args.out, 'summary.jsonl')}")
+    print(f"Evidence archive: {archive.root} (export with --export ADDRESS --to DIR)")
+
+def run_lookup(args):
+    archive = EvidenceArchive(args.archive)
+    rows = archive.lookup(args.lookup, latest=not args.all)
+    if not rows:
+        print(f"No archived evidence for {args.lookup}")
+        sys.exit(1)
+    for row in rows:
+        fetched = datetime.fromtimestamp(row["fetched_at"], timezone.utc).strftime("%Y-%m-%d %H:%M UTC")
+        print(f"{fetched}  {row['endpoint']:<32} attomId={row['attom_id'] or 'N/A':<12} "
+              f"{row['sha256'][:12]}  {row['address']}")
+
+def run_export(args):
+    if not args.to:
+        print("--export needs --to DIR")
+        sys.exit(1)
+    try:
+        written = EvidenceArchive(args.archive).export(args.export, args.to)
+    except ValueError as e:
+        print(str(e))
+        sys.exit(1)
+    print(f"Exported {len(written)} files to {args.to}")
 
 
 # ---------------------------
 # Main
 # ---------------------------
 
+def positive_int(value):
+    n = int(value)
+    if n < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {n}")
+    return n
+
+def non_negative_int(value):
+    n = int(value)
+    if n < 0:
+        raise argparse.ArgumentTypeError(f"must be at least 0, got {n}")
+    return n
+
 def main():
+    parser = argparse.ArgumentParser(description="ATTOM Chapter 7 property snapshot")
+    parser.add_argument("--batch", metavar="CSV", help="Run non-interactively for every address in a CSV")
+    parser.add_argument("--column", help="CSV header column holding addresses (default: address, else the first column)")
+    parser.add_argument("--out", default="attom-batch", help="Batch output directory")
+    parser.add_argument("--workers", type=positive_int, default=8, help="Properties fetched concurrently")
+    parser.add_argument("--rate", type=float, default=10.0, help="Max ATTOM requests/sec across workers (0 = unpaced)")
+    parser.add_argument("--retries", type=non_negative_int, default=3, help="Retries per call on 429/5xx")
+    parser.add_argument("--retry-partial", action="store_true",
+                        help="On resume, refetch properties whose last run was partial, not just errors")
+    parser.add_argument("--archive", default=os.getenv("ATTOM_EVIDENCE_DIR", DEFAULT_ARCHIVE_DIR),
+                        help="Evidence archive directory")
+    parser.add_argument("--lookup", metavar="ADDRESS_OR_ID", help="List archived evidence for a property")
+    parser.add_argument("--all", action="store_true", help="With --lookup: every fetch, not just the newest per endpoint")
+    parser.add_argument("--export", metavar="ADDRESS_OR_ID", help="Write a property's newest evidence files to --to")
+    parser.add_argument("--to", metavar="DIR", help="Destination for --export")
+    args = parser.parse_args()
+    if args.lookup:
+        run_lookup(args)
+    elif args.export:
+        run_export(args)
+    elif args.batch:
+        run_batch(args)
+    else:
+        run_interactive(EvidenceArchive(args.archive))
+
+def run_interactive(archive):
     print("ATTOM Property Snapshot (Chapter 7 / Trustee-Oriented, One-Screen)")
     print("")
 
@@ -241,50 +463,56 @@ def main():
         print("No address entered.")
         sys.exit(1)
 
-    # 1) Resolve ATTOM ID
-    http_id, j_id = call_attom(apikey, "/property/id", params={"address": address})
-    save_json("attom_property_id.json", j_id)
+    # 1) Resolve ATTOM ID (index first: same property typed differently last time)
+    id_index = AttomIdIndex()
+    attom_id = id_index.get(address)
+    http_id, j_id = None, None
 
-    if http_id != 200 or not status_ok(j_id):
-        print("")
-        print("ERROR: Could not resolve property ID.")
-        print(short_status_line("ID", http_id, j_id))
-        print("Saved: attom_property_id.json")
-        sys.exit(1)
-
-    attom_id = safe_get(j_id, ["property", 0, "identifier", "attomId"], None)
     if not attom_id:
-        print("")
-        print("ERROR: No attomId found in response.")
-        print("Saved: attom_property_id.json")
-        sys.exit(1)
+        http_id, j_id = call_attom(apikey, "/property/id", params={"address": address})
+        archive.put(j_id, address, safe_get(j_id, ["property", 0, "identifier", "attomId"]), "/property/id")
+
+        if http_id != 200 or not status_ok(j_id):
+            print("")
+            print("ERROR: Could not resolve property ID.")
+            print(short_status_line("ID", http_id, j_id))
+            print(f"Archived in: {archive.root}")
+            sys.exit(1)
+
+        attom_id = safe_get(j_id, ["property", 0, "identifier", "attomId"], None)
+        if not attom_id:
+            print("")
+            print("ERROR: No attomId found in response.")
+            print(f"Archived in: {archive.root}")
+            sys.exit(1)
+        id_index.put(address, attom_id)
 
     # 2) Pull endpoints by ID
     pulls = {}
 
     # owner (detailowner)
     pulls["owner"] = call_attom(apikey, "/property/detailowner", params={"id": attom_id})
-    save_json("attom_owner.json", pulls["owner"][1])
+    archive.put(pulls["owner"][1], address, attom_id, "/property/detailowner")
 
     # detail (basic profile)
     pulls["detail"] = call_attom(apikey, "/property/detail", params={"id": attom_id})
-    save_json("attom_detail.json", pulls["detail"][1])
+    archive.put(pulls["detail"][1], address, attom_id, "/property/detail")
 
     # mortgage + owner
     pulls["mort_owner"] = call_attom(apikey, "/property/detailmortgageowner", params={"id": attom_id})
-    save_json("attom_mort_owner.json", pulls["mort_owner"][1])
+    archive.put(pulls["mort_owner"][1], address, attom_id, "/property/detailmortgageowner")
 
     # avm
     pulls["avm"] = call_attom(apikey, "/attomavm/detail", params={"id": attom_id})
-    save_json("attom_avm.json", pulls["avm"][1])
+    archive.put(pulls["avm"][1], address, attom_id, "/attomavm/detail")
 
     # assessment
     pulls["assess"] = call_attom(apikey, "/assessment/detail", params={"id": attom_id})
-    save_json("attom_assess.json", pulls["assess"][1])
+    archive.put(pulls["assess"][1], address, attom_id, "/assessment/detail")
 
     # sales (best-effort)
     pulls["sales"] = call_attom(apikey, "/sale/detail", params={"id": attom_id})
-    save_json("attom_sales.json", pulls["sales"][1])
+    archive.put(pulls["sales"][1], address, attom_id, "/sale/detail")
 
     # 3) Extract
     owner_info = extract_owner(pulls["owner"][1])
@@ -386,7 +614,7 @@ def main():
     def oklabel(http, j):
         return "OK" if (http == 200 and status_ok(j)) else "CHECK"
     status_line = (
-        f"ID {oklabel(http_id, j_id)} | "
+        f"ID {'INDEX' if http_id is None else oklabel(http_id, j_id)} | "
         f"OWNER {oklabel(*pulls['owner'])} | "
         f"DETAIL {oklabel(*pulls['detail'])} | "
         f"MORT {oklabel(*pulls['mort_owner'])} | "
@@ -396,8 +624,8 @@ def main():
     )
     print("DATA INTEGRITY")
     print(f"  Endpoint Status: {status_line}")
-    print("  Raw Evidence: attom_property_id.json, attom_owner.json, attom_detail.json,")
-    print("               attom_mort_owner.json, attom_avm.json, attom_assess.json, attom_sales.json")
+    print(f"  Raw Evidence: archived in {archive.root}")
+    print(f"               export: attom_case_report.py --export {attom_id} --to <dir>")
     print("=" * 68)
 
 if __name__ == "__main__":
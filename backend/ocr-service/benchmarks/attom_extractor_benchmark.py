@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+ATTOM Extractor Benchmark
+=========================
+Times the compiled section extractors (services/attom_extractors.py) against
+the safe_get walkers they replaced, on recorded ATTOM responses (see
+services/attom_fixtures.py) and/or synthetic payloads, and checks that both
+return the same values for every field.
+
+Usage:
+  python3 benchmarks/attom_extractor_benchmark.py --synthetic 2000
+  python3 benchmarks/attom_extractor_benchmark.py --fixtures attom-fixtures --repeat 20 --json
+"""
+import os
+import sys
+import json
+import time
+import random
+import argparse
+from typing import Dict, List, Any, Optional, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.attom_extractors import ENDPOINT_SECTIONS, SECTION_SPECS, extract_section
+from services.attom_fixtures import AttomFixtureStore
+
+# (section, payload)
+Case = Tuple[str, Any]
+
+
+# ---------------------------------------------------------------------------
+# Baseline: the walkers PropertyService used before the compiled extractors
+# ---------------------------------------------------------------------------
+
+def _safe_get(d: Any, path: list, default: Any = None) -> Any:
+    cur = d
+    try:
+        for p in path:
+            if isinstance(p, int):
+                if isinstance(cur, list) and 0 <= p < len(cur):
+                    cur = cur[p]
+                else:
+                    return default
+            else:
+                if isinstance(cur, dict):
+                    cur = cur.get(p)
+                else:
+                    return default
+        return default if cur is None else cur
+    except Exception:
+        return default
+
+
+def legacy_owner(json_data):
+    p = _safe_get(json_data, ["property", 0], {})
+    o = _safe_get(p, ["owner"], {}) or {}
+    return {
+        "address_one_line": _safe_get(p, ["address", "oneLine"]),
+        "owner1": _safe_get(o, ["owner1", "fullname"]),
+        "owner2": _safe_get(o, ["owner2", "fullname"]),
+        "mailing_address": _safe_get(o, ["mailingaddressoneline"]),
+        "is_corporate": _safe_get(o, ["corporateindicator"]),
+        "is_absentee": _safe_get(o, ["absenteeownerstatus"]),
+    }
+
+
+def legacy_profile(json_data):
+    p = _safe_get(json_data, ["property", 0], {})
+    summary = _safe_get(p, ["summary"], {}) or {}
+    building = _safe_get(p, ["building"], {}) or {}
+    size = _safe_get(building, ["size"], {}) or {}
+    rooms = _safe_get(building, ["rooms"], {}) or {}
+    lot = _safe_get(p, ["lot"], {}) or {}
+    return {
+        "type": _safe_get(summary, ["propertyType"]) or _safe_get(summary, ["propclass"]),
+        "year_built": _safe_get(summary, ["yearbuilt"]),
+        "beds": _safe_get(rooms, ["beds"]),
+        "baths": _safe_get(rooms, ["bathstotal"]),
+        "sqft": _safe_get(size, ["livingsize"]) or _safe_get(size, ["bldgsize"]),
+        "lot_acres": _safe_get(lot, ["lotsize1"]),
+        "lot_sqft": _safe_get(lot, ["lotsize2"]),
+        "pool": _safe_get(lot, ["pooltype"]),
+    }
+
+
+def legacy_mortgage(json_data):
+    p = _safe_get(json_data, ["property", 0], {})
+    m = _safe_get(p, ["mortgage"], {}) or {}
+    lender = _safe_get(m, ["lender"], {}) or {}
+    title = _safe_get(m, ["title"], {}) or {}
+    return {
+        "amount": _safe_get(m, ["amount"]),
+        "date": _safe_get(m, ["date"]),
+        "loan_type": _safe_get(m, ["loantypecode"]),
+        "rate_type": _safe_get(m, ["interestratetype"]),
+        "lender_name": _safe_get(lender, ["lastname"]),
+        "lender_city": _safe_get(lender, ["city"]),
+        "lender_state": _safe_get(lender, ["state"]),
+        "title_company": _safe_get(title, ["companyname"]),
+    }
+
+
+def legacy_avm(json_data):
+    p = _safe_get(json_data, ["property", 0], {})
+    avm = _safe_get(p, ["avm"], {}) or {}
+    amt = _safe_get(avm, ["amount"], {}) or {}
+    return {
+        "date": _safe_get(avm, ["eventDate"]),
+        "value": _safe_get(amt, ["value"]),
+        "low": _safe_get(amt, ["low"]),
+        "high": _safe_get(amt, ["high"]),
+        "confidence_score": _safe_get(amt, ["scr"]),
+        "fsd": _safe_get(amt, ["fsd"]),
+    }
+
+
+def legacy_assessment(json_data):
+    p = _safe_get(json_data, ["property", 0], {})
+    a = _safe_get(p, ["assessment"], {}) or {}
+    return {
+        "assessed_value": _safe_get(a, ["assessed", "assdTtlValue"]) or _safe_get(a, ["assessedValue"]),
+        "tax_amount": _safe_get(a, ["tax", "taxamt"]) or _safe_get(a, ["taxAmount"]),
+        "tax_year": _safe_get(a, ["tax", "taxyear"]) or _safe_get(a, ["taxYear"]),
+    }
+
+
+def legacy_sale(json_data):
+    p = _safe_get(json_data, ["property", 0], {})
+    sale = _safe_get(p, ["sale"], {}) or {}
+    return {
+        "price": _safe_get(sale, ["amount", "saleamt"]) or _safe_get(sale, ["saleamt"]),
+        "date": _safe_get(sale, ["saleTransDate"]) or _safe_get(sale, ["salesearchdate"]) or _safe_get(sale, ["date"]),
+    }
+
+
+LEGACY = {
+    "owner": legacy_owner,
+    "profile": legacy_profile,
+    "mortgage": legacy_mortgage,
+    "avm": legacy_avm,
+    "assessment": legacy_assessment,
+    "sale": legacy_sale,
+}
+
+
+# ---------------------------------------------------------------------------
+# Payloads
+# ---------------------------------------------------------------------------
+
+def _set_path(target: Dict[str, Any], path: Tuple, value: Any) -> None:
+    for step in path[:-1]:
+        target = target.setdefault(step, {})
+    target[path[-1]] = value
+
+
+def synthetic_payload(section: str, rng: random.Random) -> Dict[str, Any]:
+    """A response with a random subset of the section's paths filled (alternates and gaps included)"""
+    prop: Dict[str, Any] = {"identifier": {"attomId": rng.randint(1, 10 ** 9)}}
+    for field, paths in SECTION_SPECS[section].items():
+        roll = rng.random()
+        if roll < 0.15:
+            continue  # field missing
+        path = paths[0] if roll < 0.7 or len(paths) == 1 else rng.choice(paths[1:])
+        value = rng.choice([rng.randint(1, 900000), f"VALUE {rng.randint(1, 99)}", 0, ""]) if roll > 0.95 \
+            else rng.randint(1, 900000)
+        _set_path(prop, tuple(path), value)
+    # Unrelated sections ride along in real responses
+    prop["area"] = {"countrysecsubd": "X", "munname": "Y"}
+    payload: Dict[str, Any] = {"status": {"code": 0, "msg": "SuccessWithResult"}, "property": [prop]}
+    if rng.random() < 0.03:
+        payload = {"status": {"code": 1, "msg": "SuccessWithoutResult"}, "property": []}
+    return payload
+
+
+def build_cases(fixtures: Optional[str], synthetic: int, seed: int) -> List[Case]:
+    cases: List[Case] = []
+    if fixtures:
+        store = AttomFixtureStore(fixtures)
+        for endpoint, section in ENDPOINT_SECTIONS.items():
+            for recording in store.recordings(endpoint):
+                cases.append((section, recording["body"]))
+    rng = random.Random(seed)
+    sections = list(SECTION_SPECS)
+    for i in range(synthetic):
+        section = sections[i % len(sections)]
+        cases.append((section, synthetic_payload(section, rng)))
+    return cases
+
+
+# ---------------------------------------------------------------------------
+# Benchmark
+# ---------------------------------------------------------------------------
+
+def _time(cases: List[Case], extract, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for section, payload in cases:
+            extract(section, payload)
+    return time.perf_counter() - start
+
+
+def run_benchmark(cases: List[Case], repeat: int) -> Dict[str, Any]:
+    mismatches = []
+    for n, (section, payload) in enumerate(cases):
+        old, new = LEGACY[section](payload), extract_section(section, payload)
+        if old != new:
+            mismatches.append({"case": n, "section": section, "legacy": old, "compiled": new})
+
+    legacy_s = _time(cases, lambda section, payload: LEGACY[section](payload), repeat)
+    compiled_s = _time(cases, extract_section, repeat)
+    extractions = len(cases) * repeat
+    return {
+        "cases": len(cases),
+        "repeat": repeat,
+        "legacy_us_per_extract": round(legacy_s / extractions * 1e6, 3),
+        "compiled_us_per_extract": round(compiled_s / extractions * 1e6, 3),
+        "speedup": round(legacy_s / compiled_s, 2) if compiled_s else None,
+        "mismatches": len(mismatches),
+        "mismatch_examples": mismatches[:5],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compiled ATTOM extractors vs the safe_get walkers")
+    parser.add_argument("--fixtures", help="Directory of *.attom.json recordings")
+    parser.add_argument("--synthetic", type=int, default=0, help="Synthetic payloads (spread over sections)")
+    parser.add_argument("--repeat", type=int, default=10, help="Timed passes over the payloads")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args()
+
+    if not args.fixtures and not args.synthetic:
+        parser.error("needs --fixtures and/or --synthetic")
+    cases = build_cases(args.fixtures, args.synthetic, args.seed)
+    if not cases:
+        parser.error("no payloads to benchmark")
+    report = run_benchmark(cases, args.repeat)
+    if args.json:
+        print(json.dumps(report, indent=2, default=str))
+        return
+    print(f"{report['cases']} payloads x {report['repeat']} passes")
+    print(f"  legacy walkers:      {report['legacy_us_per_extract']:8.3f} µs/extract")
+    print(f"  compiled extractors: {report['compiled_us_per_extract']:8.3f} µs/extract  ({report['speedup']}x)")
+    print(f"  mismatches:          {report['mismatches']}")
+    for example in report["mismatch_examples"]:
+        print(f"    {example}")
+
+
+if __name__ == "__main__":
+    main()
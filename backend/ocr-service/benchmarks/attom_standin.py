@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+ATTOM Stand-In Server
+=====================
+Replays recorded ATTOM responses (see services/attom_fixtures.py) over HTTP so
+PropertyService and attom_case_report.py can be tested and load-tested
+offline and deterministically. Point either at it with ATTOM_BASE_URL.
+
+Injected behaviour:
+  - latency: fixed delay plus uniform jitter per request
+  - errors: a share of requests answered with 500/502/503
+  - rate limit: a token bucket; requests over it get 429 with Retry-After
+
+Unrecorded calls get 404 unless --any-params is set, in which case they are
+answered with a recording of the same endpoint (for synthetic load).
+
+Standard library only.
+
+Usage:
+  ATTOM_RECORD_DIR=attom-fixtures uvicorn main:app          # record live responses
+  python3 benchmarks/attom_standin.py import . --address "123 Main St, Springfield, IL" --out attom-fixtures
+  python3 benchmarks/attom_standin.py serve --fixtures attom-fixtures --latency-ms 150 --jitter-ms 100 \\
+      --error-rate 0.02 --rate-limit 10
+  ATTOM_BASE_URL=http://127.0.0.1:8099 ATTOM_API_KEY=test uvicorn main:app
+"""
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlsplit
+from typing import Any, Dict, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.attom_fixtures import AttomFixtureStore, import_cli_evidence
+from services.rate_limiter import TokenBucket
+
+# The live gateway's path prefix; accepted (and stripped) so ATTOM_BASE_URL can keep it or not
+GATEWAY_PREFIX = "/propertyapi/v1.0.0"
+INJECTED_ERRORS = (500, 502, 503)
+
+
+class StandInConfig:
+    def __init__(self, store: AttomFixtureStore, latency_ms: float = 0.0, jitter_ms: float = 0.0,
+                 error_rate: float = 0.0, rate_limit: Optional[float] = None, burst: Optional[int] = None,
+                 any_params: bool = False, require_key: bool = False, seed: Optional[int] = None):
+        self.store = store
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.bucket = TokenBucket(rate_limit, burst) if rate_limit else None
+        self.any_params = any_params
+        self.require_key = require_key
+        self.random = random.Random(seed)
+        self._random_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self.stats: Dict[str, int] = {"requests": 0, "replayed": 0, "not_found": 0, "errors": 0, "throttled": 0}
+
+    def roll(self) -> Dict[str, float]:
+        """Latency and error draw for one request (seeded, so runs repeat)"""
+        with self._random_lock:
+            return {"delay": (self.latency_ms + self.random.uniform(0, self.jitter_ms)) / 1000,
+                    "error": self.random.random()}
+
+    def count(self, name: str) -> None:
+        with self._stats_lock:
+            self.stats[name] += 1
+
+
+def make_handler(config: StandInConfig):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # keep-alive, like the gateway
+
+        def do_GET(self) -> None:
+            url = urlsplit(self.path)
+            endpoint = url.path[len(GATEWAY_PREFIX):] if url.path.startswith(GATEWAY_PREFIX) else url.path
+            if endpoint == "/_stats":
+                self._send(200, {**config.stats, "recordings": len(config.store)})
+                return
+
+            config.count("requests")
+            if config.require_key and not self.headers.get("APIKey"):
+                self._send(401, {"status": {"code": 401, "msg": "Missing APIKey header"}})
+                return
+            if config.bucket is not None:
+                wait = config.bucket.try_acquire()
+                if wait is not None:
+                    config.count("throttled")
+                    self._send(429, {"status": {"code": 429, "msg": "Too Many Requests"}},
+                               {"Retry-After": f"{max(wait, 0.001):.3f}"})
+                    return
+
+            draw = config.roll()
+            if draw["delay"]:
+                time.sleep(draw["delay"])
+            if draw["error"] < config.error_rate:
+                config.count("errors")
+                status = INJECTED_ERRORS[int(draw["error"] * 1000) % len(INJECTED_ERRORS)]
+                self._send(status, {"status": {"code": status, "msg": "Injected error"}})
+                return
+
+            recording = config.store.find(endpoint, dict(parse_qsl(url.query)), any_params=config.any_params)
+            if recording is None:
+                config.count("not_found")
+                self._send(404, {"status": {"code": 1, "msg": "SuccessWithoutResult (not recorded)"}})
+                return
+            config.count("replayed")
+            self._send(recording.get("status", 200), recording["body"])
+
+        def _send(self, status: int, body: Any, headers: Optional[Dict[str, str]] = None) -> None:
+            payload = json.dumps(body, separators=(",", ":")).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, format: str, *args: Any) -> None:
+            pass  # one line per request drowns a load test
+
+    return Handler
+
+
+def serve(config: StandInConfig, host: str, port: int) -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer((host, port), make_handler(config))
+    server.daemon_threads = True
+    return server
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Record/replay stand-in for the ATTOM property API")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("serve", help="Replay recordings over HTTP")
+    run.add_argument("--fixtures", required=True, help="Directory of *.attom.json recordings")
+    run.add_argument("--host", default="127.0.0.1")
+    run.add_argument("--port", type=int, default=8099)
+    run.add_argument("--latency-ms", type=float, default=0.0, help="Fixed delay per request")
+    run.add_argument("--jitter-ms", type=float, default=0.0, help="Extra uniform random delay per request")
+    run.add_argument("--error-rate", type=float, default=0.0, help="Share of requests answered with 5xx")
+    run.add_argument("--rate-limit", type=float, help="Requests/sec before answering 429")
+    run.add_argument("--burst", type=int, help="Token bucket size for --rate-limit")
+    run.add_argument("--any-params", action="store_true", help="Answer unrecorded calls with a same-endpoint recording")
+    run.add_argument("--require-key", action="store_true", help="401 without an APIKey header")
+    run.add_argument("--seed", type=int, default=0)
+
+    imp = commands.add_parser("import", help="Record the attom_*.json files attom_case_report.py wrote")
+    imp.add_argument("directory", help="Directory holding attom_property_id.json etc.")
+    imp.add_argument("--address", required=True, help="Address the CLI was run with")
+    imp.add_argument("--out", required=True, help="Recording directory")
+
+    args = parser.parse_args()
+
+    if args.command == "import":
+        saved = import_cli_evidence(AttomFixtureStore(args.out), args.directory, args.address)
+        print(f"Recorded {len(saved)} responses into {args.out}")
+        return
+
+    store = AttomFixtureStore(args.fixtures)
+    if not len(store):
+        print(f"No recordings in {args.fixtures}")
+        sys.exit(1)
+    config = StandInConfig(store, args.latency_ms, args.jitter_ms, args.error_rate, args.rate_limit,
+                           args.burst, args.any_params, args.require_key, args.seed)
+    server = serve(config, args.host, args.port)
+    print(f"Replaying {len(store)} recordings ({store.endpoints()}) on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(json.dumps(config.stats))
+
+
+if __name__ == "__main__":
+    main()
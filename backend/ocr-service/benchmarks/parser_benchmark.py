@@ -0,0 +1,341 @@
+#!/usr/bin/env python3
+"""
+Parser Throughput and Accuracy Benchmark
+========================================
+Runs the document parsers over recorded OCR fixtures (see
+services/ocr_fixtures.py) and/or synthetic OCR results, each optionally
+multiplied by random OCR-style mutations, and reports per parser:
+
+  - documents/sec
+  - peak traced memory and live allocations per parse (tracemalloc sample)
+  - field-level accuracy against the expected values
+
+No PaddleOCR needed to benchmark; `record` needs it to create fixtures.
+
+Usage:
+  python3 benchmarks/parser_benchmark.py run --synthetic 500 --mutations 3
+  python3 benchmarks/parser_benchmark.py run --fixtures fixtures/ --json
+  python3 benchmarks/parser_benchmark.py record stub1.pdf stub2.pdf --out fixtures/ --type paystub
+"""
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import tracemalloc
+from typing import Dict, List, Any, Optional, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.ocr_document import OcrDocument
+from services.ocr_fixtures import list_fixtures, load_fixture, save_fixture
+from services.document_classifier import DocumentClassifier
+from services.document_parsers.paystub_parser import PaystubParser
+from services.document_parsers.bank_statement_parser import BankStatementParser
+from services.document_parsers.tax_return_parser import TaxReturnParser
+from services.document_parsers.generic_parser import GenericParser
+
+PARSERS = {
+    "paystub": PaystubParser(),
+    "bank_statement": BankStatementParser(),
+    "tax_return": TaxReturnParser(),
+    "generic": GenericParser(),
+}
+
+# (document, document_type, expected fields or None, source label)
+Case = Tuple[OcrDocument, str, Optional[Dict[str, Any]], str]
+
+FIRST_NAMES = ["John", "Maria", "David", "Aisha", "Chen", "Robert", "Linda", "Carlos"]
+LAST_NAMES = ["Smith", "Garcia", "Johnson", "Nguyen", "Williams", "Brown", "Davis", "Lopez"]
+EMPLOYERS = ["Acme Widgets Inc", "Northwind Logistics LLC", "Blue Ridge Hospital", "Summit Foods Corp"]
+BANKS = ["First National Bank", "Evergreen Credit Union", "Harbor Savings Bank"]
+
+
+# ---------------------------------------------------------------------------
+# Synthetic documents
+# ---------------------------------------------------------------------------
+
+def _money(cents: int) -> str:
+    return f"{cents // 100:,}.{cents % 100:02d}"
+
+
+def _add_rows(document: OcrDocument, page: int, rows: List[List[Tuple[int, str]]], top: int = 40) -> None:
+    """Lay out rows of (x, text) cells 30px apart"""
+    y = top
+    for row in rows:
+        for x, text in row:
+            document.add_flat_block(text, 0.97, [x, y, x + 9 * len(text), y + 20], page)
+        y += 30
+
+
+def synthetic_paystub(rng: random.Random) -> Tuple[OcrDocument, Dict[str, Any]]:
+    name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+    employer = rng.choice(EMPLOYERS)
+    gross = rng.randint(80_000, 600_000)
+    net = int(gross * rng.uniform(0.65, 0.85))
+    ytd = gross * rng.randint(2, 24)
+    month = rng.randint(1, 12)
+    start, end, paid = f"{month:02d}/01/2024", f"{month:02d}/15/2024", f"{month:02d}/20/2024"
+
+    document = OcrDocument(page_count=1)
+    _add_rows(document, 1, [
+        [(40, employer)],
+        [(40, f"Employee Name: {name}")],
+        [(40, f"Pay Period: {start} - {end}"), (520, f"Pay Date: {paid}")],
+        [(40, "Earnings"), (400, "Current"), (600, "YTD")],
+        [(40, "Gross Pay"), (400, _money(gross)), (600, _money(ytd))],
+        [(40, "Federal Withholding"), (400, _money(int(gross * 0.1)))],
+        [(40, "Net Pay"), (400, _money(net))],
+    ])
+    return document, {
+        "employer": employer, "employeeName": name, "gross_pay": gross / 100, "net_pay": net / 100,
+        "ytd_gross": ytd / 100, "pay_period_start": start, "pay_period_end": end, "pay_date": paid,
+    }
+
+
+def synthetic_bank_statement(rng: random.Random) -> Tuple[OcrDocument, Dict[str, Any]]:
+    account = str(rng.randint(10_000_000, 999_999_999))
+    opening = rng.randint(10_000, 2_000_000)
+    document = OcrDocument(page_count=2)
+    rows = [
+        [(40, rng.choice(BANKS))],
+        [(40, "Account Number:"), (260, account)],
+        [(40, "Statement Period 03/01/2024 - 03/31/2024")],
+        [(40, "Beginning Balance"), (600, _money(opening))],
+        [(40, "Date"), (140, "Description"), (440, "Withdrawals"), (560, "Deposits"), (680, "Balance")],
+    ]
+    balance = opening
+    for day in range(2, 2 + rng.randint(5, 20)):
+        amount = rng.randint(500, 150_000)
+        if rng.random() < 0.3:
+            balance += amount
+            rows.append([(40, f"03/{day:02d}"), (140, "PAYROLL DEPOSIT"), (560, _money(amount)), (680, _money(balance))])
+        elif balance > amount:
+            balance -= amount
+            rows.append([(40, f"03/{day:02d}"), (140, "DEBIT CARD PURCHASE"), (440, _money(amount)), (680, _money(balance))])
+    _add_rows(document, 1, rows)
+    _add_rows(document, 2, [[(40, "Ending Balance"), (600, _money(balance))]])
+    return document, {"account_number": account, "ending_balance": balance / 100}
+
+
+def synthetic_tax_return(rng: random.Random) -> Tuple[OcrDocument, Dict[str, Any]]:
+    year = str(rng.randint(2019, 2024))
+    agi = rng.randint(15_000, 250_000)
+    document = OcrDocument(page_count=3)
+    _add_rows(document, 1, [
+        [(40, "Form 1040"), (200, "U.S. Individual Income Tax Return"), (600, year)],
+        [(40, "Department of the Treasury - Internal Revenue Service")],
+        [(40, "Filing Status"), (200, "Single")],
+        [(40, "1a Wages, salaries, tips"), (600, f"{agi + rng.randint(0, 5000):,}")],
+        [(40, "11 Adjusted gross income"), (600, f"{agi:,}")],
+    ])
+    _add_rows(document, 2, [[(40, "12 Standard deduction"), (600, "13,850")]])
+    _add_rows(document, 3, [[(40, "Schedule 1 Additional Income and Adjustments")]])
+    return document, {"agi": float(agi), "tax_year": year}
+
+
+def synthetic_generic(rng: random.Random) -> Tuple[OcrDocument, Dict[str, Any]]:
+    document = OcrDocument(page_count=1)
+    _add_rows(document, 1, [[(40, f"Notice {rng.randint(1000, 9999)}")], [(40, "Please retain for your records")]])
+    return document, {}
+
+
+SYNTHETIC = {
+    "paystub": synthetic_paystub,
+    "bank_statement": synthetic_bank_statement,
+    "tax_return": synthetic_tax_return,
+    "generic": synthetic_generic,
+}
+
+# Letter confusions typical of OCR; digits are left alone so expected values stay valid
+CONFUSIONS = [("l", "I"), ("O", "Q"), ("rn", "m"), ("e", "c"), ("S", "5s")]
+
+
+def mutate(document: OcrDocument, rng: random.Random) -> OcrDocument:
+    """Copy with OCR-style noise: letter confusions, split blocks, box jitter, shuffled detection order"""
+    blocks = []
+    for i, text in enumerate(document.texts):
+        box = list(document.box(i))
+        if rng.random() < 0.03:
+            wrong, right = rng.choice(CONFUSIONS)
+            if wrong in text and not right[0].isdigit():
+                text = text.replace(wrong, right, 1)
+        jitter = [v + rng.randint(-3, 3) for v in box]
+        jitter[2], jitter[3] = max(jitter[2], jitter[0] + 1), max(jitter[3], jitter[1] + 1)
+        if " " in text and rng.random() < 0.05:
+            # Detector split one line into two boxes
+            cut = text.index(" ")
+            middle = jitter[0] + (jitter[2] - jitter[0]) * cut // max(len(text), 1)
+            blocks.append((document.pages[i], text[:cut], [jitter[0], jitter[1], middle, jitter[3]]))
+            blocks.append((document.pages[i], text[cut + 1:], [middle + 9, jitter[1], jitter[2], jitter[3]]))
+        else:
+            blocks.append((document.pages[i], text, jitter))
+
+    mutated = OcrDocument(page_count=document.page_count)
+    for page in sorted({page for page, _, _ in blocks}):
+        page_blocks = [b for b in blocks if b[0] == page]
+        rng.shuffle(page_blocks)
+        for _, text, box in page_blocks:
+            mutated.add_flat_block(text, round(rng.uniform(0.8, 0.99), 3), box, page)
+    mutated.pages_processed = mutated.page_count
+    return mutated
+
+
+# ---------------------------------------------------------------------------
+# Benchmark
+# ---------------------------------------------------------------------------
+
+def _same(expected: Any, actual: Any) -> bool:
+    if isinstance(expected, (int, float)) and isinstance(actual, (int, float)):
+        return abs(expected - actual) < 0.005
+    return str(expected).strip().casefold() == str(actual).strip().casefold()
+
+
+def build_cases(fixture_dir: Optional[str], synthetic: int, mutations: int, seed: int) -> List[Case]:
+    rng = random.Random(seed)
+    classifier = DocumentClassifier()
+    base: List[Case] = []
+
+    if fixture_dir:
+        for path in list_fixtures(fixture_dir):
+            document, meta = load_fixture(path)
+            document_type = meta["document_type"]
+            if document_type not in PARSERS:
+                document_type = classifier.classify(document.page_text(1)).document_type
+            base.append((document, document_type, meta["expected"], os.path.basename(path)))
+
+    for n in range(synthetic):
+        document_type = list(SYNTHETIC)[n % len(SYNTHETIC)]
+        document, expected = SYNTHETIC[document_type](rng)
+        base.append((document, document_type, expected, "synthetic"))
+
+    cases = list(base)
+    for document, document_type, expected, source in base:
+        for _ in range(mutations):
+            cases.append((mutate(document, rng), document_type, expected, f"{source}+mutated"))
+    return cases
+
+
+def run_benchmark(cases: List[Case], alloc_sample: int = 50, repeat: int = 1) -> Dict[str, Any]:
+    report: Dict[str, Any] = {"documents": len(cases), "parsers": {}}
+    for document_type, parser in PARSERS.items():
+        selected = [case for case in cases if case[1] == document_type]
+        if not selected:
+            continue
+
+        start = time.perf_counter()
+        for _ in range(repeat):
+            results = [parser.parse(case[0]) for case in selected]
+        elapsed = time.perf_counter() - start
+
+        # Allocation sample (tracemalloc slows parsing, so it runs separately)
+        peaks, live_blocks = [], []
+        tracemalloc.start()
+        for document, _, _, _ in selected[:alloc_sample]:
+            tracemalloc.reset_peak()
+            before = tracemalloc.take_snapshot()
+            result = parser.parse(document)
+            after = tracemalloc.take_snapshot()
+            peaks.append(tracemalloc.get_traced_memory()[1])
+            live_blocks.append(sum(stat.count_diff for stat in after.compare_to(before, "filename") if stat.count_diff > 0))
+            del result
+        tracemalloc.stop()
+
+        # Field accuracy where the correct values are known
+        fields: Dict[str, Dict[str, int]] = {}
+        for (document, _, expected, _), result in zip(selected, results):
+            if not expected:
+                continue
+            extracted = result.get("extracted_data", {})
+            for field, value in expected.items():
+                score = fields.setdefault(field, {"correct": 0, "total": 0})
+                score["total"] += 1
+                if field in extracted and _same(value, extracted[field]):
+                    score["correct"] += 1
+        correct = sum(s["correct"] for s in fields.values())
+        total = sum(s["total"] for s in fields.values())
+
+        report["parsers"][document_type] = {
+            "documents": len(selected),
+            "docs_per_sec": round(len(selected) * repeat / elapsed, 1) if elapsed else None,
+            "mean_ms": round(elapsed * 1000 / (len(selected) * repeat), 3),
+            "peak_kib_per_parse": round(sum(peaks) / len(peaks) / 1024, 1) if peaks else None,
+            "live_blocks_per_parse": round(sum(live_blocks) / len(live_blocks), 1) if live_blocks else None,
+            "accuracy": round(correct / total, 4) if total else None,
+            "fields": {
+                field: round(score["correct"] / score["total"], 4) for field, score in sorted(fields.items())
+            },
+        }
+    return report
+
+
+def print_report(report: Dict[str, Any]) -> None:
+    print(f"\n{'=' * 72}")
+    print(f"  PARSER BENCHMARK  ({report['documents']} documents)")
+    print(f"{'=' * 72}")
+    print(f"  {'parser':<16}{'docs':>7}{'docs/sec':>11}{'mean ms':>10}{'peak KiB':>10}{'blocks':>9}{'accuracy':>10}")
+    for name, stats in report["parsers"].items():
+        accuracy = f"{stats['accuracy'] * 100:.1f}%" if stats["accuracy"] is not None else "-"
+        print(f"  {name:<16}{stats['documents']:>7}{stats['docs_per_sec']:>11}{stats['mean_ms']:>10}"
+              f"{stats['peak_kib_per_parse']:>10}{stats['live_blocks_per_parse']:>9}{accuracy:>10}")
+    for name, stats in report["parsers"].items():
+        if stats["fields"]:
+            print(f"\n  {name} field accuracy:")
+            for field, accuracy in stats["fields"].items():
+                print(f"    {field:<22}{accuracy * 100:6.1f}%")
+    print()
+
+
+def record_fixtures(paths: List[str], out_dir: str, document_type: str) -> None:
+    """OCR files with PaddleOCR and save them as fixtures"""
+    from services.paddleocr_service import PaddleOCRService
+
+    os.makedirs(out_dir, exist_ok=True)
+    service = PaddleOCRService()
+    for path in paths:
+        with open(path, "rb") as f:
+            document = service.extract_text(f.read(), os.path.basename(path))
+        if document.error:
+            print(f"❌ {path}: {document.error}")
+            continue
+        stem = os.path.splitext(os.path.basename(path))[0]
+        target = save_fixture(os.path.join(out_dir, f"{stem}.ocr.json.gz"), document, os.path.basename(path), document_type)
+        print(f"✅ {path} -> {target} ({len(document)} blocks, {document.page_count} pages)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark document parsers on recorded or synthetic OCR results")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="Benchmark parsers")
+    run.add_argument("--fixtures", help="Directory of *.ocr.json.gz fixtures")
+    run.add_argument("--synthetic", type=int, default=0, help="Synthetic documents to generate (spread over types)")
+    run.add_argument("--mutations", type=int, default=0, help="Mutated copies per document")
+    run.add_argument("--repeat", type=int, default=1, help="Timed passes over the documents")
+    run.add_argument("--alloc-sample", type=int, default=50, help="Parses per parser traced for allocations")
+    run.add_argument("--seed", type=int, default=7)
+    run.add_argument("--json", action="store_true", help="Print the report as JSON")
+
+    record = commands.add_parser("record", help="OCR files into fixtures (needs PaddleOCR)")
+    record.add_argument("files", nargs="+")
+    record.add_argument("--out", required=True, help="Fixture directory")
+    record.add_argument("--type", default="unknown", help="Document type stored with the fixtures")
+
+    args = parser.parse_args()
+    if args.command == "record":
+        record_fixtures(args.files, args.out, args.type)
+        return
+
+    if not args.fixtures and not args.synthetic:
+        parser.error("run needs --fixtures and/or --synthetic")
+    cases = build_cases(args.fixtures, args.synthetic, args.mutations, args.seed)
+    report = run_benchmark(cases, alloc_sample=args.alloc_sample, repeat=args.repeat)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,20 +3,48 @@ PaddleOCR Backend Service for Document Intelligence
 
 FastAPI application providing OCR extraction and validation endpoints.
 """
-from fastapi import FastAPI, UploadFile, File, Form, HTTPException
+from fastapi import FastAPI, UploadFile, File, Form, HTTPException, Request, BackgroundTasks
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-from typing import Optional
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from pydantic import TypeAdapter, ValidationError
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set
+from contextlib import closing
+from datetime import date
 import logging
 import os
+import threading
+import time
 
 from services.paddleocr_service import PaddleOCRService
 from services.property_service import PropertyService
+from services.metrics import metrics
+from services.ocr_document import BBOX_FORMATS, OcrDocument
+from services.ocr_fixtures import FixtureRecorder
+from services.document_store import DocumentStore, StoredDocument
+from services.response_encoding import (
+    NDJSON_MEDIA_TYPE, SSE_MEDIA_TYPE, encode_response, ndjson_line, parse_page_filter, sse_event,
+)
+from services.spatial_index import PageLayout
 from services.document_parsers.paystub_parser import PaystubParser
 from services.document_parsers.bank_statement_parser import BankStatementParser
 from services.document_parsers.tax_return_parser import TaxReturnParser
 from services.document_parsers.generic_parser import GenericParser
-from models.schemas import OcrResponse, ValidationResponse, PropertyReportRequest, PropertyReportResponse
+from services.document_parsers.creditor_parser import CreditorParser
+from services.creditor_index import CreditorCaseRegistry
+from services.search_index import SearchIndex
+from services.document_parsers.early_exit import DEFAULT_MIN_CONFIDENCE, EarlyExitTracker
+from services.document_parsers.paystub_batch_parser import PaystubBatchParser
+from services.document_parsers.transaction_extractor import TransactionExtractor
+from services.income_aggregation import aggregate_income
+from services.value_normalization import normalize_date
+from services.field_validation import FieldValidator
+from services.document_classifier import AUTO_TYPES, DocumentClassifier
+from models.schemas import (
+    OcrResponse, ValidationResponse, FieldCheck, MultiFieldValidationResponse, ClassificationResponse,
+    PaystubBatchResponse, CreditorResponse, SearchResponse, PropertyBulkReportRequest,
+    PropertyReportRequest, PropertyReportResponse
+)
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -44,111 +72,665 @@ ocr_service = PaddleOCRService()
 # Initialize Property service
 property_service = PropertyService()
 
+# Uploads and OCR results referenced by document_id
+document_store = DocumentStore()
+
+# Persistent full-text index of OCR'd pages, searchable per case
+search_index = SearchIndex()
+
+# Saves OCR output for parser benchmarks when OCR_FIXTURE_DIR is set
+fixture_recorder = FixtureRecorder()
+
+# Parses the JSON-encoded field list of multi-field validation requests
+field_checks_adapter = TypeAdapter(List[FieldCheck])
+
 # Initialize document parsers
+creditor_parser = CreditorParser()
 parsers = {
     "paystub": PaystubParser(),
     "bank_statement": BankStatementParser(),
     "tax_return": TaxReturnParser(),
+    "credit_report": creditor_parser,
+    "collection_letter": creditor_parser,
     "generic": GenericParser(),
 }
 
+# Deduplicated creditor names per case, built up across documents
+creditor_cases = CreditorCaseRegistry()
+
+# Splits multi-stub uploads and parses the stubs concurrently
+paystub_batch_parser = PaystubBatchParser()
+
+# Routes uploads to a parser when the client doesn't name the type
+classifier = DocumentClassifier()
+
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
     return {"status": "healthy", "service": "paddleocr-backend"}
 
+@app.get("/metrics")
+async def get_metrics():
+    """In-process counters and timing summaries"""
+    return {**metrics.snapshot(), "document_store": document_store.stats(), "search_index": search_index.stats(),
+            "attom_cache": property_service.cache.stats(), "attom_id_index": property_service.address_index.stats()}
+
+def _check_raw_ocr_options(raw_ocr_pages: Optional[str], bbox_format: str) -> Optional[Set[int]]:
+    """Validate raw_ocr projection options; returns the parsed page filter"""
+    if bbox_format not in BBOX_FORMATS:
+        raise HTTPException(status_code=400, detail=f"bbox_format must be one of {', '.join(BBOX_FORMATS)}")
+    try:
+        return parse_page_filter(raw_ocr_pages)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid raw_ocr_pages: {str(e)}")
+
+def _run_ocr(file_bytes: bytes, filename: str,
+             should_stop: Optional[Callable[[OcrDocument, int], bool]] = None,
+             first_page: int = 1) -> OcrDocument:
+    """Run OCR and record its latency"""
+    ocr_start = time.perf_counter()
+    ocr_result = ocr_service.extract_text(file_bytes, filename, should_stop=should_stop, first_page=first_page)
+    metrics.observe("ocr.extract_ms", (time.perf_counter() - ocr_start) * 1000)
+    if first_page == 1:
+        fixture_recorder.record(ocr_result, filename)
+    return ocr_result
+
+async def _load_document(file: Optional[UploadFile], document_id: Optional[str],
+                         document_type: str = "unknown") -> StoredDocument:
+    """Resolve a request's document: a prior upload by id, or a new upload (OCR'd and stored)"""
+    if document_id:
+        stored = document_store.get(document_id)
+        if stored is None:
+            raise HTTPException(status_code=404, detail=f"Unknown or expired document_id: {document_id}")
+        return stored
+    if file is None:
+        raise HTTPException(status_code=400, detail="Provide either file or document_id")
+
+    file_bytes = await file.read()
+    ocr_result = _run_ocr(file_bytes, file.filename)
+    return document_store.put(file.filename, file_bytes, ocr_result, document_type)
+
+# document_id -> lock held while its skipped pages are OCR'd, so a second caller
+# (background pass or an endpoint needing all pages) waits instead of OCRing them again
+_completion_locks: Dict[str, threading.Lock] = {}
+_completion_locks_guard = threading.Lock()
+
+def _finish_ocr(document_id: str) -> None:
+    """OCR the pages skipped by early exit and swap in the complete result (once per document)"""
+    with _completion_locks_guard:
+        lock = _completion_locks.setdefault(document_id, threading.Lock())
+    try:
+        with lock:
+            _finish_ocr_locked(document_id)
+    finally:
+        with _completion_locks_guard:
+            if _completion_locks.get(document_id) is lock and not lock.locked():
+                del _completion_locks[document_id]
+
+def _finish_ocr_locked(document_id: str) -> None:
+    stored = document_store.get(document_id)
+    if stored is None:
+        return
+    snapshot = stored.ocr
+    if snapshot.pages_processed >= snapshot.page_count or snapshot.error:
+        return  # completed by whoever held the lock before us
+    first_page = snapshot.pages_processed + 1
+    remaining = _run_ocr(stored.file_bytes, stored.filename, first_page=first_page)
+    if remaining.error:
+        logger.error(f"Background OCR of {document_id} from page {first_page} failed: {remaining.error}")
+        return
+    if document_store.replace_ocr(document_id, snapshot.merged(remaining), expected_pages=snapshot.pages_processed):
+        metrics.increment("early_exit.background_completions")
+        logger.info(f"Background OCR complete for {document_id} ({remaining.pages_processed} pages)")
+        if stored.case_id:
+            _index_stored(stored)
+
+def _index_stored(stored: StoredDocument) -> None:
+    """Write a stored document's pages to the full-text index under its case"""
+    try:
+        pages = search_index.index_document(stored.document_id, stored.ocr, stored.case_id,
+                                            stored.filename, stored.document_type)
+        logger.info(f"Indexed {pages} pages of {stored.document_id} for case {stored.case_id}")
+    except Exception as e:
+        logger.error(f"Error indexing document {stored.document_id}: {str(e)}", exc_info=True)
+
+def _require_all_pages(stored: StoredDocument) -> None:
+    """
+    OCR any pages an early exit skipped (when the background pass hasn't finished
+    yet). Blocking: async endpoints call it through run_in_threadpool.
+    """
+    if stored.ocr.pages_processed < stored.ocr.page_count and not stored.ocr.error:
+        _finish_ocr(stored.document_id)
+
+def _transaction_stream(file_bytes: Optional[bytes], filename: Optional[str],
+                        stored: Optional[StoredDocument]) -> Iterator[bytes]:
+    """NDJSON records: one per page as it is OCR'd (or read from the store), then the monthly summary"""
+    extractor = TransactionExtractor()
+
+    def page_record(document: OcrDocument, page: int) -> bytes:
+        start = time.perf_counter()
+        transactions = extractor.extract_page(PageLayout(document, page))
+        metrics.observe("transactions.page_ms", (time.perf_counter() - start) * 1000)
+        metrics.increment("transactions.rows", len(transactions))
+        return ndjson_line({"page": page, "pages_total": document.page_count, "transactions": transactions})
+
+    try:
+        if stored is not None:
+            _require_all_pages(stored)
+            for page in range(1, stored.ocr.page_count + 1):
+                yield page_record(stored.ocr, page)
+        else:
+            document = OcrDocument()
+            with closing(ocr_service.iter_pages(file_bytes, filename, document)) as pages:
+                for page in pages:
+                    yield page_record(document, page)
+            stored = document_store.put(filename, file_bytes, document, "bank_statement")
+
+        yield ndjson_line({
+            "summary": {
+                "monthly": extractor.totals.to_list(),
+                "transaction_count": extractor.count,
+                "statement_period": [d.isoformat() for d in extractor.period] if extractor.period else None,
+            },
+            "document_id": stored.document_id,
+        })
+    except Exception as e:
+        # Headers are already sent; report the failure as the last record
+        logger.error(f"Error extracting transactions: {str(e)}", exc_info=True)
+        yield ndjson_line({"error": f"Transaction extraction failed: {str(e)}"})
+
+def _parse_segments(stored: StoredDocument, segments: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Parse each typed page range of a mixed packet with its own parser"""
+    parsed_segments = []
+    for segment in segments:
+        parser = parsers.get(segment["document_type"], parsers["generic"])
+        parsed = parser.parse(stored.ocr.page_slice(segment["page_start"], segment["page_end"]))
+        parsed_segments.append({
+            **segment,
+            "extracted_data": parsed.get("extracted_data", {}),
+            "parse_confidence": parsed.get("confidence", 0.0),
+            "warnings": parsed.get("warnings", []),
+        })
+    return parsed_segments
+
+def _parse_stored(stored: StoredDocument, document_type: str) -> Dict[str, Any]:
+    """Parse a stored document, reusing an earlier parse for the same type"""
+    parsed_data = stored.parsed.get(document_type)
+    if parsed_data is None:
+        # Select appropriate parser
+        parser = parsers.get(document_type, parsers["generic"])
+        
+        # Parse extracted text into structured data
+        parsed_data = parser.parse(stored.ocr)
+        stored.parsed[document_type] = parsed_data
+    return parsed_data
+
+def _ocr_response(request: Request, stored: StoredDocument, document_type: str, include_raw_ocr: bool,
+                  raw_ocr_page_filter: Optional[Set[int]], bbox_format: str,
+                  warnings: Optional[List[str]] = None, **extra: Any) -> Response:
+    """Build and encode the OcrResponse for a stored document (extra: additional response fields)"""
+    parsed_data = _parse_stored(stored, document_type)
+    
+    logger.info(f"Extraction complete: {len(parsed_data.get('extracted_data', {}))} fields extracted")
+    
+    response = OcrResponse(
+        extracted_data=parsed_data.get("extracted_data", {}),
+        confidence=parsed_data.get("confidence", 0.0),
+        suggestions=parsed_data.get("suggestions", []),
+        warnings=(warnings or []) + parsed_data.get("warnings", []),
+        document_type=document_type,
+        document_id=stored.document_id,
+        pages_processed=stored.ocr.pages_processed,
+        pages_total=stored.ocr.page_count,
+        **extra
+    )
+
+    # raw_ocr is converted from the columnar result only here, after
+    # validation: it is by far the largest part of the payload
+    payload = response.model_dump()
+    payload["raw_ocr"] = (
+        stored.ocr.to_blocks(pages=raw_ocr_page_filter, bbox_format=bbox_format)
+        if include_raw_ocr else []
+    )
+    return encode_response(payload, request.headers.get("accept"))
+
 @app.post("/api/ocr/extract", response_model=OcrResponse)
 async def extract_document_data(
+    request: Request,
+    background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
-    document_type: str = Form("unknown")
+    document_type: str = Form("auto"),
+    split_packet: bool = Form(False),
+    case_id: Optional[str] = Form(None),
+    early_exit: bool = Form(False),
+    min_field_confidence: float = Form(DEFAULT_MIN_CONFIDENCE),
+    finish_in_background: bool = Form(True),
+    include_raw_ocr: bool = Form(True),
+    raw_ocr_pages: Optional[str] = Form(None),
+    bbox_format: str = Form("quad")
 ):
     """
     Extract structured data from uploaded document.
     
+    With document_type "auto" (or "unknown", or any unsupported type) the type is
+    detected from the first page before the full OCR pass and reported as
+    detected_type / classification_confidence.
+    
+    The upload and its OCR result are kept server-side; the returned
+    document_id can be passed to validation, re-parse and export calls.
+    
+    With early_exit, PDF pages are parsed as they are OCR'd and OCR stops once
+    the parser's required fields are found (tax return: AGI and tax year); the
+    response then has early_exit=true and pages_processed < pages_total. The
+    skipped pages are OCR'd after the response is sent unless
+    finish_in_background is false, so later export and validation calls on the
+    document_id see the whole document.
+    
     Args:
         file: Uploaded document (PDF, JPG, PNG)
-        document_type: Type of document (paystub, bank_ statement, tax_return, generic)
+        document_type: Type of document (auto, paystub, bank_statement, tax_return, generic)
+        split_packet: Classify every page and parse each typed run of pages separately (segments)
+        case_id: Client case; the OCR text is added to that case's full-text search index
+        early_exit: Opt in to stopping OCR once required fields are found (ignored with split_packet)
+        min_field_confidence: Confidence a required field needs to count as found for early exit
+        finish_in_background: OCR the pages skipped by early exit after responding
+        include_raw_ocr: Set false to omit raw_ocr from the response
+        raw_ocr_pages: Optional 1-based page filter for raw_ocr, e.g. "1,3-5"
+        bbox_format: "quad" (flattened 8-int polygon) or "box" ([x1, y1, x2, y2])
     
     Returns:
-        OcrResponse with extracted data, confidence, and warnings
+        OcrResponse with extracted data, confidence, warnings and document_id.
+        Encoded as msgpack when the Accept header asks for application/msgpack.
     """
+    raw_ocr_page_filter = _check_raw_ocr_options(raw_ocr_pages, bbox_format)
+    if not 0.0 <= min_field_confidence <= 1.0:
+        raise HTTPException(status_code=400, detail="min_field_confidence must be between 0 and 1")
+
     try:
         logger.info(f"Processing document: {file.filename}, type: {document_type}")
         
-        # Read file bytes
         file_bytes = await file.read()
+        warnings: List[str] = []
         
-        # Run OCR using PaddleOCR
-        ocr_result = ocr_service.extract_text(file_bytes, file.filename)
+        auto = document_type in AUTO_TYPES or document_type not in parsers
+        if auto and document_type not in AUTO_TYPES:
+            warnings.append(f"Unsupported document_type '{document_type}'; type was detected automatically")
         
-        # Select appropriate parser
-        parser = parsers.get(document_type, parsers["generic"])
+        # Route from a cheap look at the page text before the full OCR pass
+        quick_texts = None
+        if auto or split_packet:
+            quick_texts = ocr_service.quick_page_texts(file_bytes, file.filename, max_pages=None if split_packet else 1)
+        classification = classifier.classify(quick_texts[0]) if auto and quick_texts else None
         
-        # Parse extracted text into structured data
-        parsed_data = parser.parse(ocr_result)
+        # Parse pages as OCR produces them once the parser is known
+        routed_type = classification.document_type if classification else (None if auto else document_type)
+        tracker = None
+        if early_exit and not split_packet and routed_type is not None:
+            tracker = EarlyExitTracker(parsers.get(routed_type, parsers["generic"]), min_field_confidence)
         
-        logger.info(f"Extraction complete: {len(parsed_data.get('extracted_data', {}))} fields extracted")
+        ocr_result = _run_ocr(file_bytes, file.filename,
+                              should_stop=tracker if tracker is not None and tracker.enabled else None)
+        if auto and classification is None:
+            # Images have no text layer; classify from the OCR result instead
+            classification = classifier.classify(ocr_result.page_text(1))
         
-        return OcrResponse(
-            extracted_data=parsed_data.get("extracted_data", {}),
-            confidence=parsed_data.get("confidence", 0.0),
-            raw_ocr=ocr_result.get("text_blocks", []),
-            suggestions=parsed_data.get("suggestions", []),
-            warnings=parsed_data.get("warnings", []),
-            document_type=document_type
-        )
+        resolved_type = classification.document_type if classification else document_type
+        stored = document_store.put(file.filename, file_bytes, ocr_result, resolved_type, case_id=case_id)
+        if case_id:
+            background_tasks.add_task(_index_stored, stored)
+        
+        extra: Dict[str, Any] = {}
+        if ocr_result.pages_processed < ocr_result.page_count and not ocr_result.error:
+            extra["early_exit"] = True
+            logger.info(f"Early exit after page {ocr_result.pages_processed} of {ocr_result.page_count}")
+            if finish_in_background:
+                background_tasks.add_task(_finish_ocr, stored.document_id)
+        if classification is not None:
+            extra["detected_type"] = classification.document_type
+            extra["classification_confidence"] = classification.confidence
+            metrics.increment(f"classifier.detected.{classification.document_type}")
+        if split_packet:
+            page_texts = quick_texts or [ocr_result.page_text(p) for p in range(1, ocr_result.page_count + 1)]
+            extra["segments"] = _parse_segments(stored, classifier.segment(page_texts))
+        
+        return _ocr_response(request, stored, resolved_type, include_raw_ocr, raw_ocr_page_filter, bbox_format,
+                             warnings=warnings, **extra)
         
     except Exception as e:
         logger.error(f"Error processing document: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"OCR extraction failed: {str(e)}")
 
+@app.post("/api/ocr/classify", response_model=ClassificationResponse)
+async def classify_document(
+    file: UploadFile = File(...),
+    split_packet: bool = Form(False)
+):
+    """
+    Detect a document's type from its first page (or every page with split_packet)
+    without running the full OCR pass on PDFs.
+    
+    Images have no text layer, so they are OCR'd and stored; the response then
+    carries a document_id for a follow-up parse call.
+    """
+    try:
+        file_bytes = await file.read()
+        quick_texts = ocr_service.quick_page_texts(file_bytes, file.filename, max_pages=None if split_packet else 1)
+        
+        document_id = None
+        if quick_texts is None:
+            ocr_result = _run_ocr(file_bytes, file.filename)
+            quick_texts = [ocr_result.page_text(1)]
+            classification = classifier.classify(quick_texts[0])
+            document_id = document_store.put(file.filename, file_bytes, ocr_result, classification.document_type).document_id
+        else:
+            classification = classifier.classify(quick_texts[0] if quick_texts else "")
+        
+        return ClassificationResponse(
+            **classification.to_dict(),
+            segments=classifier.segment(quick_texts) if split_packet else [],
+            document_id=document_id
+        )
+        
+    except Exception as e:
+        logger.error(f"Error classifying document: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Classification failed: {str(e)}")
+
+@app.post("/api/ocr/documents/{document_id}/parse", response_model=OcrResponse)
+async def reparse_document(
+    request: Request,
+    document_id: str,
+    document_type: str = Form(...),
+    include_raw_ocr: bool = Form(True),
+    raw_ocr_pages: Optional[str] = Form(None),
+    bbox_format: str = Form("quad")
+):
+    """
+    Re-parse a stored upload as a different document type without re-running OCR.
+    """
+    raw_ocr_page_filter = _check_raw_ocr_options(raw_ocr_pages, bbox_format)
+    stored = await _load_document(None, document_id)
+
+    try:
+        logger.info(f"Re-parsing document {document_id} as {document_type}")
+        stored.document_type = document_type
+        return _ocr_response(request, stored, document_type, include_raw_ocr, raw_ocr_page_filter, bbox_format)
+    except Exception as e:
+        logger.error(f"Error re-parsing document: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Re-parse failed: {str(e)}")
+
+@app.get("/api/ocr/documents/{document_id}", response_model=OcrResponse)
+async def export_document(
+    request: Request,
+    document_id: str,
+    include_raw_ocr: bool = True,
+    raw_ocr_pages: Optional[str] = None,
+    bbox_format: str = "quad"
+):
+    """
+    Export the stored OCR result of a prior upload, parsed as its current document type.
+    """
+    raw_ocr_page_filter = _check_raw_ocr_options(raw_ocr_pages, bbox_format)
+    stored = await _load_document(None, document_id)
+    return _ocr_response(request, stored, stored.document_type, include_raw_ocr, raw_ocr_page_filter, bbox_format)
+
+@app.get("/api/ocr/documents/{document_id}/file")
+async def export_document_file(document_id: str):
+    """Return the original upload of a stored document"""
+    stored = await _load_document(None, document_id)
+    return Response(
+        content=stored.file_bytes,
+        media_type="application/octet-stream",
+        headers={"Content-Disposition": f'attachment; filename="{stored.filename}"'}
+    )
+
+@app.post("/api/ocr/documents/{document_id}/index")
+async def index_document(document_id: str, case_id: str = Form(...)):
+    """Add a stored upload's OCR text to a case's full-text search index"""
+    stored = await _load_document(None, document_id)
+    await run_in_threadpool(_require_all_pages, stored)
+    stored.case_id = case_id
+    pages = search_index.index_document(stored.document_id, stored.ocr, case_id, stored.filename, stored.document_type)
+    return {"document_id": document_id, "case_id": case_id, "pages_indexed": pages}
+
+@app.get("/api/ocr/search", response_model=SearchResponse)
+async def search_documents(q: str, case_id: Optional[str] = None, limit: int = 20):
+    """
+    Full-text search over indexed OCR text.
+    
+    Every word of q must appear on the page ("quoted phrases" and trailing *
+    prefixes are supported). Hits are pages ranked by bm25, each with a snippet
+    and the offsets and bounding boxes of the matched terms.
+    """
+    if not 1 <= limit <= 200:
+        raise HTTPException(status_code=400, detail="limit must be between 1 and 200")
+    start = time.perf_counter()
+    try:
+        hits = search_index.search(q, case_id=case_id, limit=limit)
+    except Exception as e:
+        logger.error(f"Error searching documents: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Search failed: {str(e)}")
+    return SearchResponse(query=q, case_id=case_id, hits=hits, took_ms=round((time.perf_counter() - start) * 1000, 3))
+
+@app.delete("/api/ocr/documents/{document_id}")
+async def delete_document(document_id: str):
+    """Drop a stored upload before its TTL expires"""
+    if not document_store.delete(document_id):
+        raise HTTPException(status_code=404, detail=f"Unknown or expired document_id: {document_id}")
+    search_index.delete_document(document_id)
+    return {"deleted": document_id}
+
 @app.post("/api/ocr/validate", response_model=ValidationResponse)
 async def validate_field_against_document(
-    file: UploadFile = File(...),
+    file: Optional[UploadFile] = File(None),
+    document_id: Optional[str] = Form(None),
     field_value: str = Form(...),
-    field_type: str = Form("text")
+    field_type: str = Form("text"),
+    field_name: Optional[str] = Form(None)
 ):
     """
     Validate user-entered field value against document.
     
     Args:
-        file: Uploaded document to validate against
+        file: Uploaded document to validate against (omit when passing document_id)
+        document_id: Id of a prior upload returned by /api/ocr/extract
         field_value: Value entered by user
         field_type: Type of field (currency, date, text, etc.)
+        field_name: Name of the form field, for logs (defaults to "field_value")
     
     Returns:
         ValidationResponse with match status and extracted value
     """
+    stored = await _load_document(file, document_id)
+
     try:
-        logger.info(f"Validating field: {field_type} = {field_value}")
+        field = field_name or "field_value"
+        logger.info(f"Validating field: {field} ({field_type}) = {field_value}")
         
-        # Read file bytes
-        file_bytes = await file.read()
-        
-        # Run OCR
-        ocr_result = ocr_service.extract_text(file_bytes, file.filename)
+        verdict = FieldValidator(stored.token_index).validate(field, field_value, field_type)
         
-        # Extract raw text
-        raw_text = " ".join([block.get("text", "") for block in ocr_result.get("text_blocks", [])])
+        return ValidationResponse(
+            matches=verdict["matches"],
+            extracted_value=verdict["extracted_value"],
+            confidence=verdict["confidence"],
+            message=verdict["message"],
+            document_id=stored.document_id
+        )
         
-        # Simple validation: check if value appears in document
-        # TODO: Implement more sophisticated validation logic
-        normalized_text = raw_text.lower().replace(",", "").replace("$", "")
-        normalized_value = field_value.lower().replace(",", "").replace("$", "")
+    except Exception as e:
+        logger.error(f"Error validating field: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Validation failed: {str(e)}")
+
+@app.post("/api/ocr/validate/fields", response_model=MultiFieldValidationResponse)
+async def validate_fields_against_document(
+    file: Optional[UploadFile] = File(None),
+    document_id: Optional[str] = Form(None),
+    fields: str = Form(...)
+):
+    """
+    Validate several user-entered values against one document with a single OCR pass.
+    
+    Args:
+        file: Uploaded document to validate against (omit when passing document_id)
+        document_id: Id of a prior upload returned by /api/ocr/extract
+        fields: JSON array of {"field", "value", "type"} items
+                (type: currency, date, name or text)
+    
+    Returns:
+        MultiFieldValidationResponse with one verdict per field
+    """
+    try:
+        checks = field_checks_adapter.validate_json(fields)
+    except ValidationError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid fields: {str(e)}")
+
+    stored = await _load_document(file, document_id)
+
+    try:
+        logger.info(f"Validating {len(checks)} fields against {stored.filename}")
         
-        matches = normalized_value in normalized_text
+        results = FieldValidator(stored.token_index).validate_all([check.model_dump() for check in checks])
         
-        return ValidationResponse(
-            matches=matches,
-            extracted_value=field_value if matches else "",
-            confidence=0.9 if matches else 0.0,
-            message="Value found in document" if matches else "Value not found in document"
+        return MultiFieldValidationResponse(
+            results=results,
+            matched=sum(1 for r in results if r["matches"]),
+            total=len(results),
+            document_id=stored.document_id
         )
         
     except Exception as e:
-        logger.error(f"Error validating field: {str(e)}", exc_info=True)
+        logger.error(f"Error validating fields: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Validation failed: {str(e)}")
 
+@app.post("/api/ocr/paystubs", response_model=PaystubBatchResponse)
+async def parse_paystub_batch(
+    file: Optional[UploadFile] = File(None),
+    document_id: Optional[str] = Form(None),
+    filing_date: Optional[str] = Form(None)
+):
+    """
+    Split an upload holding several paystubs into individual stubs, parse each,
+    and total gross and net pay over the means test's six-month lookback.
+    
+    Args:
+        file: PDF or image with one or more paystubs (omit when passing document_id)
+        document_id: Id of a prior upload returned by /api/ocr/extract
+        filing_date: Petition date (default today); the lookback is the six full
+                     calendar months before its month
+    
+    Returns:
+        PaystubBatchResponse with per-stub records and the income aggregate
+    """
+    filed_on = None
+    if filing_date:
+        iso = normalize_date(filing_date)
+        if iso is None:
+            raise HTTPException(status_code=400, detail=f"Invalid filing_date: {filing_date}")
+        filed_on = date.fromisoformat(iso)
+
+    stored = await _load_document(file, document_id, "paystub")
+
+    try:
+        await run_in_threadpool(_require_all_pages, stored)
+        
+        stubs = paystub_batch_parser.parse(stored.ocr)
+        logger.info(f"Parsed {len(stubs)} paystubs from {stored.filename}")
+        income = aggregate_income(stubs, filed_on)
+        
+        return PaystubBatchResponse(
+            stubs=stubs,
+            income=income,
+            warnings=income.pop("warnings"),
+            document_id=stored.document_id
+        )
+        
+    except Exception as e:
+        logger.error(f"Error parsing paystubs: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Paystub parsing failed: {str(e)}")
+
+@app.post("/api/ocr/transactions")
+async def stream_bank_transactions(
+    file: Optional[UploadFile] = File(None),
+    document_id: Optional[str] = Form(None)
+):
+    """
+    Extract the transaction table of a bank statement, streamed page by page.
+    
+    The response is NDJSON: one {"page", "pages_total", "transactions"} record per
+    page as soon as that page is OCR'd, then a final {"summary", "document_id"}
+    record with deposits and withdrawals totalled per month. A failure part-way
+    through arrives as a final {"error"} record.
+    
+    Args:
+        file: Bank statement PDF or image (omit when passing document_id)
+        document_id: Id of a prior upload returned by /api/ocr/extract
+    """
+    stored = None
+    file_bytes = None
+    filename = None
+    if document_id:
+        stored = await _load_document(None, document_id)
+    elif file is None:
+        raise HTTPException(status_code=400, detail="Provide either file or document_id")
+    else:
+        file_bytes = await file.read()
+        filename = file.filename
+    
+    return StreamingResponse(_transaction_stream(file_bytes, filename, stored), media_type=NDJSON_MEDIA_TYPE)
+
+@app.post("/api/ocr/creditors", response_model=CreditorResponse)
+async def extract_creditors(
+    file: Optional[UploadFile] = File(None),
+    document_id: Optional[str] = Form(None),
+    case_id: Optional[str] = Form(None)
+):
+    """
+    Extract creditor names from a statement, collection letter or credit report.
+    
+    With case_id the document's creditors are also added to that case's
+    deduplicated creditor list (variants like "CAPITAL ONE BANK USA NA" and
+    "Capital One" collapse into one entry), returned as case_creditors.
+    
+    Args:
+        file: Uploaded document (omit when passing document_id)
+        document_id: Id of a prior upload returned by /api/ocr/extract
+        case_id: Client case the document belongs to
+    """
+    stored = await _load_document(file, document_id, "credit_report")
+
+    try:
+        await run_in_threadpool(_require_all_pages, stored)
+        
+        parsed = _parse_stored(stored, "credit_report")
+        logger.info(f"Found {parsed['extracted_data']['creditor_count']} creditors in {stored.filename}")
+        
+        case_creditors = []
+        if case_id:
+            if stored.case_id != case_id:
+                stored.case_id = case_id
+                _index_stored(stored)
+            candidates = creditor_parser.candidates(stored.ocr)
+            case_creditors = creditor_cases.add_document(case_id, stored.document_id, candidates).clusters()
+        
+        return CreditorResponse(
+            creditors=parsed["extracted_data"]["creditors"],
+            case_creditors=case_creditors,
+            warnings=parsed.get("warnings", []),
+            document_id=stored.document_id,
+            case_id=case_id
+        )
+        
+    except Exception as e:
+        logger.error(f"Error extracting creditors: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Creditor extraction failed: {str(e)}")
+
+@app.get("/api/ocr/cases/{case_id}/creditors", response_model=CreditorResponse)
+async def get_case_creditors(case_id: str):
+    """Deduplicated creditors collected for a case so far"""
+    index = creditor_cases.get(case_id)
+    if index is None:
+        raise HTTPException(status_code=404, detail=f"Unknown case_id: {case_id}")
+    return CreditorResponse(case_creditors=index.clusters(), case_id=case_id)
+
 @app.post("/api/property/report", response_model=PropertyReportResponse)
 async def generate_property_report(request: PropertyReportRequest):
     """
@@ -162,12 +744,85 @@ async def generate_property_report(request: PropertyReportRequest):
     """
     try:
         logger.info(f"Generating property report for: {request.address}")
-        report = property_service.generate_report(request.address)
+        report = property_service.generate_report(request.address, force_refresh=request.force_refresh)
         return PropertyReportResponse(success=True, report=report)
     except Exception as e:
         logger.error(f"Error generating property report: {str(e)}", exc_info=True)
         return PropertyReportResponse(success=False, error=str(e))
 
+@app.post("/api/property/report/stream")
+async def stream_property_report(request: PropertyReportRequest, http_request: Request):
+    """
+    Property report streamed section by section as ATTOM answers.
+
+    Sends attom_id, then owner/profile/mortgage/valuation/assessment/sale in the
+    order their endpoints respond (each with its own status), equity once
+    valuation and mortgage are both in, and a closing "done" record. Server-sent
+    events when the client accepts text/event-stream, NDJSON otherwise.
+    """
+    use_sse = SSE_MEDIA_TYPE in http_request.headers.get("accept", "")
+
+    def stream() -> Iterator[bytes]:
+        try:
+            for event in property_service.iter_report(request.address, force_refresh=request.force_refresh):
+                yield sse_event(event["section"], event) if use_sse else ndjson_line(event)
+        except Exception as e:
+            logger.error(f"Error streaming property report: {str(e)}", exc_info=True)
+            event = {"section": "done", "status": "error", "errors": {"report": str(e)}}
+            yield sse_event("done", event) if use_sse else ndjson_line(event)
+
+    return StreamingResponse(
+        stream(),
+        media_type=SSE_MEDIA_TYPE if use_sse else NDJSON_MEDIA_TYPE,
+        headers={"Cache-Control": "no-cache"},
+    )
+
+MAX_BULK_ADDRESSES = 1000
+
+@app.post("/api/property/reports")
+async def generate_property_reports(request: PropertyBulkReportRequest):
+    """
+    Property reports for many addresses, streamed as NDJSON.
+
+    One record per input address ({index, address, success, report | error}) in
+    completion order, then a summary record. Duplicate addresses (after
+    canonicalization) are fetched once; ATTOM calls are paced by the shared
+    rate limiter and retried with backoff on 429/5xx. Blank addresses are
+    rejected rather than skipped, so every index refers to request.addresses.
+    """
+    addresses = request.addresses
+    if not addresses:
+        raise HTTPException(status_code=400, detail="No addresses provided")
+    blank = [i for i, address in enumerate(addresses) if not address or not address.strip()]
+    if blank:
+        raise HTTPException(status_code=400, detail=f"Blank addresses at index {', '.join(map(str, blank[:20]))}")
+    if len(addresses) > MAX_BULK_ADDRESSES:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BULK_ADDRESSES} addresses per request")
+
+    def stream() -> Iterator[bytes]:
+        start = time.perf_counter()
+        succeeded = 0
+        results = property_service.generate_reports(addresses, force_refresh=request.force_refresh)
+        try:
+            for result in results:
+                succeeded += result["success"]
+                yield ndjson_line(result)
+        except Exception as e:
+            logger.error(f"Error generating property reports: {str(e)}", exc_info=True)
+            yield ndjson_line({"error": f"Bulk property report failed: {str(e)}"})
+            return
+        finally:
+            # A disconnected client closes this stream; cancel the queued addresses with it
+            results.close()
+        yield ndjson_line({"summary": {
+            "addresses": len(addresses),
+            "succeeded": succeeded,
+            "failed": len(addresses) - succeeded,
+            "elapsed_ms": round((time.perf_counter() - start) * 1000, 1),
+        }})
+
+    return StreamingResponse(stream(), media_type=NDJSON_MEDIA_TYPE)
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
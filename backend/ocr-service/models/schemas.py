@@ -8,7 +8,8 @@ class OcrTextBlock(BaseModel):
     """Single text block from OCR result"""
     text: str
     confidence: float = Field(ge=0.0, le=1.0)
-    bbox: List[int] = Field(default_factory=list)  # [x1, y1, x2, y2]
+    bbox: List[int] = Field(default_factory=list)  # 8-int polygon, or [x1, y1, x2, y2] with bbox_format=box
+    page: Optional[int] = None
 
 class OcrSuggestion(BaseModel):
     """Suggested field value with confidence"""
@@ -24,6 +25,21 @@ class OcrResponse(BaseModel):
     suggestions: List[OcrSuggestion] = Field(default_factory=list)
     warnings: List[str] = Field(default_factory=list)
     document_type: str = "unknown"
+    document_id: Optional[str] = None
+    detected_type: Optional[str] = None
+    classification_confidence: Optional[float] = None
+    segments: List[Dict[str, Any]] = Field(default_factory=list)  # per-type page runs of a split packet
+    pages_processed: Optional[int] = None  # below pages_total when OCR stopped early
+    pages_total: Optional[int] = None
+    early_exit: bool = False
+
+class ClassificationResponse(BaseModel):
+    """Response from document classification endpoint"""
+    document_type: str
+    confidence: float = Field(ge=0.0, le=1.0)
+    scores: Dict[str, int] = Field(default_factory=dict)
+    segments: List[Dict[str, Any]] = Field(default_factory=list)
+    document_id: Optional[str] = None
 
 class ValidationResponse(BaseModel):
     """Response from field validation endpoint"""
@@ -31,10 +47,63 @@ class ValidationResponse(BaseModel):
     extracted_value: str = ""
     confidence: float = Field(ge=0.0, le=1.0)
     message: str = ""
+    document_id: Optional[str] = None
+
+class FieldCheck(BaseModel):
+    """One user-entered value to check against a document"""
+    field: str
+    value: str
+    type: str = "text"  # currency, date, name, text
+
+class FieldVerdict(BaseModel):
+    """Validation result for a single field"""
+    field: str
+    value: str
+    type: str = "text"
+    matches: bool
+    extracted_value: str = ""
+    confidence: float = Field(ge=0.0, le=1.0)
+    message: str = ""
+    locations: List[Dict[str, Any]] = Field(default_factory=list)  # [{page, bbox}] of each match
+
+class MultiFieldValidationResponse(BaseModel):
+    """Response from multi-field validation endpoint"""
+    results: List[FieldVerdict] = Field(default_factory=list)
+    matched: int = 0
+    total: int = 0
+    document_id: Optional[str] = None
+
+class PaystubBatchResponse(BaseModel):
+    """Response from multi-paystub endpoint"""
+    stubs: List[Dict[str, Any]] = Field(default_factory=list)  # one parsed record per stub
+    income: Dict[str, Any] = Field(default_factory=dict)  # six-month lookback totals and monthly averages
+    warnings: List[str] = Field(default_factory=list)
+    document_id: Optional[str] = None
+
+class CreditorResponse(BaseModel):
+    """Response from creditor extraction endpoints"""
+    creditors: List[Dict[str, Any]] = Field(default_factory=list)  # this document, deduplicated
+    case_creditors: List[Dict[str, Any]] = Field(default_factory=list)  # whole case, deduplicated
+    warnings: List[str] = Field(default_factory=list)
+    document_id: Optional[str] = None
+    case_id: Optional[str] = None
+
+class SearchResponse(BaseModel):
+    """Response from full-text search endpoint"""
+    query: str
+    case_id: Optional[str] = None
+    hits: List[Dict[str, Any]] = Field(default_factory=list)  # ranked pages with snippet and highlights
+    took_ms: float = 0.0
 
 class PropertyReportRequest(BaseModel):
     """Request to generate property report"""
     address: str
+    force_refresh: bool = False  # bypass the ATTOM response cache
+
+class PropertyBulkReportRequest(BaseModel):
+    """Request to generate property reports for many addresses"""
+    addresses: List[str]
+    force_refresh: bool = False
 
 class PropertyReportResponse(BaseModel):
     """Response containing property report data"""
@@ -0,0 +1,156 @@
+"""
+Property Address Canonicalization and attomId Index
+
+"123 Main St." and "123 MAIN STREET" are the same property but different
+strings, so every spelling used to cost its own /property/id call. Addresses
+are reduced to one canonical key:
+
+- upper case, punctuation dropped, whitespace collapsed
+- USPS street suffix and directional abbreviations (STREET -> ST, NORTH -> N)
+- unit designators folded to "#" ("Apt 4B", "Unit 4B", "# 4B" -> "#4B")
+- state names -> two-letter codes, ZIP+4 -> five-digit ZIP, trailing "USA" dropped
+
+The key is only used for lookups; ATTOM still receives the address as typed.
+AttomIdIndex maps canonical addresses to resolved attomIds in SQLite
+(ATTOM_ID_INDEX_DB) and is shared by PropertyService and attom_case_report.py,
+so repeat properties across co-debtors and re-filings skip the ID round-trip.
+
+Standard library only: the CLI imports this module without the service's
+dependencies installed.
+"""
+import os
+import re
+import time
+import sqlite3
+import threading
+from typing import Dict, Any, Optional
+
+DEFAULT_DB_PATH = "attom-ids.sqlite3"
+
+# USPS Publication 28 street suffixes (common subset)
+STREET_SUFFIXES = {
+    "ALLEY": "ALY", "AVENUE": "AVE", "AV": "AVE", "AVEN": "AVE", "BOULEVARD": "BLVD", "BOUL": "BLVD",
+    "CIRCLE": "CIR", "CIRC": "CIR", "COURT": "CT", "CRT": "CT", "COVE": "CV", "CREEK": "CRK",
+    "CROSSING": "XING", "DRIVE": "DR", "DRV": "DR", "EXPRESSWAY": "EXPY", "FREEWAY": "FWY",
+    "HEIGHTS": "HTS", "HIGHWAY": "HWY", "HIWAY": "HWY", "HOLLOW": "HOLW", "LANE": "LN", "LOOP": "LOOP",
+    "MANOR": "MNR", "PARKWAY": "PKWY", "PKY": "PKWY", "PLACE": "PL", "PLAZA": "PLZ", "POINT": "PT",
+    "RIDGE": "RDG", "ROAD": "RD", "ROUTE": "RTE", "SQUARE": "SQ", "STREET": "ST", "STR": "ST",
+    "TERRACE": "TER", "TRAIL": "TRL", "TURNPIKE": "TPKE", "VIEW": "VW", "VILLAGE": "VLG", "WAY": "WAY",
+}
+SUFFIX_CODES = set(STREET_SUFFIXES.values())
+
+DIRECTIONALS = {
+    "NORTH": "N", "SOUTH": "S", "EAST": "E", "WEST": "W",
+    "NORTHEAST": "NE", "NORTHWEST": "NW", "SOUTHEAST": "SE", "SOUTHWEST": "SW",
+}
+
+# Secondary unit designators; the unit number identifies the unit, the word varies by who typed it
+UNIT_DESIGNATORS = {
+    "APARTMENT": "#", "APT": "#", "SUITE": "#", "STE": "#", "UNIT": "#", "ROOM": "#", "RM": "#",
+    "SPACE": "#", "SPC": "#", "TRAILER": "#", "TRLR": "#", "NUMBER": "#", "NO": "#",
+    "BUILDING": "BLDG", "FLOOR": "FL", "DEPARTMENT": "DEPT",
+}
+
+STATES = {
+    "ALABAMA": "AL", "ALASKA": "AK", "ARIZONA": "AZ", "ARKANSAS": "AR", "CALIFORNIA": "CA",
+    "COLORADO": "CO", "CONNECTICUT": "CT", "DELAWARE": "DE", "FLORIDA": "FL", "GEORGIA": "GA",
+    "HAWAII": "HI", "IDAHO": "ID", "ILLINOIS": "IL", "INDIANA": "IN", "IOWA": "IA", "KANSAS": "KS",
+    "KENTUCKY": "KY", "LOUISIANA": "LA", "MAINE": "ME", "MARYLAND": "MD", "MASSACHUSETTS": "MA",
+    "MICHIGAN": "MI", "MINNESOTA": "MN", "MISSISSIPPI": "MS", "MISSOURI": "MO", "MONTANA": "MT",
+    "NEBRASKA": "NE", "NEVADA": "NV", "NEW HAMPSHIRE": "NH", "NEW JERSEY": "NJ", "NEW MEXICO": "NM",
+    "NEW YORK": "NY", "NORTH CAROLINA": "NC", "NORTH DAKOTA": "ND", "OHIO": "OH", "OKLAHOMA": "OK",
+    "OREGON": "OR", "PENNSYLVANIA": "PA", "RHODE ISLAND": "RI", "SOUTH CAROLINA": "SC",
+    "SOUTH DAKOTA": "SD", "TENNESSEE": "TN", "TEXAS": "TX", "UTAH": "UT", "VERMONT": "VT",
+    "VIRGINIA": "VA", "WASHINGTON": "WA", "WEST VIRGINIA": "WV", "WISCONSIN": "WI", "WYOMING": "WY",
+    "DISTRICT OF COLUMBIA": "DC",
+}
+# Longest first so "WEST VIRGINIA" wins over "VIRGINIA"
+STATE_PATTERN = re.compile(
+    r'\b(' + "|".join(sorted(STATES, key=len, reverse=True)) + r')\b(?=\s+\d{5}\b|\s*$)'
+)
+
+ZIP_PLUS_FOUR = re.compile(r'\b(\d{5})\s*-?\s*\d{4}\b')
+COUNTRY_SUFFIX = re.compile(r'\s+(?:USA|US|UNITED STATES(?: OF AMERICA)?)$')
+# Punctuation that separates tokens; "#" is kept as its own token (unit marker)
+PUNCTUATION = re.compile(r"[.,;:'\"()]+")
+TOKEN = re.compile(r'#|[A-Z0-9/&-]+')
+
+
+def canonicalize_address(address: str) -> str:
+    """Canonical lookup key for a US street address ('' when nothing is left)"""
+    text = PUNCTUATION.sub(" ", address.upper())
+    text = " ".join(text.split())
+    text = COUNTRY_SUFFIX.sub("", text)
+    text = ZIP_PLUS_FOUR.sub(r"\1", text)
+    text = STATE_PATTERN.sub(lambda m: STATES[m.group(1)], text)
+
+    tokens = TOKEN.findall(text)
+    out = []
+    for n, token in enumerate(tokens):
+        following = tokens[n + 1] if n + 1 < len(tokens) else None
+        if token in STREET_SUFFIXES and n > 0:
+            token = STREET_SUFFIXES[token]
+        elif token in DIRECTIONALS and following is not None and following not in SUFFIX_CODES \
+                and following not in STREET_SUFFIXES:
+            # "North Main St" -> "N MAIN ST", but "North St" is a street name
+            token = DIRECTIONALS[token]
+        elif token in UNIT_DESIGNATORS and following is not None \
+                and (following == "#" or any(ch.isdigit() for ch in following)):
+            token = UNIT_DESIGNATORS[token]
+        out.append(token)
+
+    # "APT # 4" -> "# # 4" -> "#4"
+    return re.sub(r'#(?:\s+#)*\s+(?=\w)', '#', " ".join(out))
+
+
+class AttomIdIndex:
+    """Canonical address -> attomId, persisted in SQLite"""
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS address_ids (
+        canonical TEXT PRIMARY KEY,
+        attom_id TEXT NOT NULL,
+        address TEXT,
+        resolved_at REAL
+    );
+    CREATE INDEX IF NOT EXISTS address_ids_attom ON address_ids(attom_id);
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or os.getenv("ATTOM_ID_INDEX_DB", DEFAULT_DB_PATH)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(self.SCHEMA)
+
+    def get(self, address: str) -> Optional[str]:
+        """attomId previously resolved for any spelling of this address"""
+        canonical = canonicalize_address(address)
+        if not canonical:
+            return None
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT attom_id FROM address_ids WHERE canonical = ?", (canonical,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return row[0]
+
+    def put(self, address: str, attom_id: Any) -> None:
+        canonical = canonicalize_address(address)
+        if not canonical or not attom_id:
+            return
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO address_ids VALUES (?, ?, ?, ?)",
+                (canonical, str(attom_id), address.strip(), time.time()),
+            )
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM address_ids").fetchone()[0]
+            return {"entries": entries, "hits": self.hits, "misses": self.misses, "path": self.path}
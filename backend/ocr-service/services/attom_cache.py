@@ -0,0 +1,135 @@
+"""
+ATTOM Response Cache
+
+Persistent SQLite cache in front of PropertyService._call_attom, keyed by
+endpoint and params. Every ATTOM call is billed, and paralegals re-open the same
+property snapshot often, so each endpoint keeps responses for as long as its
+data plausibly stays the same:
+
+- /property/id: permanent (an address's attomId doesn't change)
+- /attomavm/detail: one day
+- ownership and mortgage: a week
+- assessment, sale and building detail: months
+
+Expiry is checked on read against the current TTL table, so changing a TTL
+applies to rows already stored. Only successful responses are cached.
+"""
+import os
+import json
+import time
+import sqlite3
+import threading
+from typing import Dict, Any, Optional
+
+from services.metrics import metrics
+
+DEFAULT_DB_PATH = "attom-cache.sqlite3"
+
+DAY = 24 * 60 * 60
+
+# Seconds a response stays fresh; None = never expires
+ENDPOINT_TTLS: Dict[str, Optional[int]] = {
+    "/property/id": None,
+    "/attomavm/detail": DAY,
+    "/property/detailowner": 7 * DAY,
+    "/property/detailmortgageowner": 7 * DAY,
+    "/property/detail": 90 * DAY,
+    "/assessment/detail": 90 * DAY,
+    "/sale/detail": 30 * DAY,
+}
+DEFAULT_TTL = DAY
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    endpoint TEXT,
+    payload TEXT,
+    fetched_at REAL
+);
+"""
+
+
+def cache_key(endpoint: str, params: Optional[Dict[str, Any]]) -> str:
+    """Stable key for one call: endpoint plus params in sorted order"""
+    return endpoint + "?" + json.dumps(params or {}, sort_keys=True, separators=(",", ":"), default=str)
+
+
+class AttomCache:
+    """TTL-tiered SQLite cache of ATTOM payloads with hit/miss and fee-avoided counters"""
+
+    def __init__(self, path: Optional[str] = None, fee_per_call: Optional[float] = None):
+        self.path = path or os.getenv("ATTOM_CACHE_DB", DEFAULT_DB_PATH)
+        # What one ATTOM call costs, for the fees_avoided counter
+        self.fee_per_call = fee_per_call if fee_per_call is not None else float(
+            os.getenv("ATTOM_FEE_PER_CALL", "0"))
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(SCHEMA)
+
+    @staticmethod
+    def ttl(endpoint: str) -> Optional[int]:
+        return ENDPOINT_TTLS.get(endpoint, DEFAULT_TTL)
+
+    def get(self, endpoint: str, params: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+        """Fresh cached payload, or None (counted as a miss)"""
+        key = cache_key(endpoint, params)
+        with self._lock:
+            row = self._conn.execute("SELECT payload, fetched_at FROM responses WHERE key = ?", (key,)).fetchone()
+            ttl = self.ttl(endpoint)
+            if row is None or (ttl is not None and time.time() - row[1] > ttl):
+                self.misses += 1
+                metrics.increment("attom_cache.misses")
+                return None
+            self.hits += 1
+        metrics.increment("attom_cache.hits")
+        return json.loads(row[0])
+
+    def put(self, endpoint: str, params: Optional[Dict[str, Any]], payload: Dict[str, Any],
+            refreshed: bool = False) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?)",
+                (cache_key(endpoint, params), endpoint, json.dumps(payload, separators=(",", ":")), time.time()),
+            )
+            if refreshed:
+                self.refreshes += 1
+
+    def purge_expired(self) -> int:
+        """Delete rows past their endpoint's TTL; returns how many were removed"""
+        now = time.time()
+        removed = 0
+        with self._lock, self._conn:
+            for endpoint, ttl in list(ENDPOINT_TTLS.items()) + [(None, DEFAULT_TTL)]:
+                if ttl is None:
+                    continue
+                if endpoint is None:
+                    placeholders = ",".join("?" * len(ENDPOINT_TTLS))
+                    cursor = self._conn.execute(
+                        f"DELETE FROM responses WHERE endpoint NOT IN ({placeholders}) AND fetched_at < ?",
+                        (*ENDPOINT_TTLS, now - ttl),
+                    )
+                else:
+                    cursor = self._conn.execute(
+                        "DELETE FROM responses WHERE endpoint = ? AND fetched_at < ?", (endpoint, now - ttl))
+                removed += cursor.rowcount
+        return removed
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+            lookups = self.hits + self.misses
+            return {
+                "entries": entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "refreshes": self.refreshes,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "calls_avoided": self.hits,
+                "fees_avoided": round(self.hits * self.fee_per_call, 2),
+                "path": self.path,
+            }
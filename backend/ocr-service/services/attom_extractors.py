@@ -0,0 +1,135 @@
+"""
+ATTOM Response Extractors
+
+One declarative field-path spec per report section (owner, profile, mortgage,
+AVM, assessment, sale), shared by PropertyService and attom_case_report.py.
+
+Each field lists one or more paths under the section root
+(`property[0]`); later paths are fallbacks, taken when the earlier value is
+missing or empty (same as `a or b`). At import time every spec is compiled
+into a straight-line Python function, so extracting a section is one pass of
+direct subscripts: the root is walked once, not once per field, and a missing
+key costs one caught exception instead of a type check per step.
+
+Standard library only (the CLI imports it).
+"""
+from typing import Callable, Dict, List, Any, Sequence, Union
+
+PathStep = Union[str, int]
+Path = Sequence[PathStep]
+
+# Where every section's fields live in an ATTOM property response
+SECTION_ROOT: Path = ("property", 0)
+
+# section -> field -> alternative paths under SECTION_ROOT
+SECTION_SPECS: Dict[str, Dict[str, List[Path]]] = {
+    "owner": {
+        "address_one_line": [("address", "oneLine")],
+        "owner1": [("owner", "owner1", "fullname")],
+        "owner2": [("owner", "owner2", "fullname")],
+        "mailing_address": [("owner", "mailingaddressoneline")],
+        "is_corporate": [("owner", "corporateindicator")],
+        "is_absentee": [("owner", "absenteeownerstatus")],
+    },
+    "profile": {
+        "type": [("summary", "propertyType"), ("summary", "propclass")],
+        "year_built": [("summary", "yearbuilt")],
+        "beds": [("building", "rooms", "beds")],
+        "baths": [("building", "rooms", "bathstotal")],
+        "sqft": [("building", "size", "livingsize"), ("building", "size", "bldgsize")],
+        "lot_acres": [("lot", "lotsize1")],
+        "lot_sqft": [("lot", "lotsize2")],
+        "pool": [("lot", "pooltype")],
+    },
+    "mortgage": {
+        "amount": [("mortgage", "amount")],
+        "date": [("mortgage", "date")],
+        "loan_type": [("mortgage", "loantypecode")],
+        "rate_type": [("mortgage", "interestratetype")],
+        "lender_name": [("mortgage", "lender", "lastname")],
+        "lender_city": [("mortgage", "lender", "city")],
+        "lender_state": [("mortgage", "lender", "state")],
+        "title_company": [("mortgage", "title", "companyname")],
+    },
+    "avm": {
+        "date": [("avm", "eventDate")],
+        "value": [("avm", "amount", "value")],
+        "low": [("avm", "amount", "low")],
+        "high": [("avm", "amount", "high")],
+        "confidence_score": [("avm", "amount", "scr")],
+        "fsd": [("avm", "amount", "fsd")],
+    },
+    "assessment": {
+        "assessed_value": [("assessment", "assessed", "assdTtlValue"), ("assessment", "assessedValue")],
+        "tax_amount": [("assessment", "tax", "taxamt"), ("assessment", "taxAmount")],
+        "tax_year": [("assessment", "tax", "taxyear"), ("assessment", "taxYear")],
+    },
+    "sale": {
+        "price": [("sale", "amount", "saleamt"), ("sale", "saleamt")],
+        "date": [("sale", "saleTransDate"), ("sale", "salesearchdate"), ("sale", "date")],
+    },
+}
+
+# ATTOM endpoint -> the section its response feeds
+ENDPOINT_SECTIONS = {
+    "/property/detailowner": "owner",
+    "/property/detail": "profile",
+    "/property/detailmortgageowner": "mortgage",
+    "/attomavm/detail": "avm",
+    "/assessment/detail": "assessment",
+    "/sale/detail": "sale",
+}
+
+# Failures of a subscript chain on a missing or mistyped step
+_MISSING = (KeyError, IndexError, TypeError)
+
+
+def _subscripts(path: Path) -> str:
+    return "".join(f"[{step!r}]" for step in path)
+
+
+def compile_extractor(fields: Dict[str, List[Path]], root: Path = SECTION_ROOT,
+                      name: str = "extract") -> Callable[[Any], Dict[str, Any]]:
+    """
+    Build a function payload -> {field: value or None} from a field spec.
+
+    The generated code subscripts directly and catches the failure once per
+    path; None values count as missing, like the old safe_get walkers.
+    """
+    lines = [
+        f"def {name}(payload):",
+        "    try:",
+        f"        r = payload{_subscripts(root)}",
+        "    except _MISSING:",
+        "        r = None",
+        "    out = {}",
+    ]
+    for field, paths in fields.items():
+        for n, path in enumerate(paths):
+            indent = "    "
+            if n:
+                lines.append("    if not v:")
+                indent = "        "
+            lines += [
+                f"{indent}try:",
+                f"{indent}    v = r{_subscripts(path)}",
+                f"{indent}except _MISSING:",
+                f"{indent}    v = None",
+            ]
+        lines.append(f"    out[{field!r}] = v")
+    lines.append("    return out")
+
+    namespace: Dict[str, Any] = {"_MISSING": _MISSING}
+    exec(compile("\n".join(lines), f"<attom extractor {name}>", "exec"), namespace)
+    return namespace[name]
+
+
+# section -> compiled extractor
+EXTRACTORS: Dict[str, Callable[[Any], Dict[str, Any]]] = {
+    section: compile_extractor(fields, name=f"extract_{section}") for section, fields in SECTION_SPECS.items()
+}
+
+
+def extract_section(section: str, payload: Any) -> Dict[str, Any]:
+    """Canonical fields of one section from a raw ATTOM response (all None when absent)"""
+    return EXTRACTORS[section](payload)
@@ -0,0 +1,156 @@
+"""
+Recorded ATTOM Responses
+
+Raw ATTOM gateway responses saved as one JSON file per (endpoint, params), so
+PropertyService and attom_case_report.py can be exercised offline against the
+stand-in server (benchmarks/attom_standin.py) instead of the billed live API.
+
+Each file holds {"endpoint", "params", "status", "body", "recorded_at"}. Set
+ATTOM_RECORD_DIR to record every live response the service receives, or
+import the attom_*.json files the CLI writes with `attom_standin.py import`.
+
+Standard library only: the CLI and the stand-in server use it without the
+service's dependencies installed.
+"""
+import os
+import re
+import json
+import time
+import hashlib
+import logging
+from typing import Dict, List, Any, Optional
+
+from services.attom_cache import cache_key
+from services.evidence_archive import CLI_EVIDENCE_FILES
+
+logger = logging.getLogger(__name__)
+
+RECORDING_SUFFIX = ".attom.json"
+
+
+def recording_name(endpoint: str, params: Optional[Dict[str, Any]]) -> str:
+    """File name of one recording: readable endpoint slug plus a hash of the exact call"""
+    slug = re.sub(r'[^a-z0-9]+', '-', endpoint.lower()).strip("-")
+    digest = hashlib.sha1(cache_key(endpoint, params).encode("utf-8")).hexdigest()[:16]
+    return f"{slug}-{digest}{RECORDING_SUFFIX}"
+
+
+class AttomFixtureStore:
+    """Directory of recorded responses, indexed by exact call and by endpoint"""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self._exact: Dict[str, Dict[str, Any]] = {}
+        self._by_endpoint: Dict[str, List[Dict[str, Any]]] = {}
+        if os.path.isdir(directory):
+            self.reload()
+
+    def reload(self) -> int:
+        """(Re)read every recording; returns how many were loaded"""
+        self._exact.clear()
+        self._by_endpoint.clear()
+        for name in sorted(os.listdir(self.directory)):
+            if not name.endswith(RECORDING_SUFFIX):
+                continue
+            with open(os.path.join(self.directory, name), encoding="utf-8") as f:
+                recording = json.load(f)
+            self._index(recording)
+        return len(self._exact)
+
+    def _index(self, recording: Dict[str, Any]) -> None:
+        key = cache_key(recording["endpoint"], recording.get("params"))
+        if key not in self._exact:
+            self._by_endpoint.setdefault(recording["endpoint"], []).append(recording)
+        self._exact[key] = recording
+
+    def save(self, endpoint: str, params: Optional[Dict[str, Any]], status: int, body: Any) -> str:
+        """Write one recording (replacing any earlier one for the same call); returns its path"""
+        os.makedirs(self.directory, exist_ok=True)
+        recording = {
+            "endpoint": endpoint,
+            "params": {k: str(v) for k, v in (params or {}).items()},
+            "status": status,
+            "body": body,
+            "recorded_at": time.time(),
+        }
+        path = os.path.join(self.directory, recording_name(endpoint, recording["params"]))
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(recording, f, separators=(",", ":"))
+        self._index(recording)
+        return path
+
+    def find(self, endpoint: str, params: Optional[Dict[str, Any]] = None,
+             any_params: bool = False) -> Optional[Dict[str, Any]]:
+        """
+        Recording for a call. With any_params, a call nobody recorded gets a
+        recording of the same endpoint (picked stably from the params), so load
+        tests can use synthetic addresses and ids.
+        """
+        recording = self._exact.get(cache_key(endpoint, {k: str(v) for k, v in (params or {}).items()}))
+        if recording is not None or not any_params:
+            return recording
+        candidates = self._by_endpoint.get(endpoint)
+        if not candidates:
+            return None
+        digest = hashlib.sha1(cache_key(endpoint, params).encode("utf-8")).digest()
+        return candidates[int.from_bytes(digest[:4], "big") % len(candidates)]
+
+    def recordings(self, endpoint: str) -> List[Dict[str, Any]]:
+        return list(self._by_endpoint.get(endpoint, ()))
+
+    def endpoints(self) -> Dict[str, int]:
+        return {endpoint: len(recordings) for endpoint, recordings in self._by_endpoint.items()}
+
+    def __len__(self) -> int:
+        return len(self._exact)
+
+
+def import_cli_evidence(store: AttomFixtureStore, directory: str, address: str) -> List[str]:
+    """
+    Record the attom_*.json files attom_case_report.py left in a directory. The
+    ID lookup is keyed by the given address; detail calls by the attomId it returned.
+    """
+    def load(name: str) -> Optional[Any]:
+        path = os.path.join(directory, name)
+        if not os.path.exists(path):
+            return None
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+
+    id_body = load("attom_property_id.json")
+    if id_body is None:
+        raise ValueError(f"No attom_property_id.json in {directory}")
+    try:
+        attom_id = id_body["property"][0]["identifier"]["attomId"]
+    except (KeyError, IndexError, TypeError):
+        raise ValueError("attom_property_id.json has no attomId")
+
+    saved = [store.save("/property/id", {"address": address}, 200, id_body)]
+    for name, endpoint in CLI_EVIDENCE_FILES.items():
+        if endpoint == "/property/id":
+            continue
+        body = load(name)
+        if body is not None:
+            saved.append(store.save(endpoint, {"id": attom_id}, 200, body))
+    return saved
+
+
+class AttomRecorder:
+    """Saves each live ATTOM response to ATTOM_RECORD_DIR (disabled when unset)"""
+
+    def __init__(self, directory: Optional[str] = None):
+        directory = directory if directory is not None else os.getenv("ATTOM_RECORD_DIR")
+        self.store = AttomFixtureStore(directory) if directory else None
+
+    @property
+    def enabled(self) -> bool:
+        return self.store is not None
+
+    def record(self, endpoint: str, params: Optional[Dict[str, Any]], status: int, body: Any) -> None:
+        """Failures are logged, never raised into the request"""
+        if not self.enabled:
+            return
+        try:
+            self.store.save(endpoint, params, status, body)
+        except OSError as e:
+            logger.error(f"Could not record ATTOM response for {endpoint}: {str(e)}")
@@ -0,0 +1,295 @@
+"""
+Creditor Deduplication Index
+
+Collapses the spellings one creditor takes across a case's documents
+("CAPITAL ONE BANK USA NA", "Capital One", "CAPITAL ONE N.A.") into one entry
+without comparing every pair of names:
+
+1. Normalize: case-fold, drop punctuation and legal/noise words, map known aliases
+2. Exact match on the normalized name (hash probe)
+3. Otherwise block on the first four letters of the leading word and of the
+   longest word, and score only the clusters that share a block (against a
+   few representative spellings each): words are paired by equality,
+   abbreviation or character-trigram similarity
+
+Clusters are kept with union-find, so a name that links two existing clusters
+merges them.
+"""
+import os
+import re
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Dict, List, Any, FrozenSet, Optional, Set, Tuple
+
+# Words that don't identify a creditor
+NOISE_WORDS = {
+    "the", "of", "and", "inc", "incorporated", "llc", "l", "c", "corp", "corporation", "co", "company",
+    "na", "n", "a", "usa", "us", "fsb", "bank", "national", "association", "assn", "ltd", "lp",
+    "financial", "services", "svcs", "svc", "group", "holdings", "dba", "attn", "po", "box",
+}
+
+# Product lines that still belong to the same creditor ("Chase Auto", "Discover Card")
+PRODUCT_WORDS = {
+    "auto", "card", "cards", "finance", "mortgage", "home", "loan", "loans", "lending",
+    "retail", "servicing", "credit",
+}
+
+# Common abbreviations -> the name they stand for
+ALIASES = {
+    "amex": "american express",
+    "boa": "bank of america",
+    "bofa": "bank of america",
+    "cap one": "capital one",
+    "capone": "capital one",
+    "jpmcb": "chase",
+    "jpmorgan chase": "chase",
+    "jp morgan chase": "chase",
+    "wf": "wells fargo",
+    "syncb": "synchrony",
+    "dept of education": "department education",
+    "us dept of ed": "department education",
+}
+
+WORD_PATTERN = re.compile(r'[a-z0-9]+')
+BLOCK_PREFIX = 4
+# Normalized spellings per cluster that new names are scored against
+MAX_REPRESENTATIVES = 6
+MATCH_THRESHOLD = 0.75
+DEFAULT_MAX_CASES = 256
+# Trigram Dice at which two words count as the same word (OCR misreads)
+WORD_SIMILARITY = 0.7
+
+
+def normalize_creditor_name(name: str) -> str:
+    """Canonical comparison form of a creditor name"""
+    words = WORD_PATTERN.findall(name.casefold().replace("&", " and "))
+    joined = " ".join(words)
+    for alias, target in ALIASES.items():
+        if joined == alias or joined.startswith(alias + " "):
+            joined = target + joined[len(alias):]
+            break
+    words = joined.split()
+    if words and words[0] == "the":
+        words = words[1:]
+    # The leading word is kept even when it's a noise word: "Bank of America" is not "America First"
+    core = words[:1] + [word for word in words[1:] if word not in NOISE_WORDS]
+    # Keep something for names made only of noise words ("National Bank")
+    return " ".join(core) if core else joined
+
+
+@lru_cache(maxsize=65536)
+def _trigrams(text: str) -> FrozenSet[str]:
+    padded = f"  {text} "
+    return frozenset(padded[i:i + 3] for i in range(len(padded) - 2))
+
+
+def _is_abbreviation(short: str, long: str) -> bool:
+    """"assoc" -> "associates", "mgmt" -> "management" (same initial, letters in order)"""
+    if len(short) < 3 or short[0] != long[0]:
+        return False
+    if long.startswith(short):
+        return True
+    remaining = iter(long)
+    return all(letter in remaining for letter in short)
+
+
+@lru_cache(maxsize=262144)
+def _words_match(a: str, b: str) -> bool:
+    if a == b:
+        return True
+    short, long = (a, b) if len(a) <= len(b) else (b, a)
+    if _is_abbreviation(short, long):
+        return True
+    grams_a, grams_b = _trigrams(a), _trigrams(b)
+    return 2 * len(grams_a & grams_b) / (len(grams_a) + len(grams_b)) >= WORD_SIMILARITY
+
+
+def similarity(a: str, b: str) -> float:
+    """
+    Score two normalized names in [0, 1]: the share of words on both sides that
+    have a (fuzzy or abbreviated) counterpart on the other side. Unmatched
+    product words ("auto", "card") don't count against the score.
+    """
+    if a == b:
+        return 1.0
+    words_a, words_b = a.split(), b.split()
+    matched = 0
+    counted = 0
+    for words, others in ((words_a, words_b), (words_b, words_a)):
+        for word in words:
+            if any(_words_match(word, other) for other in others):
+                matched += 1
+                counted += 1
+            elif word not in PRODUCT_WORDS:
+                counted += 1
+    return matched / counted if counted else 0.0
+
+
+class _Cluster:
+    __slots__ = ("id", "names", "representatives", "variants", "mentions")
+
+    def __init__(self, cluster_id: int):
+        self.id = cluster_id
+        self.names: Set[str] = set()  # normalized forms
+        self.representatives: List[str] = []  # first few normalized forms, scored on match
+        self.variants: Dict[str, int] = {}  # raw spelling -> count
+        self.mentions: List[Dict[str, Any]] = []
+
+
+class CreditorIndex:
+    """Incremental fuzzy-dedup index of creditor names for one case"""
+
+    def __init__(self, threshold: float = MATCH_THRESHOLD):
+        self.threshold = threshold
+        self._clusters: Dict[int, _Cluster] = {}
+        self._parent: Dict[int, int] = {}
+        self._by_name: Dict[str, int] = {}
+        self._blocks: Dict[str, Set[int]] = {}
+        self._lock = threading.Lock()
+        self.comparisons = 0
+
+    def add(self, name: str, **mention: Any) -> int:
+        """
+        Add one occurrence of a creditor name.
+
+        Args:
+            name: Name as it appeared on the document
+            mention: Anything to keep with the occurrence (document_id, page, account, balance)
+
+        Returns:
+            Id of the cluster the name landed in
+        """
+        normalized = normalize_creditor_name(name)
+        if not normalized:
+            raise ValueError("Empty creditor name")
+        with self._lock:
+            cluster_id = self._by_name.get(normalized)
+            if cluster_id is None:
+                cluster_id = self._match_locked(normalized)
+            cluster = self._clusters[cluster_id]
+            if normalized not in cluster.names and len(cluster.representatives) < MAX_REPRESENTATIVES:
+                cluster.representatives.append(normalized)
+            cluster.names.add(normalized)
+            cluster.variants[name.strip()] = cluster.variants.get(name.strip(), 0) + 1
+            cluster.mentions.append({"name": name.strip(), **mention})
+            self._by_name[normalized] = cluster_id
+            for key in self._block_keys(normalized):
+                self._blocks.setdefault(key, set()).add(cluster_id)
+            return cluster_id
+
+    def clusters(self) -> List[Dict[str, Any]]:
+        """Deduplicated creditors, most mentioned first"""
+        with self._lock:
+            result = []
+            for cluster in self._clusters.values():
+                if self._find(cluster.id) != cluster.id:
+                    continue
+                # Display name: most frequent spelling, shortest on ties
+                display = min(cluster.variants.items(), key=lambda item: (-item[1], len(item[0])))[0]
+                result.append({
+                    "creditor": display,
+                    "normalized": min(cluster.names, key=len),
+                    "variants": sorted(cluster.variants),
+                    "mention_count": len(cluster.mentions),
+                    "mentions": cluster.mentions,
+                })
+            result.sort(key=lambda entry: -entry["mention_count"])
+            return result
+
+    def __len__(self) -> int:
+        with self._lock:
+            return sum(1 for cluster_id in self._clusters if self._find(cluster_id) == cluster_id)
+
+    # -- internals -----------------------------------------------------------
+
+    @staticmethod
+    def _block_keys(normalized: str) -> Set[str]:
+        words = normalized.split()
+        return {words[0][:BLOCK_PREFIX], max(words, key=len)[:BLOCK_PREFIX]}
+
+    def _find(self, cluster_id: int) -> int:
+        root = cluster_id
+        while self._parent[root] != root:
+            root = self._parent[root]
+        while self._parent[cluster_id] != root:
+            self._parent[cluster_id], cluster_id = root, self._parent[cluster_id]
+        return root
+
+    def _match_locked(self, normalized: str) -> int:
+        """Cluster for a new normalized name: best match among clusters sharing a block, else a new one"""
+        candidates: Set[int] = set()
+        for key in self._block_keys(normalized):
+            candidates.update(self._find(c) for c in self._blocks.get(key, ()))
+
+        matched: List[Tuple[float, int]] = []
+        for cluster_id in candidates:
+            self.comparisons += 1
+            score = max(similarity(normalized, known) for known in self._clusters[cluster_id].representatives)
+            if score >= self.threshold:
+                matched.append((score, cluster_id))
+
+        if not matched:
+            cluster_id = len(self._parent)
+            self._parent[cluster_id] = cluster_id
+            self._clusters[cluster_id] = _Cluster(cluster_id)
+            return cluster_id
+
+        matched.sort(reverse=True)
+        root = matched[0][1]
+        # The new name bridges every cluster it matched
+        for _, other in matched[1:]:
+            self._merge_locked(root, other)
+        return root
+
+    def _merge_locked(self, root: int, other: int) -> None:
+        root, other = self._find(root), self._find(other)
+        if root == other:
+            return
+        self._parent[other] = root
+        target, source = self._clusters[root], self._clusters[other]
+        target.names |= source.names
+        target.representatives = (target.representatives + source.representatives)[:MAX_REPRESENTATIVES]
+        for variant, count in source.variants.items():
+            target.variants[variant] = target.variants.get(variant, 0) + count
+        target.mentions.extend(source.mentions)
+        for name in source.names:
+            self._by_name[name] = root
+        source.names, source.representatives, source.variants, source.mentions = set(), [], {}, []
+
+
+class CreditorCaseRegistry:
+    """One CreditorIndex per case, least recently used cases dropped past max_cases"""
+
+    def __init__(self, max_cases: Optional[int] = None):
+        self.max_cases = max_cases if max_cases is not None else int(
+            os.getenv("CREDITOR_INDEX_MAX_CASES", DEFAULT_MAX_CASES))
+        self._cases: "OrderedDict[str, CreditorIndex]" = OrderedDict()
+        self._documents: Dict[str, Set[str]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, case_id: str) -> Optional[CreditorIndex]:
+        with self._lock:
+            index = self._cases.get(case_id)
+            if index is not None:
+                self._cases.move_to_end(case_id)
+            return index
+
+    def add_document(self, case_id: str, document_id: str, candidates: List[Dict[str, Any]]) -> CreditorIndex:
+        """Add a document's creditor mentions to its case (once per document_id)"""
+        with self._lock:
+            index = self._cases.get(case_id)
+            if index is None:
+                index = self._cases[case_id] = CreditorIndex()
+                self._documents[case_id] = set()
+                while len(self._cases) > self.max_cases:
+                    dropped, _ = self._cases.popitem(last=False)
+                    self._documents.pop(dropped, None)
+            self._cases.move_to_end(case_id)
+            if document_id in self._documents[case_id]:
+                return index
+            self._documents[case_id].add(document_id)
+        for candidate in candidates:
+            index.add(candidate["name"], document_id=document_id,
+                      **{k: v for k, v in candidate.items() if k != "name"})
+        return index
@@ -0,0 +1,138 @@
+"""
+Document Classifier
+
+Routes uploads to the right parser from a cheap look at the first page (PDF
+text layer, or a low-DPI OCR pass) before the full document is OCR'd. The same
+scoring applied page by page splits mixed packets into typed segments.
+
+Scoring is keyword-based: each document type has weighted signal phrases,
+compiled once into a single alternation regex; a page's score for a type is
+the sum of the weights of the distinct signals it contains.
+"""
+import re
+from typing import Dict, List, Any, Optional, Pattern, Sequence, Tuple
+
+# Types the client can send to ask for automatic classification
+AUTO_TYPES = ("auto", "unknown")
+
+# Fallback when no type scores high enough
+GENERIC_TYPE = "generic"
+
+# (phrase, weight) per document type
+DOCUMENT_SIGNALS: Dict[str, List[Tuple[str, int]]] = {
+    "paystub": [
+        ("gross pay", 3), ("net pay", 3), ("pay period", 2), ("pay date", 2),
+        ("earnings statement", 3), ("ytd", 1), ("deductions", 1), ("federal withholding", 1),
+        ("social security", 1), ("medicare", 1), ("hours", 1),
+    ],
+    "bank_statement": [
+        ("beginning balance", 3), ("ending balance", 3), ("statement period", 2),
+        ("deposits and other credits", 3), ("withdrawals", 2), ("checks paid", 2),
+        ("daily balance", 2), ("account summary", 1), ("member fdic", 2),
+    ],
+    "tax_return": [
+        ("form 1040", 4), ("u.s. individual income tax return", 4), ("adjusted gross income", 3),
+        ("internal revenue service", 2), ("filing status", 2), ("taxable income", 2),
+        ("department of the treasury", 1), ("standard deduction", 1),
+    ],
+    "credit_report": [
+        ("credit report", 3), ("equifax", 2), ("experian", 2), ("transunion", 2),
+        ("date opened", 2), ("high credit", 2), ("payment history", 2), ("credit limit", 1),
+        ("inquiries", 1),
+    ],
+    "collection_letter": [
+        ("attempt to collect a debt", 4), ("debt collector", 3), ("original creditor", 3),
+        ("fair debt collection", 2), ("validation", 1), ("dispute", 1), ("amount due", 1),
+    ],
+}
+
+# Minimum score for a confident call; below this the page is "generic"
+MIN_SCORE = 3
+# Score at which confidence saturates
+STRONG_SCORE = 8
+
+
+class Classification:
+    """Detected type, its confidence, and the raw per-type scores"""
+
+    def __init__(self, document_type: str, confidence: float, scores: Dict[str, int]):
+        self.document_type = document_type
+        self.confidence = confidence
+        self.scores = scores
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "document_type": self.document_type,
+            "confidence": round(self.confidence, 3),
+            "scores": self.scores,
+        }
+
+
+class DocumentClassifier:
+    """Keyword-signal classifier over page text"""
+
+    def __init__(self, signals: Optional[Dict[str, List[Tuple[str, int]]]] = None):
+        self.signals = signals or DOCUMENT_SIGNALS
+        # group name -> (document type, weight)
+        self._groups: Dict[str, Tuple[str, int]] = {}
+        alternatives = []
+        for t, (document_type, phrases) in enumerate(self.signals.items()):
+            for p, (phrase, weight) in enumerate(phrases):
+                group = f"t{t}_{p}"
+                self._groups[group] = (document_type, weight)
+                pattern = r'\s+'.join(re.escape(word) for word in phrase.split())
+                alternatives.append(f"(?P<{group}>\\b{pattern}(?!\\w))")
+        self.matcher: Pattern = re.compile("|".join(alternatives), re.IGNORECASE)
+
+    def classify(self, text: str) -> Classification:
+        """Classify one page (or any chunk) of text"""
+        scores = {document_type: 0 for document_type in self.signals}
+        seen = set()
+        for match in self.matcher.finditer(text):
+            if match.lastgroup in seen:
+                continue
+            seen.add(match.lastgroup)
+            document_type, weight = self._groups[match.lastgroup]
+            scores[document_type] += weight
+
+        ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+        best_type, best = ranked[0]
+        runner_up = ranked[1][1] if len(ranked) > 1 else 0
+        if best < MIN_SCORE:
+            return Classification(GENERIC_TYPE, 0.0, scores)
+
+        margin = (best - runner_up) / best
+        strength = min(1.0, best / STRONG_SCORE)
+        return Classification(best_type, round(margin * strength, 3), scores)
+
+    def segment(self, page_texts: Sequence[str]) -> List[Dict[str, Any]]:
+        """
+        Split a packet into runs of pages of the same type.
+
+        Pages without a confident type (continuation pages, blank backs) join
+        the preceding segment.
+
+        Returns:
+            [{document_type, confidence, page_start, page_end}] with 1-based pages
+        """
+        segments: List[Dict[str, Any]] = []
+        for page, text in enumerate(page_texts, start=1):
+            result = self.classify(text)
+            current = segments[-1] if segments else None
+            if current is not None and (
+                result.document_type == GENERIC_TYPE or result.document_type == current["document_type"]
+            ):
+                current["page_end"] = page
+                current["confidence"] = max(current["confidence"], result.confidence)
+                continue
+            if current is not None and current["document_type"] == GENERIC_TYPE:
+                # Leading unclassified pages belong to the first typed segment
+                current.update(document_type=result.document_type, confidence=result.confidence, page_end=page)
+                continue
+            segments.append({
+                "document_type": result.document_type,
+                "confidence": result.confidence,
+                "page_start": page,
+                "page_end": page,
+            })
+        return segments
@@ -1,23 +1,33 @@
 """Bank Statement Parser - Extract account info and balances"""
 from typing import Dict, Any
-import re
+
+from services.ocr_document import OcrDocument
+from services.spatial_index import SpatialIndex
+from services.document_parsers.rules import ExtractionRule, RuleSet
+
+BANK_STATEMENT_RULES = RuleSet("bank_statement", [
+    ExtractionRule("account_number", ["account number", "account no", "account #"], kind="account", required=True),
+    ExtractionRule("ending_balance", ["ending balance", "current balance"], required=True),
+])
 
 class BankStatementParser:
-    def parse(self, ocr_result: Dict[str, Any]) -> Dict[str, Any]:
-        text = ocr_result.get("full_text", "")
+    # Required fields here let extraction stop OCR early (see early_exit.py)
+    rules = BANK_STATEMENT_RULES
+    
+    def parse(self, document: OcrDocument) -> Dict[str, Any]:
+        hits = BANK_STATEMENT_RULES.scan(SpatialIndex(document))
+        BANK_STATEMENT_RULES.record(hits)
         
         extracted = {}
         warnings = []
         
         # Extract account number
-        account_match = re.search(r'account\s*(?:number|#)?[:.\s]*(\d{4,16})', text, re.IGNORECASE)
-        if account_match:
-            extracted["account_number"] = account_match.group(1)
+        if "account_number" in hits:
+            extracted["account_number"] = hits["account_number"].value
         
         # Extract ending balance
-        balance_match = re.search(r'(?:ending|current)\s*balance[:.\s]*\$?\s?([\d,]+\.?\d{0,2})', text, re.IGNORECASE)
-        if balance_match:
-            extracted["ending_balance"] = float(balance_match.group(1).replace(',', ''))
+        if "ending_balance" in hits:
+            extracted["ending_balance"] = hits["ending_balance"].value
         
         confidence = len(extracted) / 2  # 2 expected fields
         
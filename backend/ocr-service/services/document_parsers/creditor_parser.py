@@ -0,0 +1,165 @@
+"""
+Creditor Parser
+
+Finds creditor names on statements, collection letters and credit reports:
+
+- labelled: "Original Creditor: ...", "Owed to ...", "Creditor: ..." (value inline
+  or in the block to the right)
+- credit report tradelines: an upper-case name line directly above account
+  detail lines (account number, date opened, balance)
+- letterhead: the first line of the first page when it reads like an organization
+
+Each candidate carries the account digits and balance found in the lines that
+follow it. Candidates are deduplicated per document with a CreditorIndex.
+"""
+import re
+from typing import Dict, List, Any, Optional
+
+from services.ocr_document import OcrDocument
+from services.spatial_index import SpatialIndex, PageLayout
+from services.creditor_index import CreditorIndex, normalize_creditor_name
+
+CREDITOR_LABELS = re.compile(
+    r'\b(?:original\s+creditor|current\s+creditor|creditor\s+name|creditor|account\s+owed\s+to|owed\s+to|'
+    r'collection\s+agency|on\s+behalf\s+of|lender|payable\s+to|furnisher)\b\s*[:#-]?\s*',
+    re.IGNORECASE
+)
+
+# Lines under a tradeline name
+ACCOUNT_DETAIL = re.compile(r'\b(?:account\s*(?:number|no\.?|#)|acct\s*#?|date\s+opened|balance|high\s+credit|credit\s+limit)\b', re.IGNORECASE)
+ACCOUNT_NUMBER = re.compile(r'\b(?:account|acct)\s*(?:number|no\.?|#)?\s*[:#]?\s*[xX*\d-]*?(\d{4})\b', re.IGNORECASE)
+BALANCE = re.compile(r'\b(?:balance|amount\s+due|amount\s+owed|total\s+due)\b[^\d$\n]{0,20}\$?\s?(\d[\d,]*\.\d{2})', re.IGNORECASE)
+
+# Words that mark a name as an organization
+ORGANIZATION_WORDS = re.compile(
+    r'\b(?:bank|credit|financial|finance|recovery|collections?|services|capital|funding|associates|'
+    r'llc|inc|corp|n\.?a\.?|card|mortgage|lending|loans?|medical|hospital|health|utilities|acceptance|servicing)\b',
+    re.IGNORECASE
+)
+
+# Upper-case lines that are report furniture, not creditors
+NOT_CREDITOR = re.compile(
+    r'\b(?:account|balance|payment|history|summary|statement|page|report|date|status|inquir(?:y|ies)|'
+    r'personal|information|total|public\s+records?|collections?\s+accounts?)\b',
+    re.IGNORECASE
+)
+
+MAX_NAME_LENGTH = 60
+DETAIL_LOOKAHEAD = 8  # lines searched for account number / balance
+
+
+def _clean_name(text: str) -> Optional[str]:
+    name = re.split(r'\s{2,}|\t|\s+(?=\(?\d{3}\)?[\s.-]\d{3})', text.strip(" :#-"))[0].strip(" .,:;")
+    letters = sum(ch.isalpha() for ch in name)
+    if letters < 3 or len(name) > MAX_NAME_LENGTH or not normalize_creditor_name(name):
+        return None
+    return name
+
+
+class CreditorParser:
+    """Extract creditor names (with account digits and balances) from one document"""
+
+    def candidates(self, document: OcrDocument) -> List[Dict[str, Any]]:
+        """Every creditor mention in reading order: {name, source, page, account_last4, balance}"""
+        spatial = SpatialIndex(document)
+        found: List[Dict[str, Any]] = []
+        for page, layout in spatial.pages.items():
+            found.extend(self._page_candidates(layout, first_page=(page == min(spatial.pages))))
+        return found
+
+    def parse(self, document: OcrDocument) -> Dict[str, Any]:
+        """
+        Parse OCR result for creditor names.
+
+        Returns:
+            Dict with extracted_data ({creditors, creditor_count}), confidence, suggestions, warnings
+        """
+        candidates = self.candidates(document)
+        index = CreditorIndex()
+        for candidate in candidates:
+            index.add(candidate["name"], **{k: v for k, v in candidate.items() if k != "name"})
+
+        creditors = []
+        for cluster in index.clusters():
+            mentions = cluster["mentions"]
+            creditors.append({
+                "name": cluster["creditor"],
+                "variants": cluster["variants"],
+                "sources": sorted({m["source"] for m in mentions}),
+                "pages": sorted({m["page"] for m in mentions}),
+                "account_last4": next((m["account_last4"] for m in mentions if m.get("account_last4")), None),
+                "balance": next((m["balance"] for m in mentions if m.get("balance") is not None), None),
+            })
+
+        warnings = [] if creditors else ["No creditor names found"]
+        labelled = any(c["source"] == "label" for c in candidates)
+        confidence = 0.0 if not creditors else (0.9 if labelled else 0.7)
+        return {
+            "extracted_data": {"creditors": creditors, "creditor_count": len(creditors)},
+            "confidence": confidence,
+            "suggestions": [],
+            "warnings": warnings
+        }
+
+    # -- per page -----------------------------------------------------------
+
+    def _page_candidates(self, layout: PageLayout, first_page: bool) -> List[Dict[str, Any]]:
+        texts = layout.document.texts
+        lines = layout.lines()
+        line_texts = [" ".join(texts[i] for i in line) for line in lines]
+        heads = []  # (line number, name, source)
+
+        for n, (line, text) in enumerate(zip(lines, line_texts)):
+            name, source = None, None
+
+            label = CREDITOR_LABELS.search(text)
+            if label:
+                name = _clean_name(text[label.end():])
+                if name is None:
+                    # Value in its own block to the right of the label
+                    label_block = next((i for i in line if CREDITOR_LABELS.search(texts[i])), line[0])
+                    neighbor = layout.right_of(label_block)
+                    if neighbor is not None:
+                        name = _clean_name(texts[neighbor])
+                source = "label"
+            elif self._is_tradeline_head(text, line_texts[n + 1:n + 3]):
+                name, source = _clean_name(text), "tradeline"
+            elif first_page and n == 0 and ORGANIZATION_WORDS.search(text) and not NOT_CREDITOR.search(text):
+                name, source = _clean_name(text), "letterhead"
+            if name:
+                heads.append((n, name, source))
+
+        found: List[Dict[str, Any]] = []
+        for k, (n, name, source) in enumerate(heads):
+            # Details belong to this creditor until the next one starts
+            stop = min(heads[k + 1][0] if k + 1 < len(heads) else len(lines), n + DETAIL_LOOKAHEAD)
+            found.append({
+                "name": name,
+                "source": source,
+                "page": layout.page,
+                **self._details(line_texts[n:max(stop, n + 1)]),
+            })
+        return found
+
+    @staticmethod
+    def _is_tradeline_head(text: str, following: List[str]) -> bool:
+        letters = [ch for ch in text if ch.isalpha()]
+        if len(letters) < 4 or any(ch.islower() for ch in letters):
+            return False
+        if len(text.split()) > 6 or NOT_CREDITOR.search(text) or ACCOUNT_DETAIL.search(text):
+            return False
+        return any(ACCOUNT_DETAIL.search(line) for line in following)
+
+    @staticmethod
+    def _details(lines: List[str]) -> Dict[str, Any]:
+        details: Dict[str, Any] = {"account_last4": None, "balance": None}
+        for text in lines:
+            if details["account_last4"] is None:
+                match = ACCOUNT_NUMBER.search(text)
+                if match:
+                    details["account_last4"] = match.group(1)
+            if details["balance"] is None:
+                match = BALANCE.search(text)
+                if match:
+                    details["balance"] = float(match.group(1).replace(",", ""))
+        return details
@@ -0,0 +1,54 @@
+"""
+Early-Exit Incremental Parsing
+
+Feeds pages to a parser's RuleSet as OCR produces them and reports when every
+required field has been found above a confidence threshold. The OCR loop stops
+there; the remaining pages (schedules, later statement pages) are skipped or
+finished in the background.
+
+A 1040's AGI and tax year sit on the first pages, so most of a long return
+never needs to be OCR'd before the parse can be answered.
+"""
+from typing import Dict, Any, Optional
+
+from services.metrics import metrics
+from services.ocr_document import OcrDocument
+from services.spatial_index import SpatialIndex
+from services.document_parsers.rules import RuleHit, RuleSet
+
+# Required fields found at or above this confidence end the OCR pass
+DEFAULT_MIN_CONFIDENCE = 0.8
+
+
+class EarlyExitTracker:
+    """Page-at-a-time rule scan used as PaddleOCRService.extract_text's should_stop"""
+
+    def __init__(self, parser: Any, min_confidence: float = DEFAULT_MIN_CONFIDENCE):
+        # Parsers without declared required fields (generic) never stop early
+        self.rules: Optional[RuleSet] = getattr(parser, "rules", None)
+        self.min_confidence = min_confidence
+        self.hits: Dict[str, RuleHit] = {}
+        self.stopped_at: Optional[int] = None
+        self._spatial: Optional[SpatialIndex] = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.rules is not None and bool(self.rules.required)
+
+    def __call__(self, document: OcrDocument, page: int) -> bool:
+        """Scan the page just OCR'd; True once all required fields are in"""
+        if not self.enabled:
+            return False
+        if self._spatial is None or self._spatial.document is not document:
+            self._spatial = SpatialIndex(document)
+        else:
+            self._spatial.add_page(page)
+        self.rules.scan(self._spatial, self.hits, pages=[page])
+
+        if self.rules.missing_required(self.hits, self.min_confidence):
+            return False
+        self.stopped_at = page
+        if page < document.page_count:
+            metrics.increment(f"early_exit.{self.rules.name}.stopped")
+            metrics.increment(f"early_exit.{self.rules.name}.pages_skipped", document.page_count - page)
+        return True
@@ -1,9 +1,11 @@
 """Generic Parser - Fallback for unknown document types"""
 from typing import Dict, Any
 
+from services.ocr_document import OcrDocument
+
 class GenericParser:
-    def parse(self, ocr_result: Dict[str, Any]) -> Dict[str, Any]:
-        text = ocr_result.get("full_text", "")
+    def parse(self, document: OcrDocument) -> Dict[str, Any]:
+        text = document.full_text
         
         return {
             "extracted_data": {"raw_text": text},
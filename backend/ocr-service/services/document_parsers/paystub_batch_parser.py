@@ -0,0 +1,125 @@
+"""
+Multi-Paystub Parser
+
+Splits one upload holding several paystubs (typically six months of stubs
+scanned into a single PDF) into individual stubs and parses each one with
+PaystubParser.
+
+Stubs are cut on the document's reading-order line stream: a stub header
+(pay period, pay date, check date, earnings statement) opens a new stub once
+the current one has shown its net pay. Pages without a header continue the
+current stub; when two stubs share a page the cut is placed at the widest
+vertical gap between them.
+"""
+import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Any, Optional, Tuple
+
+from services.metrics import metrics
+from services.ocr_document import OcrDocument
+from services.spatial_index import SpatialIndex, PageLayout
+from services.document_parsers.paystub_parser import PaystubParser
+
+# A line that starts a stub
+STUB_HEADER = re.compile(
+    r'\b(?:pay\s+period|period\s+(?:ending|beginning)|pay\s+date|check\s+date|advice\s+date|earnings\s+statement)\b',
+    re.IGNORECASE
+)
+
+# A line that closes a stub
+STUB_END = re.compile(r'\bnet\s+(?:pay|amount)\b|\btake\s+home\b', re.IGNORECASE)
+
+DEFAULT_WORKERS = 4
+
+
+def _line_span(layout: PageLayout, line: List[int]) -> Tuple[int, int]:
+    """Top and bottom y of a visual line"""
+    return (min(layout.boxes[i][1] for i in line), max(layout.boxes[i][3] for i in line))
+
+
+def _widest_gap(layout: PageLayout, lines: List[List[int]], first: int, last: int) -> int:
+    """Index of the line (first < n <= last) preceded by the largest vertical gap"""
+    cut, widest = last, None
+    for n in range(first + 1, last + 1):
+        gap = _line_span(layout, lines[n])[0] - _line_span(layout, lines[n - 1])[1]
+        if widest is None or gap > widest:
+            cut, widest = n, gap
+    return cut
+
+
+class PaystubBatchParser:
+    """Split a multi-stub document and parse the stubs concurrently"""
+
+    def __init__(self, parser: Optional[PaystubParser] = None, max_workers: Optional[int] = None):
+        self.parser = parser or PaystubParser()
+        self.max_workers = max_workers or int(os.getenv("PAYSTUB_PARSE_WORKERS", DEFAULT_WORKERS))
+
+    def split(self, document: OcrDocument) -> List[List[int]]:
+        """
+        Block indices of each stub, in document order.
+
+        A document with no recognizable stub boundaries comes back as one stub.
+        """
+        start = time.perf_counter()
+        spatial = SpatialIndex(document)
+        texts = document.texts
+        stubs: List[List[int]] = [[]]
+        closed = False  # current stub has shown its net pay
+
+        for page in document.page_numbers():
+            layout = spatial.pages[page]
+            lines = layout.lines()
+            owner = []  # stub number per line of this page
+            end_line: Optional[int] = None  # this page's line holding the current stub's net pay
+
+            for n, line in enumerate(lines):
+                text = " ".join(texts[i] for i in line)
+                if closed and STUB_HEADER.search(text):
+                    stubs.append([])
+                    # Lines above the header since the last stub closed (employer,
+                    # address block) belong to the new stub
+                    cut = 0 if end_line is None else _widest_gap(layout, lines, end_line, n)
+                    for m in range(cut, n):
+                        owner[m] = len(stubs) - 1
+                    closed, end_line = False, None
+                owner.append(len(stubs) - 1)
+                if STUB_END.search(text):
+                    closed, end_line = True, n
+
+            for line, stub in zip(lines, owner):
+                stubs[stub].extend(line)
+
+        metrics.observe("paystub_batch.split_ms", (time.perf_counter() - start) * 1000)
+        return [sorted(blocks) for blocks in stubs if blocks]
+
+    def parse(self, document: OcrDocument) -> List[Dict[str, Any]]:
+        """
+        Parse every stub in the document.
+
+        Returns:
+            One record per stub: stub number, page_start, page_end, the
+            PaystubParser fields, confidence and warnings
+        """
+        parts = [document.select(blocks) for blocks in self.split(document)]
+        if not parts:
+            return []
+
+        workers = max(1, min(self.max_workers, len(parts)))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(self.parser.parse, parts))
+        metrics.increment("paystub_batch.stubs", len(parts))
+
+        records = []
+        for n, (part, parsed) in enumerate(zip(parts, results), start=1):
+            pages = part.page_numbers()
+            records.append({
+                "stub": n,
+                "page_start": pages[0],
+                "page_end": pages[-1],
+                **parsed.get("extracted_data", {}),
+                "confidence": parsed.get("confidence", 0.0),
+                "warnings": parsed.get("warnings", []),
+            })
+        return records
@@ -4,22 +4,41 @@ Paystub Parser
 Extracts structured financial data from paystub images/PDFs.
 """
 import re
-from typing import Dict, List, Any, Optional
+from typing import Dict, Any, Optional, Sequence
+
+from services.ocr_document import OcrDocument
+from services.spatial_index import SpatialIndex
+from services.document_parsers.rules import ExtractionRule, RuleSet
+
+GROSS_PAY_LABELS = ["gross pay", "total gross", "gross earnings"]
+YTD_COLUMN_LABELS = ["ytd", "year to date"]
+
+# Labelled paystub fields, compiled once into a single-pass matcher
+PAYSTUB_RULES = RuleSet("paystub", [
+    ExtractionRule("employeeName", ["employee name:", "employee:", "emp name:", "emp:", "name:"], kind="name"),
+    ExtractionRule("gross_pay", GROSS_PAY_LABELS, required=True),
+    ExtractionRule("net_pay", ["net pay", "take home", "net amount"], required=True),
+    ExtractionRule("ytd_gross", ["ytd gross", "year to date gross", "ytd earnings"]),
+    ExtractionRule("pay_period", ["pay period"], kind="date_range"),
+    ExtractionRule("pay_date", ["pay date", "check date", "advice date"], kind="date"),
+])
+
+# Amount in a cell of an earnings table
+CURRENCY_VALUE = re.compile(r'\$?\s?(\d[\d,]*(?:\.\d{1,2})?)')
 
 class PaystubParser:
     """Extract employer, income, deductions from paystubs"""
+    # Required fields here let extraction stop OCR early (see early_exit.py)
+    rules = PAYSTUB_RULES
     
-    def parse(self, ocr_result: Dict[str, Any]) -> Dict[str, Any]:
+    def parse(self, document: OcrDocument) -> Dict[str, Any]:
         """
         Parse OCR result for paystub-specific fields.
         
         Returns:
             Dict with extracted_data, confidence, suggestions, warnings
         """
-        text = ocr_result.get("full_text", "")
-        blocks = ocr_result.get("text_blocks", [])
-        
-        if not text:
+        if not document.texts:
             return {
                 "extracted_data": {},
                 "confidence": 0.0,
@@ -27,50 +46,63 @@ class PaystubParser:
                 "warnings": ["No text extracted from document"]
             }
         
+        # One pass over the reading-order lines finds every labelled field
+        spatial = SpatialIndex(document)
+        hits = PAYSTUB_RULES.scan(spatial)
+        PAYSTUB_RULES.record(hits)
+        lines = document.texts
+        
         extracted = {}
         warnings = []
         
         # Extract employee name (for ownership detection)
-        employee_name = self._find_employee_name(blocks, text)
-        if employee_name:
-            extracted["employeeName"] = employee_name["value"]
+        if "employeeName" in hits:
+            extracted["employeeName"] = hits["employeeName"].value
         else:
-            warnings.append("Could not identify employee name")
+            employee_name = self._find_employee_name(lines)
+            if employee_name:
+                extracted["employeeName"] = employee_name["value"]
+            else:
+                warnings.append("Could not identify employee name")
         
         # Extract employer name (usually at top of document)
-        employer = self._find_employer(blocks)
+        employer = self._find_employer(lines)
         if employer:
             extracted["employer"] = employer["value"]
         else:
             warnings.append("Could not identify employer name")
         
         # Extract gross pay
-        gross_pay = self._find_currency(text, ["gross pay", "total gross", "gross earnings"])
-        if gross_pay:
-            extracted["gross_pay"] = gross_pay["value"]
+        if "gross_pay" in hits:
+            extracted["gross_pay"] = hits["gross_pay"].value
         else:
             warnings.append("Could not find gross pay amount")
         
         # Extract net pay
-        net_pay = self._find_currency(text, ["net pay", "take home", "net amount"])
-        if net_pay:
-            extracted["net_pay"] = net_pay["value"]
+        if "net_pay" in hits:
+            extracted["net_pay"] = hits["net_pay"].value
         else:
             warnings.append("Could not find net pay amount")
         
-        # Extract YTD gross
-        ytd_gross = self._find_currency(text, ["ytd gross", "year to date gross", "ytd earnings"])
-        if ytd_gross:
-            extracted["ytd_gross"] = ytd_gross["value"]
+        # Extract YTD gross (labelled directly, or the gross pay row under a YTD column)
+        if "ytd_gross" in hits:
+            extracted["ytd_gross"] = hits["ytd_gross"].value
+        else:
+            match = spatial.cell(GROSS_PAY_LABELS, YTD_COLUMN_LABELS, CURRENCY_VALUE)
+            if match:
+                extracted["ytd_gross"] = float(match.group(1).replace(',', ''))
         
         # Extract pay period dates
-        pay_period = self._find_pay_period(text)
-        if pay_period:
-            extracted.update(pay_period)
+        if "pay_period" in hits:
+            extracted["pay_period_start"] = hits["pay_period"].value["start"]
+            extracted["pay_period_end"] = hits["pay_period"].value["end"]
+        if "pay_date" in hits:
+            extracted["pay_date"] = hits["pay_date"].value
         
         # Calculate confidence
-        fields_found = len(extracted)
-        total_fields = 5  # employer, gross, net, ytd, pay_period
+        expected = ("employer", "gross_pay", "net_pay", "ytd_gross", "pay_period_end")
+        fields_found = sum(1 for key in expected if key in extracted)
+        total_fields = len(expected)
         confidence = fields_found / total_fields
         
         return {
@@ -80,35 +112,21 @@ class PaystubParser:
             "warnings": warnings
         }
     
-    def _find_employer(self, blocks: List[Dict]) -> Optional[Dict]:
+    def _find_employer(self, lines: Sequence[str]) -> Optional[Dict]:
         """Find employer name (usually in first few text blocks)"""
         # Take first substantial text block as company name
-        for block in blocks[:5]:  # Check first 5 blocks
-            text = block.get("text", "").strip()
+        for line in lines[:5]:  # Check first 5 blocks
+            text = line.strip()
             if len(text) > 3 and not re.match(r'^[\d\s\$\.,]+$', text):  # Not just numbers
                 return {"value": text, "confidence": 0.8}
         return None
     
-    def _find_employee_name(self, blocks: List[Dict], full_text: str) -> Optional[Dict]:
-        """Find employee name on paystub"""
-        # Strategy 1: Look for "Employee:" or "Name:" label
-        patterns = [
-            r'(?:employee|emp)(?:\s+name)?:\s*([A-Z][a-z]+(?:\s+[A-Z][a-z]+)+)',
-            r'(?:name):\s*([A-Z][a-z]+(?:\s+[A-Z][a-z]+)+)',
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, full_text, re.IGNORECASE)
-            if match:
-                name = match.group(1).strip()
-                # Validate: should have at least first and last name
-                if len(name.split()) >= 2:
-                    return {"value": name, "confidence": 0.9}
-        
-        # Strategy 2: Look for capitalized multi-word text that looks like a name
+    def _find_employee_name(self, lines: Sequence[str]) -> Optional[Dict]:
+        """Find unlabelled employee name on paystub (labelled names come from the rule set)"""
+        # Look for capitalized multi-word text that looks like a name
         # Search in first 10 blocks
-        for block in blocks[:10]:
-            text = block.get("text", "").strip()
+        for line in lines[:10]:
+            text = line.strip()
             # Check if it matches name pattern (Title Case, 2-4 words, no numbers)
             if re.match(r'^[A-Z][a-z]+(?:\s+[A-Z][a-z]+){1,3}$', text):
                 # Further validation: not a company name or common header
@@ -117,36 +135,3 @@ class PaystubParser:
                     return {"value": text, "confidence": 0.7}
         
         return None
-    
-    def _find_currency(self, text: str, keywords: List[str]) -> Optional[Dict]:
-        """Find currency amount near specified keywords"""
-        text_lower = text.lower()
-        
-        for keyword in keywords:
-            # Look for keyword followed by currency pattern
-            pattern = rf'{keyword}[^$\d]{{0,20}}\$?\s?([\d,]+\.?\d{{0,2}})'
-            match = re.search(pattern, text_lower, re.IGNORECASE)
-            
-            if match:
-                amount_str = match.group(1).replace(',', '')
-                try:
-                    amount = float(amount_str)
-                    return {"value": amount, "confidence": 0.85}
-                except ValueError:
-                    continue
-        
-        return None
-    
-    def _find_pay_period(self, text: str) -> Optional[Dict]:
-        """Extract pay period start/end dates"""
-        # Common patterns: "Pay Period: 01/01/2024 - 01/15/2024"
-        pattern = r'pay\s+period[:\s]+([\d/]+)\s*[-–]\s*([\d/]+)'
-        match = re.search(pattern, text, re.IGNORECASE)
-        
-        if match:
-            return {
-                "pay_period_start": match.group(1),
-                "pay_period_end": match.group(2)
-            }
-        
-        return None
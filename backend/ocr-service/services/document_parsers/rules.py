@@ -0,0 +1,216 @@
+"""
+Declarative Extraction Rules
+
+Each parser declares its fields as ExtractionRules (label phrases in priority
+order plus a value kind). A RuleSet compiles every label of every rule into
+one alternation regex at import time and finds all fields in a single pass
+over the document's reading-order lines:
+
+- the value is read inline after the label on the same line, or
+- from the nearest matching block to the right of / below the label
+
+Per-rule hit/miss counts and value-read latency go to the service metrics so
+parser cost stays visible as fields are added.
+"""
+import re
+import time
+from bisect import bisect_right
+from typing import Dict, List, Any, Optional, Callable, Pattern, Sequence, Tuple
+
+from services.metrics import metrics
+from services.spatial_index import SpatialIndex, PageLayout
+
+
+def _amount(match: re.Match) -> Optional[float]:
+    try:
+        return float(match.group(1).replace(",", ""))
+    except ValueError:
+        return None
+
+
+def _text(match: re.Match) -> Optional[str]:
+    value = match.group(1).strip()
+    return value or None
+
+
+def _name(match: re.Match) -> Optional[str]:
+    value = match.group(1).strip()
+    # Should have at least first and last name
+    return value if len(value.split()) >= 2 else None
+
+
+def _date_range(match: re.Match) -> Optional[Dict[str, str]]:
+    return {"start": match.group(1), "end": match.group(2)}
+
+
+# kind -> (inline pattern read right after the label, pattern searched in a
+#          neighbouring block or None, converter, regex flags, whether the
+#          inline value must end within the block it starts in)
+VALUE_KINDS: Dict[str, Tuple[str, Optional[str], Callable[[re.Match], Any], int, bool]] = {
+    "currency": (r'[^$\d\n]{0,20}\$?\s?(\d[\d,]*\.?\d{0,2})', r'\$?\s?(\d[\d,]*(?:\.\d{1,2})?)', _amount, 0, False),
+    "integer_amount": (r'[:.\s]*\$?\s?(\d[\d,]*)', r'\$?\s?(\d[\d,]*)', _amount, 0, False),
+    "account": (r'[:.\s#*xX-]*(\d{4,16})(?!\d)', r'(?<!\d)(\d{4,16})(?!\d)', _text, 0, False),
+    "year": (r'[^\d\n]{0,40}\b(20\d{2})\b', r'\b(20\d{2})\b', _text, 0, False),
+    # Title-case words run on into whatever block follows on the row ("John Smith Pay Date")
+    "name": (r'[:\s]*([A-Z][a-z]+(?:[ \t]+[A-Z][a-z]+)+)', None, _name, re.IGNORECASE, True),
+    "date_range": (r'[:\s]+([\d/]+)\s*[-–]\s*([\d/]+)', None, _date_range, 0, False),
+    "date": (r'[:\s]*(\d{1,2}/\d{1,2}/\d{2,4}|\d{4}-\d{2}-\d{2})', r'(\d{1,2}/\d{1,2}/\d{2,4}|\d{4}-\d{2}-\d{2})', _text, 0, False),
+}
+
+
+class ExtractionRule:
+    """One field: label phrases (highest priority first) and the kind of value that follows"""
+
+    def __init__(self, field: str, labels: Sequence[str], kind: str = "currency",
+                 required: bool = False, confidence: float = 0.9):
+        if kind not in VALUE_KINDS:
+            raise ValueError(f"Unknown value kind: {kind}")
+        inline, neighbor, convert, flags, single_block = VALUE_KINDS[kind]
+        self.field = field
+        self.labels = list(labels)
+        self.kind = kind
+        self.required = required
+        self.confidence = confidence
+        self.inline: Pattern = re.compile(inline, flags)
+        self.neighbor: Optional[Pattern] = re.compile(neighbor, flags) if neighbor else None
+        self.convert = convert
+        self.single_block = single_block
+
+
+class RuleHit:
+    """A field value found by a rule"""
+
+    __slots__ = ("field", "value", "confidence", "priority", "page", "block")
+
+    def __init__(self, field: str, value: Any, confidence: float, priority: int, page: int, block: int):
+        self.field = field
+        self.value = value
+        self.confidence = confidence
+        self.priority = priority
+        self.page = page
+        self.block = block
+
+
+def _label_pattern(label: str) -> str:
+    """Literal label phrase with flexible whitespace"""
+    return r'\s+'.join(re.escape(word) for word in label.split())
+
+
+class RuleSet:
+    """A parser's rules compiled into one combined label matcher"""
+
+    def __init__(self, name: str, rules: Sequence[ExtractionRule]):
+        self.name = name
+        self.rules = list(rules)
+        self.required = [rule.field for rule in self.rules if rule.required]
+
+        # group name -> (rule, label priority)
+        self._groups: Dict[str, Tuple[ExtractionRule, int]] = {}
+        alternatives = []
+        for r, rule in enumerate(self.rules):
+            for priority, label in enumerate(rule.labels):
+                group = f"r{r}_{priority}"
+                self._groups[group] = (rule, priority)
+                alternatives.append(f"(?P<{group}>{_label_pattern(label)})")
+        # Longest labels first so "ytd gross" wins over "gross" at the same position
+        alternatives.sort(key=len, reverse=True)
+        self.matcher: Pattern = re.compile("|".join(alternatives), re.IGNORECASE)
+
+    def scan(self, spatial: SpatialIndex, hits: Optional[Dict[str, RuleHit]] = None,
+             pages: Optional[Sequence[int]] = None) -> Dict[str, RuleHit]:
+        """
+        Find every field in one pass over the reading-order lines.
+
+        Args:
+            spatial: Spatial index of the document
+            hits: Hits from earlier pages to extend (for page-at-a-time parsing)
+            pages: Pages to scan (default: all)
+
+        Returns:
+            field -> best RuleHit (lowest label priority, then first in reading order)
+        """
+        hits = {} if hits is None else hits
+        start = time.perf_counter()
+        texts = spatial.document.texts
+
+        for page in (pages if pages is not None else list(spatial.pages)):
+            layout = spatial.pages.get(page)
+            if layout is None:
+                continue
+            for line in layout.lines():
+                if self._complete(hits):
+                    break
+                line_text, starts = self._line_text(texts, line)
+                for match in self.matcher.finditer(line_text):
+                    rule, priority = self._groups[match.lastgroup]
+                    best = hits.get(rule.field)
+                    if best is not None and best.priority <= priority:
+                        continue
+                    hit = self._read_value(rule, priority, match, line_text, line, starts, layout)
+                    if hit is not None:
+                        hits[rule.field] = hit
+
+        metrics.observe(f"rules.{self.name}.scan_ms", (time.perf_counter() - start) * 1000)
+        return hits
+
+    def record(self, hits: Dict[str, RuleHit]) -> None:
+        """Count per-rule hits and misses once a document is finished"""
+        for rule in self.rules:
+            outcome = "hits" if rule.field in hits else "misses"
+            metrics.increment(f"rules.{self.name}.{rule.field}.{outcome}")
+
+    def missing_required(self, hits: Dict[str, RuleHit], min_confidence: float = 0.0) -> List[str]:
+        return [
+            field for field in self.required
+            if field not in hits or hits[field].confidence < min_confidence
+        ]
+
+    def _complete(self, hits: Dict[str, RuleHit]) -> bool:
+        """Every rule has a hit on its top-priority label; nothing left to improve"""
+        return len(hits) == len(self.rules) and all(h.priority == 0 for h in hits.values())
+
+    @staticmethod
+    def _line_text(texts: List[str], line: List[int]) -> Tuple[str, List[int]]:
+        starts = []
+        offset = 0
+        for i in line:
+            starts.append(offset)
+            offset += len(texts[i]) + 1
+        return " ".join(texts[i] for i in line), starts
+
+    @staticmethod
+    def _value_block_end(line_text: str, line: List[int], starts: List[int], pos: int) -> int:
+        """End of the block an inline value starts in: the label's own, or the next when the label ends its block"""
+        k = bisect_right(starts, pos) - 1
+        end = starts[k + 1] - 1 if k + 1 < len(line) else len(line_text)
+        if not line_text[pos:end].strip(" \t:") and k + 1 < len(line):
+            end = starts[k + 2] - 1 if k + 2 < len(line) else len(line_text)
+        return end
+
+    def _read_value(self, rule: ExtractionRule, priority: int, match: re.Match, line_text: str,
+                    line: List[int], starts: List[int], layout: PageLayout) -> Optional[RuleHit]:
+        start = time.perf_counter()
+        try:
+            end = len(line_text)
+            if rule.single_block:
+                end = self._value_block_end(line_text, line, starts, match.end())
+            value_match = rule.inline.match(line_text, match.end(), end)
+            confidence = rule.confidence
+            block = line[bisect_right(starts, match.start()) - 1]
+            if value_match is None and rule.neighbor is not None:
+                label_block = line[bisect_right(starts, max(match.end() - 1, 0)) - 1]
+                neighbor = layout.right_of(label_block, rule.neighbor)
+                if neighbor is None:
+                    neighbor = layout.below(label_block, rule.neighbor)
+                if neighbor is not None:
+                    value_match = rule.neighbor.search(layout.document.texts[neighbor])
+                    confidence = rule.confidence - 0.05
+                    block = neighbor
+            if value_match is None:
+                return None
+            value = rule.convert(value_match)
+            if value is None:
+                return None
+            return RuleHit(rule.field, value, confidence, priority, layout.page, block)
+        finally:
+            metrics.observe(f"rules.{self.name}.{rule.field}.value_ms", (time.perf_counter() - start) * 1000)
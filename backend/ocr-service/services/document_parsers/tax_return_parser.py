@@ -2,24 +2,39 @@
 from typing import Dict, Any
 import re
 
+from services.ocr_document import OcrDocument
+from services.spatial_index import SpatialIndex
+from services.document_parsers.rules import ExtractionRule, RuleSet
+
+TAX_RETURN_RULES = RuleSet("tax_return", [
+    ExtractionRule("agi", ["adjusted gross income"], kind="integer_amount", required=True),
+    ExtractionRule("tax_year", ["tax year", "for the year", "form 1040"], kind="year", required=True),
+])
+
 class TaxReturnParser:
-    def parse(self, ocr_result: Dict[str, Any]) -> Dict[str, Any]:
-        text = ocr_result.get("full_text", "")
+    # Required fields here let extraction stop OCR early (see early_exit.py)
+    rules = TAX_RETURN_RULES
+    
+    def parse(self, document: OcrDocument) -> Dict[str, Any]:
+        hits = TAX_RETURN_RULES.scan(SpatialIndex(document))
+        TAX_RETURN_RULES.record(hits)
         
         extracted = {}
         warnings = []
         
         # Extract AGI (Adjusted Gross Income)
-        agi_match = re.search(r'adjusted\s*gross\s*income[:.\s]*\$?\s?([\d,]+)', text, re.IGNORECASE)
-        if agi_match:
-            extracted["agi"] = float(agi_match.group(1).replace(',', ''))
+        if "agi" in hits:
+            extracted["agi"] = hits["agi"].value
         else:
             warnings.append("Could not find Adjusted Gross Income (AGI)")
         
-        # Extract tax year
-        year_match = re.search(r'(20\d{2})', text)
-        if year_match:
-            extracted["tax_year"] = year_match.group(1)
+        # Extract tax year (labelled, else the first 20xx anywhere)
+        if "tax_year" in hits:
+            extracted["tax_year"] = hits["tax_year"].value
+        else:
+            year_match = re.search(r'(20\d{2})', document.full_text)
+            if year_match:
+                extracted["tax_year"] = year_match.group(1)
         
         confidence = len(extracted) / 2
         
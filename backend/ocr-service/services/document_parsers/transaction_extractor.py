@@ -0,0 +1,273 @@
+"""
+Bank Statement Transaction Extraction
+
+Rebuilds the transaction table of a bank statement from row and column
+geometry, one page at a time, so long statement sets are processed (and
+streamed) as OCR produces each page instead of as one document string.
+
+- rows: reading-order lines that start with a date; description lines without
+  a date or amount continue the previous transaction
+- columns: header blocks (date, description, withdrawals, deposits, amount,
+  balance) found on a page are remembered for the pages that follow
+- direction: the amount's column when the header separates deposits from
+  withdrawals, else the change in running balance, else the amount's sign
+- year: MM/DD rows take their year from the statement period; each
+  statement-period header starts a new period (and running balance), so a
+  multi-statement upload dates every statement by its own range
+
+Deposits and withdrawals are totalled per month as rows are emitted.
+"""
+import re
+from datetime import date
+from typing import Dict, List, Any, Optional, Tuple
+
+from services.spatial_index import PageLayout
+from services.value_normalization import expand_year, iter_dates, normalize_currency
+
+# Transaction row: first block starts with MM/DD or MM/DD/YY(YY)
+ROW_DATE = re.compile(r'^\s*(\d{1,2})[/-](\d{1,2})(?:[/-](\d{4}|\d{2}))?\b')
+
+# Statement amounts always carry cents; bare numbers (check numbers, references) are not amounts
+MONEY = re.compile(r'(?<![\w.])\(?-?\$?\s?\d[\d,]*\.\d{2}\)?-?(?![\w.])')
+
+# Line that states the statement's date range ("Statement Period 06/01/24 - 06/30/24")
+STATEMENT_PERIOD = re.compile(
+    r'\b(?:statement\s+(?:period|dates?|closing\s+date)|for\s+the\s+period|period\s+(?:covered|ending|from))\b',
+    re.IGNORECASE
+)
+
+# Seeds the running balance so the first row's direction can be checked
+OPENING_BALANCE = re.compile(r'\b(?:beginning|opening|previous|starting)\s+balance\b', re.IGNORECASE)
+
+# Header keywords -> column role
+COLUMN_ROLES = [
+    ("withdrawal", re.compile(r'\b(?:withdrawals?|debits?|payments?|checks?\s+paid)\b', re.IGNORECASE)),
+    ("deposit", re.compile(r'\b(?:deposits?|credits?|additions?)\b', re.IGNORECASE)),
+    ("balance", re.compile(r'\bbalance\b', re.IGNORECASE)),
+    ("amount", re.compile(r'\bamount\b', re.IGNORECASE)),
+    ("description", re.compile(r'\b(?:description|transaction|details?|payee)\b', re.IGNORECASE)),
+    ("date", re.compile(r'\b(?:date|posted)\b', re.IGNORECASE)),
+]
+
+# A header line names at least this many distinct columns
+MIN_HEADER_COLUMNS = 3
+
+
+def _signed_cents(text: str) -> Optional[int]:
+    """Cents of a statement amount; "(12.00)", "-12.00" and "12.00-" are negative"""
+    value = text.strip()
+    trailing_minus = value.endswith("-") and not value.startswith("-")
+    cents = normalize_currency(value.rstrip("-"))
+    if cents is None:
+        return None
+    return -abs(cents) if trailing_minus else cents
+
+
+class MonthlyTotals:
+    """Running deposit / withdrawal totals per calendar month (integer cents)"""
+
+    def __init__(self):
+        self.months: Dict[str, Dict[str, int]] = {}
+
+    def add(self, transaction: Dict[str, Any]) -> None:
+        posted = transaction.get("date") or ""
+        if not re.match(r'^\d{4}-\d{2}-\d{2}$', posted):
+            return
+        month = self.months.setdefault(posted[:7], {
+            "deposits": 0, "withdrawals": 0, "deposit_count": 0, "withdrawal_count": 0,
+        })
+        cents = int(round(transaction["amount"] * 100))
+        if transaction["type"] == "deposit":
+            month["deposits"] += cents
+            month["deposit_count"] += 1
+        else:
+            month["withdrawals"] += -cents
+            month["withdrawal_count"] += 1
+
+    def to_list(self) -> List[Dict[str, Any]]:
+        return [
+            {
+                "month": month,
+                "deposits": totals["deposits"] / 100,
+                "withdrawals": totals["withdrawals"] / 100,
+                "deposit_count": totals["deposit_count"],
+                "withdrawal_count": totals["withdrawal_count"],
+            }
+            for month, totals in sorted(self.months.items())
+        ]
+
+
+class TransactionExtractor:
+    """Stateful page-at-a-time transaction table reader for one statement (set)"""
+
+    def __init__(self):
+        # role -> (x0, x1) of the most recent header
+        self.columns: Dict[str, Tuple[int, int]] = {}
+        self.period: Optional[Tuple[date, date]] = None
+        self.balance: Optional[int] = None
+        self.totals = MonthlyTotals()
+        self.count = 0
+
+    def extract_page(self, layout: PageLayout) -> List[Dict[str, Any]]:
+        """
+        Transactions on one page, in reading order.
+
+        Returns:
+            [{date, description, amount, type, balance, page}] with amount
+            positive for deposits and negative for withdrawals
+        """
+        texts = layout.document.texts
+        lines = layout.lines()
+        self._update_period(texts, lines)
+
+        transactions: List[Dict[str, Any]] = []
+        current: Optional[Dict[str, Any]] = None
+        for line in lines:
+            line_text = " ".join(texts[i] for i in line)
+            header = self._header_columns(layout, line)
+            if header:
+                self.columns = header
+                current = None
+                continue
+
+            row_date = ROW_DATE.match(texts[line[0]])
+            amounts = [(i, m) for i in line for m in MONEY.finditer(texts[i])]
+            if row_date is None:
+                if amounts and self.balance is None and OPENING_BALANCE.search(line_text):
+                    self.balance = _signed_cents(amounts[-1][1].group(0))
+                if current is not None and not amounts and line_text.strip():
+                    # Wrapped description
+                    current["description"] = f"{current['description']} {line_text.strip()}"
+                else:
+                    current = None
+                continue
+            if not amounts:
+                current = None
+                continue
+
+            current = self._read_row(layout, line, row_date, amounts)
+            if current is not None:
+                transactions.append(current)
+
+        for transaction in transactions:
+            self.totals.add(transaction)
+        self.count += len(transactions)
+        return transactions
+
+    # -- rows --------------------------------------------------------------
+
+    def _read_row(self, layout: PageLayout, line: List[int], row_date: re.Match,
+                  amounts: List[Tuple[int, re.Match]]) -> Optional[Dict[str, Any]]:
+        texts = layout.document.texts
+        roles = [(self._role_of(layout.boxes[i]), _signed_cents(m.group(0))) for i, m in amounts]
+        roles = [(role, cents) for role, cents in roles if cents is not None]
+        if not roles:
+            return None
+
+        balance = next((cents for role, cents in roles if role == "balance"), None)
+        movements = [(role, cents) for role, cents in roles if role != "balance"]
+        if balance is None and len(movements) > 1:
+            # No header: trailing amount of a multi-amount row is the running balance
+            balance = movements.pop()[1]
+        if not movements:
+            return None
+        role, cents = movements[0]
+
+        if role == "deposit":
+            kind = "deposit"
+        elif role == "withdrawal":
+            kind = "withdrawal"
+        elif balance is not None and self.balance is not None and self.balance - abs(cents) == balance:
+            kind = "withdrawal"
+        elif balance is not None and self.balance is not None and self.balance + abs(cents) == balance:
+            kind = "deposit"
+        else:
+            kind = "withdrawal" if cents < 0 else "deposit"
+        signed = abs(cents) if kind == "deposit" else -abs(cents)
+        if balance is not None:
+            self.balance = balance
+
+        first_amount = amounts[0][0]
+        description_blocks = [i for i in line if i != first_amount and not MONEY.fullmatch(texts[i].strip())]
+        description = " ".join(texts[i] for i in description_blocks)
+        description = ROW_DATE.sub("", description, count=1).strip()
+
+        return {
+            "date": self._row_date(row_date),
+            "description": description,
+            "amount": signed / 100,
+            "type": kind,
+            "balance": balance / 100 if balance is not None else None,
+            "page": layout.page,
+        }
+
+    def _row_date(self, match: re.Match) -> str:
+        month, day, year = int(match.group(1)), int(match.group(2)), match.group(3)
+        try:
+            if year:
+                return date(expand_year(int(year)), month, day).isoformat()
+            if self.period is not None:
+                start, end = self.period
+                candidate = date(end.year, month, day)
+                if candidate > end:
+                    candidate = date(end.year - 1, month, day)
+                return candidate.isoformat()
+        except ValueError:
+            pass
+        return match.group(0).strip()
+
+    # -- columns and period ------------------------------------------------
+
+    def _header_columns(self, layout: PageLayout, line: List[int]) -> Dict[str, Tuple[int, int]]:
+        """Column role -> x-span if this line is a table header, else {}"""
+        texts = layout.document.texts
+        if any(MONEY.search(texts[i]) or ROW_DATE.match(texts[i]) for i in line):
+            return {}
+        columns: Dict[str, Tuple[int, int]] = {}
+        for i in line:
+            for role, pattern in COLUMN_ROLES:
+                if pattern.search(texts[i]) and role not in columns:
+                    box = layout.boxes[i]
+                    columns[role] = (box[0], box[2])
+                    break
+        return columns if len(columns) >= MIN_HEADER_COLUMNS else {}
+
+    def _role_of(self, box: Tuple[int, int, int, int]) -> Optional[str]:
+        """Column whose header is closest to the amount (amounts are right-aligned under headers)"""
+        best, best_distance = None, None
+        for role, (x0, x1) in self.columns.items():
+            if role in ("date", "description"):
+                continue
+            distance = abs(box[2] - x1) if box[0] <= x1 and box[2] >= x0 else abs((box[0] + box[2]) - (x0 + x1)) // 2
+            if best_distance is None or distance < best_distance:
+                best, best_distance = role, distance
+        return best
+
+    def _update_period(self, texts: List[str], lines: List[List[int]]) -> None:
+        """
+        Statement period: the dates on a statement-period line (refreshed at each
+        one, so every statement in a set is dated by its own range), else all full
+        dates outside transaction rows on the first page that has them.
+        """
+        fallback = []
+        for n, line in enumerate(lines):
+            if ROW_DATE.match(texts[line[0]]) and any(MONEY.search(texts[i]) for i in line):
+                continue
+            found = [date.fromisoformat(iso) for i in line for iso, _ in iter_dates(texts[i])]
+            if STATEMENT_PERIOD.search(" ".join(texts[i] for i in line)):
+                if not found and n + 1 < len(lines):
+                    # Label on one line, dates on the next
+                    found = [date.fromisoformat(iso) for i in lines[n + 1] for iso, _ in iter_dates(texts[i])]
+                if found:
+                    self._set_period((min(found), max(found)))
+                    return
+            fallback.extend(found)
+        if self.period is None and fallback:
+            self.period = (min(fallback), max(fallback))
+
+    def _set_period(self, period: Tuple[date, date]) -> None:
+        if period != self.period:
+            if self.period is not None:
+                # A new statement: its opening balance seeds the running balance again
+                self.balance = None
+            self.period = period
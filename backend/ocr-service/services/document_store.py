@@ -0,0 +1,164 @@
+"""
+Server-Side Document Store
+
+Keeps recent uploads together with their OCR result so validation, re-parsing
+and export can reference a prior upload by id instead of re-sending the file
+and re-running OCR. Entries expire after a TTL and the least recently used
+entries are evicted once the configured byte budget is exceeded.
+"""
+import os
+import time
+import uuid
+import logging
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, Optional
+
+from services.metrics import metrics
+from services.ocr_document import OcrDocument
+from services.token_index import TokenIndex
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL_SECONDS = 30 * 60
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+
+class StoredDocument:
+    """One upload, its OCR result, and anything derived from it"""
+
+    def __init__(self, document_id: str, filename: str, file_bytes: bytes,
+                 ocr: OcrDocument, document_type: str, expires_at: float,
+                 case_id: Optional[str] = None):
+        self.document_id = document_id
+        self.filename = filename
+        self.file_bytes = file_bytes
+        self.ocr = ocr
+        self.document_type = document_type
+        # Client case the upload belongs to (keys the full-text search index)
+        self.case_id = case_id
+        self.created_at = time.time()
+        self.expires_at = expires_at
+        # document_type -> parser output, so re-parsing and export are free
+        self.parsed: Dict[str, Dict[str, Any]] = {}
+        # Size charged against the store budget when the entry was added
+        self.accounted_bytes = 0
+        self._token_index: Optional[TokenIndex] = None
+        self._index_lock = threading.Lock()
+
+    @property
+    def token_index(self) -> TokenIndex:
+        """Normalized value index over the OCR result, built on first use"""
+        if self._token_index is None:
+            with self._index_lock:
+                if self._token_index is None:
+                    self._token_index = TokenIndex(self.ocr)
+        return self._token_index
+
+    @property
+    def nbytes(self) -> int:
+        return len(self.file_bytes) + self.ocr.nbytes
+
+
+class DocumentStore:
+    """In-memory, TTL- and size-bounded LRU store of StoredDocuments"""
+
+    def __init__(self, ttl_seconds: Optional[float] = None, max_bytes: Optional[int] = None):
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else float(
+            os.getenv("OCR_DOCUMENT_TTL_SECONDS", DEFAULT_TTL_SECONDS))
+        self.max_bytes = max_bytes if max_bytes is not None else int(
+            os.getenv("OCR_DOCUMENT_STORE_MAX_BYTES", DEFAULT_MAX_BYTES))
+        self._entries: "OrderedDict[str, StoredDocument]" = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+
+    def put(self, filename: str, file_bytes: bytes, ocr: OcrDocument,
+            document_type: str = "unknown", case_id: Optional[str] = None) -> StoredDocument:
+        """Store an upload and its OCR result; returns the new entry"""
+        stored = StoredDocument(
+            document_id=uuid.uuid4().hex,
+            filename=filename,
+            file_bytes=file_bytes,
+            ocr=ocr,
+            document_type=document_type,
+            expires_at=time.time() + self.ttl_seconds,
+            case_id=case_id,
+        )
+        stored.accounted_bytes = stored.nbytes
+        with self._lock:
+            self._entries[stored.document_id] = stored
+            self._total_bytes += stored.accounted_bytes
+            self._evict_locked()
+        metrics.increment("document_store.puts")
+        return stored
+
+    def get(self, document_id: str) -> Optional[StoredDocument]:
+        """Look up an entry, refreshing its LRU position; None if unknown or expired"""
+        with self._lock:
+            stored = self._entries.get(document_id)
+            if stored is None:
+                metrics.increment("document_store.misses")
+                return None
+            if stored.expires_at <= time.time():
+                self._remove_locked(document_id)
+                metrics.increment("document_store.expired")
+                return None
+            self._entries.move_to_end(document_id)
+        metrics.increment("document_store.hits")
+        return stored
+
+    def replace_ocr(self, document_id: str, ocr: OcrDocument, expected_pages: Optional[int] = None) -> bool:
+        """
+        Swap in a more complete OCR result (e.g. after a background pass over pages
+        skipped by early exit); cached parses and the token index are dropped.
+
+        With expected_pages, the swap only happens while the stored result still
+        has that many pages processed, so a merge built from an older snapshot
+        never replaces one another caller already completed.
+        """
+        with self._lock:
+            stored = self._entries.get(document_id)
+            if stored is None:
+                return False
+            if expected_pages is not None and stored.ocr.pages_processed != expected_pages:
+                return False
+            stored.ocr = ocr
+            stored.parsed = {}
+            stored._token_index = None
+            self._total_bytes -= stored.accounted_bytes
+            stored.accounted_bytes = stored.nbytes
+            self._total_bytes += stored.accounted_bytes
+            self._evict_locked()
+        return True
+
+    def delete(self, document_id: str) -> bool:
+        with self._lock:
+            return self._remove_locked(document_id) is not None
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "documents": len(self._entries),
+                "bytes": self._total_bytes,
+                "max_bytes": self.max_bytes,
+                "ttl_seconds": self.ttl_seconds,
+            }
+
+    def _remove_locked(self, document_id: str) -> Optional[StoredDocument]:
+        stored = self._entries.pop(document_id, None)
+        if stored is not None:
+            self._total_bytes -= stored.accounted_bytes
+        return stored
+
+    def _evict_locked(self) -> None:
+        now = time.time()
+        for document_id in [k for k, v in self._entries.items() if v.expires_at <= now]:
+            self._remove_locked(document_id)
+            metrics.increment("document_store.expired")
+
+        # Oldest-used first; always keep the entry that was just stored
+        while self._total_bytes > self.max_bytes and len(self._entries) > 1:
+            document_id, _ = next(iter(self._entries.items()))
+            self._remove_locked(document_id)
+            metrics.increment("document_store.evictions")
+            logger.info(f"Evicted document {document_id} (store over {self.max_bytes} bytes)")
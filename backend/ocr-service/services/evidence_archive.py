@@ -0,0 +1,195 @@
+"""
+ATTOM Evidence Archive
+
+Raw ATTOM responses kept for audit and trustee support, stored once each:
+
+- blobs/ab/<sha256>.json.gz: gzip'd canonical JSON, named by the hash of its
+  content, so a payload fetched again (or shared by two properties) costs nothing
+- index.sqlite3: one row per fetch (address, canonical address, attomId,
+  endpoint, time, blob hash), indexed by canonical address and attomId
+
+export() writes the latest payload per endpoint back out as the familiar
+attom_*.json files plus a manifest of hashes, for a trustee support package.
+
+Standard library only (attom_case_report.py uses it).
+"""
+import os
+import gzip
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from typing import Dict, List, Any, Optional
+
+from services.address_index import canonicalize_address
+
+DEFAULT_ARCHIVE_DIR = "attom-evidence"
+# Compression level: 6 is nearly as small as 9 on JSON at a fraction of the CPU
+COMPRESS_LEVEL = 6
+
+# Files attom_case_report.py writes -> the endpoint each came from
+CLI_EVIDENCE_FILES = {
+    "attom_property_id.json": "/property/id",
+    "attom_owner.json": "/property/detailowner",
+    "attom_detail.json": "/property/detail",
+    "attom_mort_owner.json": "/property/detailmortgageowner",
+    "attom_avm.json": "/attomavm/detail",
+    "attom_assess.json": "/assessment/detail",
+    "attom_sales.json": "/sale/detail",
+}
+EVIDENCE_FILENAMES = {endpoint: name for name, endpoint in CLI_EVIDENCE_FILES.items()}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS evidence (
+    id INTEGER PRIMARY KEY,
+    address TEXT,
+    canonical_address TEXT,
+    attom_id TEXT,
+    endpoint TEXT,
+    sha256 TEXT,
+    size INTEGER,
+    fetched_at REAL
+);
+CREATE INDEX IF NOT EXISTS evidence_address ON evidence(canonical_address, endpoint, fetched_at);
+CREATE INDEX IF NOT EXISTS evidence_attom ON evidence(attom_id, endpoint, fetched_at);
+CREATE TABLE IF NOT EXISTS blobs (
+    sha256 TEXT PRIMARY KEY,
+    size INTEGER,
+    stored_size INTEGER
+);
+"""
+
+
+def canonical_json(payload: Any) -> bytes:
+    """Byte-stable JSON (sorted keys, no whitespace), so equal payloads hash equally"""
+    return json.dumps(payload, sort_keys=True, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+class EvidenceArchive:
+    """Content-addressed, compressed store of raw ATTOM payloads with a searchable index"""
+
+    def __init__(self, root: Optional[str] = None):
+        self.root = root or os.getenv("ATTOM_EVIDENCE_DIR", DEFAULT_ARCHIVE_DIR)
+        os.makedirs(os.path.join(self.root, "blobs"), exist_ok=True)
+        self._conn = sqlite3.connect(os.path.join(self.root, "index.sqlite3"), check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(SCHEMA)
+
+    def _blob_path(self, sha: str) -> str:
+        return os.path.join(self.root, "blobs", sha[:2], f"{sha}.json.gz")
+
+    def put(self, payload: Any, address: str = "", attom_id: Any = None, endpoint: str = "",
+            fetched_at: Optional[float] = None) -> str:
+        """Archive one response; returns its content hash"""
+        raw = canonical_json(payload)
+        sha = hashlib.sha256(raw).hexdigest()
+        path = self._blob_path(sha)
+        stored_size = None
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Temp file + rename: a concurrent writer or a crash never leaves a torn blob
+            temp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(temp, "wb") as f:
+                f.write(gzip.compress(raw, COMPRESS_LEVEL, mtime=0))
+            os.replace(temp, path)
+            stored_size = os.path.getsize(path)
+
+        with self._lock, self._conn:
+            if stored_size is not None:
+                self._conn.execute("INSERT OR IGNORE INTO blobs VALUES (?, ?, ?)", (sha, len(raw), stored_size))
+            self._conn.execute(
+                "INSERT INTO evidence (address, canonical_address, attom_id, endpoint, sha256, size, fetched_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (address, canonicalize_address(address) if address else "",
+                 str(attom_id) if attom_id is not None else None, endpoint, sha, len(raw),
+                 fetched_at if fetched_at is not None else time.time()),
+            )
+        return sha
+
+    def get(self, sha: str) -> Any:
+        with open(self._blob_path(sha), "rb") as f:
+            return json.loads(gzip.decompress(f.read()))
+
+    def lookup(self, query: str, endpoint: Optional[str] = None, latest: bool = True) -> List[Dict[str, Any]]:
+        """
+        Index rows for an address (any spelling) or attomId, newest first; with
+        latest, only the newest fetch per endpoint.
+        """
+        query = query.strip()
+        if query.isdigit():
+            where, params = "attom_id = ?", [query]
+        else:
+            # The attomId behind an address also finds detail pulls archived under another spelling
+            canonical = canonicalize_address(query)
+            where = ("(canonical_address = ? OR attom_id IN "
+                     "(SELECT attom_id FROM evidence WHERE canonical_address = ? AND attom_id IS NOT NULL))")
+            params = [canonical, canonical]
+        if endpoint:
+            where += " AND endpoint = ?"
+            params.append(endpoint)
+        with self._lock:
+            rows = [dict(row) for row in self._conn.execute(
+                f"SELECT * FROM evidence WHERE {where} ORDER BY fetched_at DESC, id DESC", params)]
+        if not latest:
+            return rows
+        seen = set()
+        newest = []
+        for row in rows:
+            if row["endpoint"] not in seen:
+                seen.add(row["endpoint"])
+                newest.append(row)
+        return newest
+
+    def export(self, query: str, destination: str) -> List[str]:
+        """
+        Write the newest payload per endpoint for a property as attom_*.json
+        (indented, as the CLI used to save them) plus manifest.json; returns the paths.
+        """
+        rows = self.lookup(query)
+        if not rows:
+            raise ValueError(f"No archived evidence for {query}")
+        os.makedirs(destination, exist_ok=True)
+        written = []
+        manifest = []
+        for row in rows:
+            name = EVIDENCE_FILENAMES.get(row["endpoint"]) or \
+                f"attom_{row['endpoint'].strip('/').replace('/', '_')}.json"
+            path = os.path.join(destination, name)
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(self.get(row["sha256"]), f, indent=2)
+            written.append(path)
+            manifest.append({
+                "file": name,
+                "endpoint": row["endpoint"],
+                "address": row["address"],
+                "attom_id": row["attom_id"],
+                "fetched_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(row["fetched_at"])),
+                "sha256": row["sha256"],
+            })
+        path = os.path.join(destination, "manifest.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"query": query, "files": manifest}, f, indent=2)
+        written.append(path)
+        return written
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            fetches, raw = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM evidence").fetchone()
+            blobs, unique, stored = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0), COALESCE(SUM(stored_size), 0) FROM blobs").fetchone()
+            properties = self._conn.execute(
+                "SELECT COUNT(DISTINCT attom_id) FROM evidence WHERE attom_id IS NOT NULL").fetchone()[0]
+        return {
+            "fetches": fetches,
+            "properties": properties,
+            "blobs": blobs,
+            "raw_bytes": raw,
+            "unique_bytes": unique,
+            "stored_bytes": stored,
+            "ratio": round(raw / stored, 1) if stored else None,
+            "root": self.root,
+        }
@@ -0,0 +1,100 @@
+"""
+Field Validation Against OCR Results
+
+Checks user-entered values against a document's token index with type-aware
+normalization (see services.value_normalization):
+
+- currency: amounts compared as integer cents
+- date: dates compared in ISO form
+- name / text: case-folded token sequences, so "100" never matches "1000";
+  a text value that is a plain number also matches ignoring commas
+
+The index is built once per OCR result, so any number of fields can be
+checked against a single OCR pass with hash lookups.
+"""
+from typing import Dict, List, Any, Optional, Tuple
+
+from services.token_index import TokenIndex
+from services.value_normalization import normalize_currency, normalize_date, normalize_tokens
+
+
+class FieldValidator:
+    """Validates many field values against one OCR result"""
+
+    def __init__(self, index: TokenIndex):
+        self.index = index
+
+    def validate(self, field: str, value: str, field_type: str = "text") -> Dict[str, Any]:
+        """
+        Check a single value.
+
+        Returns:
+            Dict with field, value, type, matches, extracted_value, confidence,
+            message and the page/bbox locations of the match
+        """
+        if field_type == "currency":
+            found, blocks, confidence, message = self._check_currency(value)
+        elif field_type == "date":
+            found, blocks, confidence, message = self._check_date(value)
+        elif field_type == "name":
+            found, blocks, confidence, message = self._check_tokens(value, allow_reversed=True)
+        else:
+            found, blocks, confidence, message = self._check_tokens(value, allow_reversed=False)
+            if found is None and normalize_currency(value) is not None:
+                # A number entered as text matches with or without thousands separators
+                amount = self._check_currency(value)
+                if amount[0] is not None:
+                    found, blocks, confidence, message = amount
+
+        return {
+            "field": field,
+            "value": value,
+            "type": field_type,
+            "matches": found is not None,
+            "extracted_value": found or "",
+            "confidence": confidence,
+            "message": message,
+            "locations": self.index.locations(blocks),
+        }
+
+    def validate_all(self, checks: List[Dict[str, str]]) -> List[Dict[str, Any]]:
+        """Check a list of {field, value, type} items"""
+        return [
+            self.validate(check["field"], check["value"], check.get("type", "text"))
+            for check in checks
+        ]
+
+    # -- per-type checks ---------------------------------------------------
+
+    def _check_currency(self, value: str) -> Tuple[Optional[str], List[int], float, str]:
+        cents = normalize_currency(value)
+        if cents is None:
+            return None, [], 0.0, "Value is not a currency amount"
+        hits = self.index.find_amount(cents)
+        if not hits:
+            return None, [], 0.0, "Amount not found in document"
+        return hits[0].source, [hit.block for hit in hits], 0.95, "Amount found in document"
+
+    def _check_date(self, value: str) -> Tuple[Optional[str], List[int], float, str]:
+        iso = normalize_date(value)
+        if iso is None:
+            return None, [], 0.0, "Value is not a recognizable date"
+        hits = self.index.find_date(iso)
+        if not hits:
+            return None, [], 0.0, "Date not found in document"
+        return hits[0].source, [hit.block for hit in hits], 0.95, "Date found in document"
+
+    def _check_tokens(self, value: str, allow_reversed: bool) -> Tuple[Optional[str], List[int], float, str]:
+        needle = normalize_tokens(value)
+        if not needle:
+            return None, [], 0.0, "Value is empty"
+
+        occurrences = self.index.find_tokens(needle)
+        if occurrences:
+            return value, occurrences[0], 0.9, "Value found in document"
+        if allow_reversed and len(needle) > 1:
+            # "Smith, John" on the document for "John Smith" entered by the user
+            occurrences = self.index.find_tokens(needle[-1:] + needle[:-1])
+            if occurrences:
+                return value, occurrences[0], 0.8, "Name found in document (last name first)"
+        return None, [], 0.0, "Value not found in document"
@@ -0,0 +1,107 @@
+"""
+Current Monthly Income Aggregation
+
+Rolls parsed paystubs up into the figures the means test works from. Current
+monthly income (CMI) is the average monthly income over the six full calendar
+months before the month of filing (11 U.S.C. § 101(10A)).
+
+Each stub is placed in a month by its pay date, or by its pay period end when
+no pay date was read. A stub with the same pay date and gross pay as one
+already counted is treated as a duplicate upload and skipped.
+"""
+from datetime import date, timedelta
+from typing import Dict, List, Any, Optional, Tuple
+
+from services.value_normalization import normalize_date
+
+LOOKBACK_MONTHS = 6
+
+
+def _shift_month(day: date, months: int) -> date:
+    """First day of the month `months` away from day's month"""
+    index = day.year * 12 + day.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def lookback_window(filing_date: date, months: int = LOOKBACK_MONTHS) -> Tuple[date, date]:
+    """First and last day of the full calendar months before the filing month"""
+    end = date(filing_date.year, filing_date.month, 1) - timedelta(days=1)
+    return _shift_month(filing_date, -months), end
+
+
+def _cents(value: Any) -> Optional[int]:
+    if isinstance(value, (int, float)):
+        return int(round(value * 100))
+    return None
+
+
+def stub_date(stub: Dict[str, Any]) -> Optional[date]:
+    """Date a stub is counted on: pay date, else pay period end"""
+    for key in ("pay_date", "pay_period_end"):
+        iso = normalize_date(str(stub.get(key) or ""))
+        if iso:
+            return date.fromisoformat(iso)
+    return None
+
+
+def aggregate_income(stubs: List[Dict[str, Any]], filing_date: Optional[date] = None,
+                     months: int = LOOKBACK_MONTHS) -> Dict[str, Any]:
+    """
+    Per-month and total gross/net pay over the lookback window.
+
+    Sets "counted" on each stub record (False when undated, outside the
+    window, or a duplicate).
+
+    Returns:
+        Dict with lookback_start, lookback_end, months (one entry per calendar
+        month, empty months included), gross_total, net_total,
+        monthly_gross_average (CMI), monthly_net_average, stubs_counted and warnings
+    """
+    start, end = lookback_window(filing_date or date.today(), months)
+    by_month: Dict[str, Dict[str, int]] = {}
+    for n in range(months):
+        by_month[_shift_month(start, n).strftime("%Y-%m")] = {"gross": 0, "net": 0, "stubs": 0}
+
+    warnings: List[str] = []
+    seen = set()
+    for stub in stubs:
+        stub["counted"] = False
+        paid_on = stub_date(stub)
+        if paid_on is None:
+            warnings.append(f"Stub {stub.get('stub')}: no pay date or pay period found; not counted")
+            continue
+        if not start <= paid_on <= end:
+            continue
+        gross = _cents(stub.get("gross_pay"))
+        key = (paid_on, gross)
+        if key in seen:
+            warnings.append(f"Stub {stub.get('stub')}: duplicate of an earlier stub paid {paid_on.isoformat()}; not counted")
+            continue
+        seen.add(key)
+
+        month = by_month[paid_on.strftime("%Y-%m")]
+        month["gross"] += gross or 0
+        month["net"] += _cents(stub.get("net_pay")) or 0
+        month["stubs"] += 1
+        stub["counted"] = True
+
+    for month, totals in by_month.items():
+        if totals["stubs"] == 0:
+            warnings.append(f"No paystubs for {month}")
+
+    gross_total = sum(totals["gross"] for totals in by_month.values())
+    net_total = sum(totals["net"] for totals in by_month.values())
+    return {
+        "lookback_start": start.isoformat(),
+        "lookback_end": end.isoformat(),
+        "months": [
+            {"month": month, "gross": totals["gross"] / 100, "net": totals["net"] / 100, "stubs": totals["stubs"]}
+            for month, totals in by_month.items()
+        ],
+        "gross_total": gross_total / 100,
+        "net_total": net_total / 100,
+        "monthly_gross_average": round(gross_total / months / 100, 2),
+        "monthly_net_average": round(net_total / months / 100, 2),
+        "stubs_counted": sum(1 for stub in stubs if stub["counted"]),
+        "warnings": warnings,
+    }
@@ -0,0 +1,47 @@
+"""
+In-Process Service Metrics
+
+Lightweight counters and timing/size summaries, exposed via GET /metrics.
+"""
+import threading
+from typing import Dict, Any
+
+
+class MetricsRegistry:
+    """Thread-safe counters and running summaries (count/total/min/max)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: Dict[str, float] = {}
+        self._summaries: Dict[str, Dict[str, float]] = {}
+
+    def increment(self, name: str, value: float = 1) -> None:
+        """Add value to a monotonically increasing counter"""
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def observe(self, name: str, value: float) -> None:
+        """Record one observation (latency in ms, payload bytes, ...)"""
+        with self._lock:
+            summary = self._summaries.get(name)
+            if summary is None:
+                self._summaries[name] = {"count": 1, "total": value, "min": value, "max": value}
+                return
+            summary["count"] += 1
+            summary["total"] += value
+            if value < summary["min"]:
+                summary["min"] = value
+            if value > summary["max"]:
+                summary["max"] = value
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Copy of all counters and summaries (with mean) for reporting"""
+        with self._lock:
+            summaries = {}
+            for name, s in self._summaries.items():
+                summaries[name] = {**s, "mean": s["total"] / s["count"] if s["count"] else 0.0}
+            return {"counters": dict(self._counters), "summaries": summaries}
+
+
+# Shared registry used by all services in this process
+metrics = MetricsRegistry()
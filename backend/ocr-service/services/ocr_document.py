@@ -0,0 +1,214 @@
+"""
+Columnar OCR Result
+
+Holds every detected text block in parallel arrays (text, confidence, polygon,
+axis-aligned box, page) instead of one dict per block. Parsers and validators
+work on this structure directly; it is converted to the API's list-of-dicts
+shape only at the response boundary via `to_blocks`.
+"""
+from array import array
+from typing import Dict, List, Any, Optional, Iterable, Sequence, Set, Tuple
+
+BBOX_FORMATS = ("quad", "box")
+
+QUAD_WIDTH = 8  # flattened [x1, y1, x2, y2, x3, y3, x4, y4]
+BOX_WIDTH = 4   # axis-aligned [x_min, y_min, x_max, y_max]
+
+
+class OcrDocument:
+    """Array-backed OCR result for a whole document (one slot per text block)"""
+
+    __slots__ = (
+        "texts", "confidences", "quads", "boxes", "pages",
+        "page_count", "pages_processed", "error", "_page_starts", "_full_text",
+    )
+
+    def __init__(self, page_count: int = 0, error: Optional[str] = None):
+        self.texts: List[str] = []
+        self.confidences = array("d")
+        self.quads = array("i")
+        self.boxes = array("i")
+        self.pages = array("H")
+        self.page_count = page_count
+        # Pages OCR has finished so far; below page_count when OCR stopped early
+        self.pages_processed = page_count
+        self.error = error
+        # page number -> index of its first block (blocks are appended in page order)
+        self._page_starts: Dict[int, int] = {}
+        self._full_text: Optional[str] = None
+
+    def __len__(self) -> int:
+        return len(self.texts)
+
+    def add_block(self, text: str, confidence: float, points: Sequence[Sequence[float]], page: int = 1) -> None:
+        """
+        Append one detected line.
+
+        Args:
+            text: Recognized text
+            confidence: Recognition confidence (0-1)
+            points: Polygon as [[x1, y1], [x2, y2], [x3, y3], [x4, y4]]
+            page: 1-based page number
+        """
+        xs = [int(point[0]) for point in points]
+        ys = [int(point[1]) for point in points]
+        for x, y in zip(xs, ys):
+            self.quads.append(x)
+            self.quads.append(y)
+        self.boxes.extend((min(xs), min(ys), max(xs), max(ys)))
+        self._append(text, confidence, page)
+
+    def add_flat_block(self, text: str, confidence: float, bbox: Sequence[int], page: int = 1) -> None:
+        """Append a block whose bbox is already flattened (8-int polygon or 4-int box)"""
+        if len(bbox) >= QUAD_WIDTH:
+            quad = [int(v) for v in bbox[:QUAD_WIDTH]]
+            xs, ys = quad[0::2], quad[1::2]
+            box = (min(xs), min(ys), max(xs), max(ys))
+        elif len(bbox) == BOX_WIDTH:
+            box = tuple(int(v) for v in bbox)
+            x1, y1, x2, y2 = box
+            quad = [x1, y1, x2, y1, x2, y2, x1, y2]
+        else:
+            box = (0, 0, 0, 0)
+            quad = [0] * QUAD_WIDTH
+        self.quads.extend(quad)
+        self.boxes.extend(box)
+        self._append(text, confidence, page)
+
+    def _append(self, text: str, confidence: float, page: int) -> None:
+        if page not in self._page_starts:
+            self._page_starts[page] = len(self.texts)
+        self.texts.append(text)
+        self.confidences.append(float(confidence))
+        self.pages.append(page)
+        self.page_count = max(self.page_count, page)
+        self._full_text = None
+
+    @classmethod
+    def from_blocks(cls, blocks: Iterable[Dict[str, Any]], page_count: int = 0) -> "OcrDocument":
+        """Build from the API's list-of-dicts block shape"""
+        document = cls(page_count=page_count)
+        for block in blocks:
+            document.add_flat_block(
+                block.get("text", ""),
+                block.get("confidence", 0.0),
+                block.get("bbox", []),
+                block.get("page", 1),
+            )
+        document.pages_processed = document.page_count
+        return document
+
+    # ------------------------------------------------------------------
+    # Accessors
+    # ------------------------------------------------------------------
+
+    def box(self, index: int) -> Tuple[int, int, int, int]:
+        """Axis-aligned box of one block"""
+        offset = index * BOX_WIDTH
+        return tuple(self.boxes[offset:offset + BOX_WIDTH])
+
+    def quad(self, index: int) -> List[int]:
+        """Flattened polygon of one block"""
+        offset = index * QUAD_WIDTH
+        return self.quads[offset:offset + QUAD_WIDTH].tolist()
+
+    def page_range(self, page: int) -> range:
+        """Block indices that belong to a page"""
+        start = self._page_starts.get(page)
+        if start is None:
+            return range(0)
+        end = start
+        total = len(self.texts)
+        while end < total and self.pages[end] == page:
+            end += 1
+        return range(start, end)
+
+    def page_numbers(self) -> List[int]:
+        """Pages that produced at least one block, in order"""
+        return list(self._page_starts.keys())
+
+    def page_text(self, page: int) -> str:
+        """Space-joined text of a single page"""
+        return " ".join(self.texts[i] for i in self.page_range(page))
+
+    def page_slice(self, first_page: int, last_page: int) -> "OcrDocument":
+        """New document holding only pages first_page..last_page (page numbers kept)"""
+        part = OcrDocument(page_count=last_page)
+        for page in range(first_page, last_page + 1):
+            for i in self.page_range(page):
+                part.quads.extend(self.quads[i * QUAD_WIDTH:(i + 1) * QUAD_WIDTH])
+                part.boxes.extend(self.boxes[i * BOX_WIDTH:(i + 1) * BOX_WIDTH])
+                part._append(self.texts[i], self.confidences[i], page)
+        return part
+
+    def select(self, indices: Iterable[int]) -> "OcrDocument":
+        """New document holding only the given blocks (ascending order, page numbers kept)"""
+        part = OcrDocument()
+        for i in indices:
+            part.quads.extend(self.quads[i * QUAD_WIDTH:(i + 1) * QUAD_WIDTH])
+            part.boxes.extend(self.boxes[i * BOX_WIDTH:(i + 1) * BOX_WIDTH])
+            part._append(self.texts[i], self.confidences[i], self.pages[i])
+        part.pages_processed = part.page_count
+        return part
+
+    def merged(self, other: "OcrDocument") -> "OcrDocument":
+        """New document with this one's blocks followed by other's (other holds later pages)"""
+        combined = OcrDocument(page_count=max(self.page_count, other.page_count), error=self.error or other.error)
+        for part in (self, other):
+            combined.quads.extend(part.quads)
+            combined.boxes.extend(part.boxes)
+            for i, text in enumerate(part.texts):
+                combined._append(text, part.confidences[i], part.pages[i])
+        combined.pages_processed = max(self.pages_processed, other.pages_processed)
+        return combined
+
+    @property
+    def full_text(self) -> str:
+        """Space-joined text of all blocks (built once, cached until the next append)"""
+        if self._full_text is None:
+            self._full_text = " ".join(self.texts)
+        return self._full_text
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate memory held by this result"""
+        text_bytes = sum(len(t) for t in self.texts)
+        return (
+            text_bytes
+            + self.confidences.itemsize * len(self.confidences)
+            + self.quads.itemsize * len(self.quads)
+            + self.boxes.itemsize * len(self.boxes)
+            + self.pages.itemsize * len(self.pages)
+        )
+
+    # ------------------------------------------------------------------
+    # Response boundary
+    # ------------------------------------------------------------------
+
+    def to_blocks(self, pages: Optional[Set[int]] = None, bbox_format: str = "quad") -> List[Dict[str, Any]]:
+        """
+        Convert to the API's list-of-dicts shape.
+
+        Args:
+            pages: Optional set of 1-based pages to keep
+            bbox_format: "quad" for the 8-int polygon, "box" for [x1, y1, x2, y2]
+        """
+        if pages is None:
+            indices: Iterable[int] = range(len(self.texts))
+        else:
+            indices = (i for page in sorted(pages) for i in self.page_range(page))
+
+        use_box = bbox_format == "box"
+        width = BOX_WIDTH if use_box else QUAD_WIDTH
+        coords = self.boxes if use_box else self.quads
+
+        blocks = []
+        for i in indices:
+            offset = i * width
+            blocks.append({
+                "text": self.texts[i],
+                "confidence": self.confidences[i],
+                "bbox": coords[offset:offset + width].tolist(),
+                "page": self.pages[i],
+            })
+        return blocks
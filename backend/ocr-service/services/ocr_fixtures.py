@@ -0,0 +1,120 @@
+"""
+Recorded OCR Fixtures
+
+Saves OcrDocuments (the output of PaddleOCRService.extract_text) as compact
+gzip'd columnar JSON so parsers can be benchmarked and checked for accuracy
+without running PaddleOCR.
+
+A fixture `<name>.ocr.json.gz` may have a sidecar `<name>.expected.json`
+holding the correct field values ({"document_type": ..., "fields": {...}});
+field accuracy is only scored for fixtures that have one.
+
+Set OCR_FIXTURE_DIR to record every full OCR pass the service runs.
+"""
+import os
+import re
+import gzip
+import json
+import time
+import logging
+from typing import Dict, List, Any, Optional, Tuple
+
+from services.ocr_document import OcrDocument
+
+logger = logging.getLogger(__name__)
+
+FIXTURE_VERSION = 1
+FIXTURE_SUFFIX = ".ocr.json.gz"
+EXPECTED_SUFFIX = ".expected.json"
+
+
+def document_to_fixture(document: OcrDocument, filename: str = "",
+                        document_type: str = "unknown") -> Dict[str, Any]:
+    """Columnar, JSON-ready form of an OcrDocument"""
+    return {
+        "version": FIXTURE_VERSION,
+        "filename": filename,
+        "document_type": document_type,
+        "page_count": document.page_count,
+        "texts": document.texts,
+        "confidences": [round(c, 4) for c in document.confidences],
+        "quads": document.quads.tolist(),
+        "pages": document.pages.tolist(),
+    }
+
+
+def fixture_to_document(fixture: Dict[str, Any]) -> OcrDocument:
+    """Rebuild the OcrDocument a fixture was recorded from"""
+    if fixture.get("version") != FIXTURE_VERSION:
+        raise ValueError(f"Unsupported fixture version: {fixture.get('version')}")
+    document = OcrDocument(page_count=fixture.get("page_count", 0))
+    quads = fixture["quads"]
+    for i, text in enumerate(fixture["texts"]):
+        document.add_flat_block(text, fixture["confidences"][i], quads[i * 8:(i + 1) * 8], fixture["pages"][i])
+    document.pages_processed = document.page_count
+    return document
+
+
+def save_fixture(path: str, document: OcrDocument, filename: str = "",
+                 document_type: str = "unknown") -> str:
+    """Write a fixture file; returns its path"""
+    payload = json.dumps(document_to_fixture(document, filename, document_type), separators=(",", ":"))
+    with gzip.open(path, "wt", encoding="utf-8") as f:
+        f.write(payload)
+    return path
+
+
+def load_fixture(path: str) -> Tuple[OcrDocument, Dict[str, Any]]:
+    """
+    Read a fixture and its sidecar.
+
+    Returns:
+        (document, meta) where meta has filename, document_type and, when a
+        sidecar exists, expected (field -> value)
+    """
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        fixture = json.load(f)
+    meta: Dict[str, Any] = {
+        "filename": fixture.get("filename", ""),
+        "document_type": fixture.get("document_type", "unknown"),
+        "expected": None,
+    }
+    sidecar = path[:-len(FIXTURE_SUFFIX)] + EXPECTED_SUFFIX if path.endswith(FIXTURE_SUFFIX) else None
+    if sidecar and os.path.exists(sidecar):
+        with open(sidecar, encoding="utf-8") as f:
+            expected = json.load(f)
+        meta["document_type"] = expected.get("document_type", meta["document_type"])
+        meta["expected"] = expected.get("fields", {})
+    return fixture_to_document(fixture), meta
+
+
+def list_fixtures(directory: str) -> List[str]:
+    """Fixture files in a directory, sorted by name"""
+    return sorted(
+        os.path.join(directory, name) for name in os.listdir(directory) if name.endswith(FIXTURE_SUFFIX)
+    )
+
+
+class FixtureRecorder:
+    """Writes each OCR result to OCR_FIXTURE_DIR (disabled when unset)"""
+
+    def __init__(self, directory: Optional[str] = None):
+        self.directory = directory if directory is not None else os.getenv("OCR_FIXTURE_DIR")
+        if self.directory:
+            os.makedirs(self.directory, exist_ok=True)
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.directory)
+
+    def record(self, document: OcrDocument, filename: str, document_type: str = "unknown") -> Optional[str]:
+        """Save one result; failures are logged, never raised into the request"""
+        if not self.enabled or document.error:
+            return None
+        stem = re.sub(r'[^\w.-]+', '_', os.path.splitext(os.path.basename(filename))[0]) or "document"
+        path = os.path.join(self.directory, f"{stem}-{int(time.time() * 1000)}{FIXTURE_SUFFIX}")
+        try:
+            return save_fixture(path, document, filename, document_type)
+        except OSError as e:
+            logger.error(f"Could not record OCR fixture {path}: {str(e)}")
+            return None
@@ -7,11 +7,20 @@ import logging
 from paddleocr import PaddleOCR
 from PIL import Image
 import io
+from contextlib import closing
 import fitz  # PyMuPDF for PDF handling
-from typing import Dict, List, Any
+from typing import Any, Callable, Iterator, List, Optional
+
+from services.ocr_document import OcrDocument
 
 logger = logging.getLogger(__name__)
 
+# Resolution for the quick classification pass on scanned pages
+QUICK_DPI = 100
+
+# A PDF page with fewer characters than this in its text layer is treated as scanned
+MIN_TEXT_LAYER_CHARS = 40
+
 class PaddleOCRService:
     """Wrapper around PaddleOCR for document text extraction"""
     
@@ -31,111 +40,113 @@ class PaddleOCRService:
         
         logger.info("PaddleOCR engine initialized successfully")
     
-    def extract_text(self, file_bytes: bytes, filename: str) -> Dict[str, Any]:
+    def extract_text(self, file_bytes: bytes, filename: str,
+                     should_stop: Optional[Callable[[OcrDocument, int], bool]] = None,
+                     first_page: int = 1) -> OcrDocument:
         """
         Extract text from document using PaddleOCR.
         
         Args:
             file_bytes: Raw file bytes
             filename: Original filename (used to determine file type)
+            should_stop: Called after each page with (document, page); returning
+                True stops OCR there and leaves the remaining pages unprocessed
+            first_page: 1-based page to start from (to finish a document that stopped early)
         
         Returns:
-            Dict with text_blocks, full_text, and metadata
+            OcrDocument with per-block text, confidence, boxes and pages;
+            pages_processed tells how far OCR got
         """
+        document = OcrDocument()
         try:
-            # Determine file type
-            is_pdf = filename.lower().endswith('.pdf')
-            
-            if is_pdf:
-                return self._extract_from_pdf(file_bytes)
-            else:
-                return self._extract_from_image(file_bytes)
-                
+            # closing() releases the PDF as soon as we stop, not when the generator is collected
+            with closing(self.iter_pages(file_bytes, filename, document, first_page)) as pages:
+                for page in pages:
+                    if should_stop is not None and should_stop(document, page):
+                        break
         except Exception as e:
             logger.error(f"Error extracting text: {str(e)}", exc_info=True)
-            return {
-                "text_blocks": [],
-                "full_text": "",
-                "error": str(e)
-            }
+            document.error = str(e)
+        return document
     
-    def _extract_from_image(self, image_bytes: bytes) -> Dict[str, Any]:
-        """Extract text from image file (JPG, PNG)"""
-        # Convert bytes to PIL Image
-        image = Image.open(io.BytesIO(image_bytes))
+    def quick_page_texts(self, file_bytes: bytes, filename: str,
+                         max_pages: Optional[int] = None) -> Optional[List[str]]:
+        """
+        Cheap per-page text for classification, without the full OCR pass.
         
-        # Run OCR
-        result = self.ocr.ocr(image, cls=True)
+        Uses the PDF text layer where present and a low-DPI OCR pass otherwise.
         
-        # Parse results
-        text_blocks = []
-        full_text_parts = []
+        Returns:
+            One string per page, or None for images and for PDFs the probe
+            can't read (classify those from the full OCR)
+        """
+        if not filename.lower().endswith('.pdf'):
+            return None
         
+        try:
+            pdf_document = fitz.open(stream=file_bytes, filetype="pdf")
+        except Exception as e:
+            logger.error(f"Quick text probe could not open {filename}: {str(e)}")
+            return None
+        texts = []
+        try:
+            page_count = len(pdf_document) if max_pages is None else min(max_pages, len(pdf_document))
+            for page_num in range(page_count):
+                page = pdf_document[page_num]
+                text = page.get_text("text")
+                if len(text.strip()) < MIN_TEXT_LAYER_CHARS:
+                    pix = page.get_pixmap(dpi=QUICK_DPI)
+                    image = Image.open(io.BytesIO(pix.tobytes("png")))
+                    result = self.ocr.ocr(image, cls=False)
+                    page_document = OcrDocument()
+                    self._collect_lines(result, page_document, page=page_num + 1)
+                    text = page_document.full_text
+                texts.append(text)
+        except Exception as e:
+            # Fall back to the full OCR path, which reports the failure as its error
+            logger.error(f"Quick text probe of {filename} failed: {str(e)}", exc_info=True)
+            return None
+        finally:
+            pdf_document.close()
+        return texts
+    
+    def _collect_lines(self, result: Any, document: OcrDocument, page: int) -> None:
+        """Append one page of PaddleOCR output to the document"""
         if result and result[0]:
             for line in result[0]:
                 if line:
                     bbox = line[0]  # [[x1,y1], [x2,y2], [x3,y3], [x4,y4]]
-                    text_info = line[1]  # (text, confidence)
-                    text = text_info[0]
-                    confidence = float(text_info[1])
-                    
-                    text_blocks.append({
-                        "text": text,
-                        "confidence": confidence,
-                        "bbox": [int(coord) for point in bbox for coord in point]
-                    })
-                    
-                    full_text_parts.append(text)
-        
-        return {
-            "text_blocks": text_blocks,
-            "full_text": " ".join(full_text_parts),
-            "pages": 1
-        }
+                    text, confidence = line[1]
+                    document.add_block(text, confidence, bbox, page)
     
-    def _extract_from_pdf(self, pdf_bytes: bytes) -> Dict[str, Any]:
-        """Extract text from PDF file (handles multi-page)"""
-        # Open PDF with PyMuPDF
-        pdf_document = fitz.open(stream=pdf_bytes, filetype="pdf")
-        
-        all_text_blocks = []
-        full_text_parts = []
-        
-        # Process each page
-        for page_num in range(len(pdf_document)):
-            page = pdf_document[page_num]
-            
-            # Convert page to image
-            pix = page.get_pixmap(dpi=200)  # Higher DPI for better OCR
-            img_bytes = pix.tobytes("png")
-            
-            # Load image for OCR
-            image = Image.open(io.BytesIO(img_bytes))
-            
-            # Run OCR on this page
+    def iter_pages(self, file_bytes: bytes, filename: str, document: OcrDocument,
+                    first_page: int = 1) -> Iterator[int]:
+        """OCR one page at a time into the document, yielding each finished page number"""
+        if not filename.lower().endswith('.pdf'):
+            # Images (JPG, PNG) are a single page
+            image = Image.open(io.BytesIO(file_bytes))
             result = self.ocr.ocr(image, cls=True)
-            
-            if result and result[0]:
-                for line in result[0]:
-                    if line:
-                        bbox = line[0]
-                        text_info = line[1]
-                        text = text_info[0]
-                        confidence = float(text_info[1])
-                        
-                        all_text_blocks.append({
-                            "text": text,
-                            "confidence": confidence,
-                            "bbox": [int(coord) for point in bbox for coord in point],
-                            "page": page_num + 1
-                        })
-                        
-                        full_text_parts.append(text)
+            document.page_count = 1
+            self._collect_lines(result, document, page=1)
+            document.pages_processed = 1
+            yield 1
+            return
         
-        pdf_document.close()
-        
-        return {
-            "text_blocks": all_text_blocks,
-            "full_text": " ".join(full_text_parts),
-            "pages": len(pdf_document)
-        }
+        # Open PDF with PyMuPDF
+        pdf_document = fitz.open(stream=file_bytes, filetype="pdf")
+        document.page_count = len(pdf_document)
+        try:
+            for page_num in range(first_page - 1, len(pdf_document)):
+                page = pdf_document[page_num]
+                
+                # Convert page to image
+                pix = page.get_pixmap(dpi=200)  # Higher DPI for better OCR
+                image = Image.open(io.BytesIO(pix.tobytes("png")))
+                
+                # Run OCR on this page
+                result = self.ocr.ocr(image, cls=True)
+                self._collect_lines(result, document, page=page_num + 1)
+                document.pages_processed = page_num + 1
+                yield page_num + 1
+        finally:
+            pdf_document.close()
@@ -1,29 +1,128 @@
 import os
+import time
 import requests
 import logging
-from typing import Dict, Any, Optional
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from requests.adapters import HTTPAdapter
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+
+from services.metrics import metrics
+from services.attom_cache import AttomCache
+from services.address_index import AttomIdIndex, canonicalize_address
+from services.attom_fixtures import AttomRecorder
+from services.attom_extractors import extract_section
+from services.rate_limiter import RETRYABLE_STATUS, TokenBucket, backoff_delay
 
 logger = logging.getLogger(__name__)
 
+# (connect, read) seconds per endpoint; AVM and sale history are the slow ones
+DEFAULT_TIMEOUT = (5, 20)
+ENDPOINT_TIMEOUTS = {
+    "/property/id": (5, 15),
+    "/attomavm/detail": (5, 30),
+    "/sale/detail": (5, 30),
+}
+
+# Report section -> (endpoint, extractor); fetched concurrently once the attomId is known
+DETAIL_SECTIONS = {
+    "owner": ("/property/detailowner", "_extract_owner"),
+    "profile": ("/property/detail", "_extract_profile"),
+    "mortgage": ("/property/detailmortgageowner", "_extract_mortgage"),
+    "valuation": ("/attomavm/detail", "_extract_avm"),
+    "assessment": ("/assessment/detail", "_extract_assessment"),
+    "sale": ("/sale/detail", "_extract_sale"),
+}
+
+# ATTOM request pacing shared by every report (single and bulk)
+DEFAULT_RATE_PER_SEC = 10.0
+DEFAULT_MAX_RETRIES = 3
+# Properties worked on at once by generate_reports; their calls still share the rate limit
+DEFAULT_BULK_WORKERS = 4
+
 class PropertyService:
     BASE_URL = "https://api.gateway.attomdata.com/propertyapi/v1.0.0"
 
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(self, api_key: Optional[str] = None, max_workers: Optional[int] = None,
+                 cache: Optional[AttomCache] = None, address_index: Optional[AttomIdIndex] = None):
         self.api_key = api_key or os.getenv("ATTOM_API_KEY")
         if not self.api_key:
             logger.warning("ATTOM_API_KEY not set. Property reports will fail.")
+        # Point at benchmarks/attom_standin.py (or any gateway mirror) for offline runs
+        self.base_url = os.getenv("ATTOM_BASE_URL", self.BASE_URL).rstrip("/")
 
-    def _call_attom(self, endpoint: str, params: Optional[Dict] = None) -> Dict[str, Any]:
+        self.max_workers = max_workers or int(os.getenv("ATTOM_MAX_WORKERS", len(DETAIL_SECTIONS)))
+        # One keep-alive session for every ATTOM call; sized so concurrent fetches don't queue for a socket
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.max_workers * 2)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update({"Accept": "application/json"})
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="attom")
+        self.cache = cache if cache is not None else AttomCache()
+        self.address_index = address_index if address_index is not None else AttomIdIndex()
+        self.rate_limiter = TokenBucket(
+            float(os.getenv("ATTOM_RATE_PER_SEC", DEFAULT_RATE_PER_SEC)),
+            int(os.getenv("ATTOM_RATE_BURST", 0)) or None,
+        )
+        self.max_retries = int(os.getenv("ATTOM_MAX_RETRIES", DEFAULT_MAX_RETRIES))
+        self.bulk_workers = int(os.getenv("ATTOM_BULK_WORKERS", DEFAULT_BULK_WORKERS))
+        self.recorder = AttomRecorder()
+
+    def _call_attom(self, endpoint: str, params: Optional[Dict] = None, force_refresh: bool = False) -> Dict[str, Any]:
         if not self.api_key:
             raise ValueError("ATTOM API key is missing")
+
+        if not force_refresh:
+            cached = self.cache.get(endpoint, params)
+            if cached is not None:
+                return cached
             
-        url = f"{self.BASE_URL}{endpoint}"
-        headers = {"Accept": "application/json", "APIKey": self.api_key}
+        url = f"{self.base_url}{endpoint}"
+        headers = {"APIKey": self.api_key}
+        timeout = ENDPOINT_TIMEOUTS.get(endpoint, DEFAULT_TIMEOUT)
         
+        for attempt in range(self.max_retries + 1):
+            self.rate_limiter.acquire()
+            start = time.perf_counter()
+            try:
+                response = self.session.get(url, headers=headers, params=params, timeout=timeout)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if attempt == self.max_retries:
+                    logger.error(f"ATTOM API error: {e}")
+                    raise Exception(f"Failed to fetch data from ATTOM: {str(e)}")
+                metrics.increment("attom.retries")
+                time.sleep(backoff_delay(attempt))
+                continue
+            finally:
+                metrics.observe(f"attom.{endpoint.strip('/').replace('/', '.')}_ms", (time.perf_counter() - start) * 1000)
+
+            if response.status_code in RETRYABLE_STATUS and attempt < self.max_retries:
+                delay = backoff_delay(attempt, retry_after=response.headers.get("Retry-After"))
+                metrics.increment("attom.retries")
+                logger.warning(f"ATTOM {endpoint} returned {response.status_code}; retrying in {delay:.1f}s")
+                if response.status_code == 429:
+                    # Throttled: hold back every caller sharing the bucket, not just this one
+                    metrics.increment("attom.throttled")
+                    self.rate_limiter.penalize(delay)
+                else:
+                    time.sleep(delay)
+                continue
+            return self._read_response(endpoint, params, response, force_refresh)
+
+    def _read_response(self, endpoint: str, params: Optional[Dict], response: requests.Response,
+                       force_refresh: bool) -> Dict[str, Any]:
+        if self.recorder.enabled:
+            try:
+                self.recorder.record(endpoint, params, response.status_code, response.json())
+            except ValueError:
+                pass
         try:
-            response = requests.get(url, headers=headers, params=params, timeout=30)
             response.raise_for_status()
-            return response.json()
+            data = response.json()
+            # Only successful lookups are cached ("not found" answers may resolve later)
+            if self._safe_get(data, ["status", "code"], 0) == 0:
+                self.cache.put(endpoint, params, data, refreshed=force_refresh)
+            return data
         except requests.RequestException as e:
             logger.error(f"ATTOM API error: {e}")
             if e.response is not None:
@@ -33,6 +132,16 @@ class PropertyService:
                     pass
             raise Exception(f"Failed to fetch data from ATTOM: {str(e)}")
 
+    def _fetch_section(self, endpoint: str, attom_id: Any,
+                       force_refresh: bool = False) -> Tuple[Optional[Dict[str, Any]], Optional[str], float]:
+        """One detail call: (payload, error, elapsed ms); failures are returned, not raised"""
+        start = time.perf_counter()
+        try:
+            data, error = self._call_attom(endpoint, params={"id": attom_id}, force_refresh=force_refresh), None
+        except Exception as e:
+            data, error = None, str(e)
+        return data, error, round((time.perf_counter() - start) * 1000, 1)
+
     def _safe_get(self, d: Any, path: list, default: Any = None) -> Any:
         cur = d
         try:
@@ -51,10 +160,22 @@ class PropertyService:
         except Exception:
             return default
 
-    def generate_report(self, address: str) -> Dict[str, Any]:
-        # 1. Resolve ID
+    def resolve_attom_id(self, address: str, force_refresh: bool = False) -> Tuple[Any, str]:
+        """
+        attomId for an address: from the canonical-address index when any spelling
+        of it was resolved before, else from /property/id.
+
+        Returns:
+            (attom_id, source) where source is "index" or "api"
+        """
+        if not force_refresh:
+            attom_id = self.address_index.get(address)
+            if attom_id:
+                metrics.increment("attom.id_index_hits")
+                return attom_id, "index"
+
         logger.info(f"Resolving address: {address}")
-        id_data = self._call_attom("/property/id", params={"address": address})
+        id_data = self._call_attom("/property/id", params={"address": address}, force_refresh=force_refresh)
         status_code = self._safe_get(id_data, ["status", "code"])
         
         if status_code != 0:
@@ -64,135 +185,199 @@ class PropertyService:
         attom_id = self._safe_get(id_data, ["property", 0, "identifier", "attomId"])
         if not attom_id:
             raise ValueError("No attomId found in response")
+        self.address_index.put(address, attom_id)
+        return attom_id, "api"
+
+    def generate_report(self, address: str, force_refresh: bool = False) -> Dict[str, Any]:
+        # 1. Resolve ID
+        attom_id, id_source = self.resolve_attom_id(address, force_refresh=force_refresh)
 
         # 2. Fetch Details
         logger.info(f"Fetching details for ID: {attom_id}")
         
-        # We fetch these sequentially for simplicity, could be parallelized
-        try:
-            owner_data = self._call_attom("/property/detailowner", params={"id": attom_id})
-            detail_data = self._call_attom("/property/detail", params={"id": attom_id})
-            mort_data = self._call_attom("/property/detailmortgageowner", params={"id": attom_id})
-            avm_data = self._call_attom("/attomavm/detail", params={"id": attom_id})
-            assess_data = self._call_attom("/assessment/detail", params={"id": attom_id})
-            sales_data = self._call_attom("/sale/detail", params={"id": attom_id})
-        except Exception as e:
-            logger.error(f"Error fetching property details: {e}")
-            raise
+        # All detail endpoints at once over the shared session; report time is the slowest call
+        futures = {
+            section: self._executor.submit(self._fetch_section, endpoint, attom_id, force_refresh)
+            for section, (endpoint, _) in DETAIL_SECTIONS.items()
+        }
+        results = {section: future.result() for section, future in futures.items()}
 
-        # 3. Extract Data
+        errors = {section: error for section, (_, error, _) in results.items() if error}
+        if len(errors) == len(DETAIL_SECTIONS):
+            logger.error(f"Error fetching property details: {errors}")
+            raise Exception(f"Failed to fetch property details: {next(iter(errors.values()))}")
+
+        # 3. Extract Data (a failed endpoint leaves its section empty rather than failing the report)
         report = {
             "address": address,
+            "canonical_address": canonicalize_address(address),
             "attom_id": attom_id,
-            "owner": self._extract_owner(owner_data),
-            "profile": self._extract_profile(detail_data),
-            "mortgage": self._extract_mortgage(mort_data),
-            "valuation": self._extract_avm(avm_data),
-            "assessment": self._extract_assessment(assess_data),
-            "sale": self._extract_sale(sales_data),
+            "attom_id_source": id_source,
         }
+        for section, (_, extractor) in DETAIL_SECTIONS.items():
+            data, error, _ = results[section]
+            if error:
+                logger.warning(f"ATTOM {section} unavailable for {attom_id}: {error}")
+            report[section] = getattr(self, extractor)(data or {})
+        report["errors"] = errors
+        report["timings_ms"] = {section: elapsed for section, (_, _, elapsed) in results.items()}
 
         # 4. Computed Equity
-        val = report["valuation"].get("value")
-        mort_amt = report["mortgage"].get("amount")
+        report["equity"] = self._compute_equity(report["valuation"], report["mortgage"])
+
+        return report
+
+    @staticmethod
+    def _compute_equity(valuation: Dict[str, Any], mortgage: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        val = valuation.get("value")
+        mort_amt = mortgage.get("amount")
         
-        if val is not None and mort_amt is not None:
+        if val is None or mort_amt is None:
+            return None
+        try:
+            return {
+                "estimated_value": val - mort_amt,
+                "low": (valuation.get("low") or val) - mort_amt,
+                "high": (valuation.get("high") or val) - mort_amt
+            }
+        except (TypeError, ValueError):
+            return None
+
+    def iter_report(self, address: str, force_refresh: bool = False) -> Iterator[Dict[str, Any]]:
+        """
+        The report as a stream of sections, each yielded as soon as its endpoint answers.
+
+        Yields {"section", "status", "data" | "error", "elapsed_ms"} for:
+        attom_id first (a failure there ends the stream), then owner, profile,
+        mortgage, valuation, assessment and sale in completion order, equity as
+        soon as valuation and mortgage are both in, and finally "done" with the
+        overall status ("ok", "partial" or "error") and per-section errors.
+        """
+        start = time.perf_counter()
+
+        def elapsed() -> float:
+            return round((time.perf_counter() - start) * 1000, 1)
+
+        try:
+            attom_id, id_source = self.resolve_attom_id(address, force_refresh=force_refresh)
+        except Exception as e:
+            yield {"section": "attom_id", "status": "error", "error": str(e), "elapsed_ms": elapsed()}
+            yield {"section": "done", "status": "error", "errors": {"attom_id": str(e)}, "elapsed_ms": elapsed()}
+            return
+        yield {
+            "section": "attom_id",
+            "status": "ok",
+            "data": {"attom_id": attom_id, "source": id_source, "canonical_address": canonicalize_address(address)},
+            "elapsed_ms": elapsed(),
+        }
+
+        futures = {
+            self._executor.submit(self._fetch_section, endpoint, attom_id, force_refresh): section
+            for section, (endpoint, _) in DETAIL_SECTIONS.items()
+        }
+        sections: Dict[str, Dict[str, Any]] = {}
+        errors: Dict[str, str] = {}
+        for future in as_completed(futures):
+            section = futures[future]
+            data, error, fetch_ms = future.result()
+            extracted = getattr(self, DETAIL_SECTIONS[section][1])(data or {})
+            sections[section] = extracted
+            event: Dict[str, Any] = {"section": section, "status": "error" if error else "ok",
+                                     "data": extracted, "fetch_ms": fetch_ms, "elapsed_ms": elapsed()}
+            if error:
+                errors[section] = error
+                event["error"] = error
+            yield event
+
+            if section in ("valuation", "mortgage") and "valuation" in sections and "mortgage" in sections:
+                equity = self._compute_equity(sections["valuation"], sections["mortgage"])
+                yield {"section": "equity", "status": "ok" if equity else "unavailable",
+                       "data": equity, "elapsed_ms": elapsed()}
+
+        status = "ok" if not errors else ("error" if len(errors) == len(DETAIL_SECTIONS) else "partial")
+        yield {"section": "done", "status": status, "attom_id": attom_id, "errors": errors, "elapsed_ms": elapsed()}
+
+    def generate_reports(self, addresses: List[str], force_refresh: bool = False) -> Iterator[Dict[str, Any]]:
+        """
+        Reports for many addresses, yielded as each property completes.
+
+        Addresses that canonicalize to the same property are fetched once; each
+        input still gets its own result. Every ATTOM call goes through the shared
+        rate limiter, so a large batch is paced rather than throttled. Closing
+        the generator early cancels the properties not yet started.
+
+        Yields:
+            {index, address, success, report | error, duplicate_of?} per input address
+        """
+        groups: Dict[str, List[int]] = {}
+        for i, address in enumerate(addresses):
+            groups.setdefault(canonicalize_address(address) or address.strip(), []).append(i)
+        metrics.increment("attom.bulk_addresses", len(addresses))
+        metrics.increment("attom.bulk_duplicates", len(addresses) - len(groups))
+
+        def run(address: str) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
             try:
-                report["equity"] = {
-                    "estimated_value": val - mort_amt,
-                    "low": (report["valuation"].get("low") or val) - mort_amt,
-                    "high": (report["valuation"].get("high") or val) - mort_amt
-                }
-            except (TypeError, ValueError):
-                report["equity"] = None
-        else:
-            report["equity"] = None
+                return self.generate_report(address, force_refresh=force_refresh), None
+            except Exception as e:
+                logger.warning(f"Bulk property report failed for {address}: {e}")
+                return None, str(e)
 
-        return report
+        pool = ThreadPoolExecutor(max_workers=self.bulk_workers, thread_name_prefix="attom-bulk")
+        try:
+            futures = {pool.submit(run, addresses[indexes[0]]): indexes for indexes in groups.values()}
+            for future in as_completed(futures):
+                report, error = future.result()
+                indexes = futures[future]
+                for i in indexes:
+                    result: Dict[str, Any] = {"index": i, "address": addresses[i], "success": error is None}
+                    if error is None:
+                        result["report"] = report
+                    else:
+                        result["error"] = error
+                    if i != indexes[0]:
+                        result["duplicate_of"] = indexes[0]
+                    yield result
+        finally:
+            # Closed early (client disconnected): drop properties not yet started
+            # instead of blocking until every queued ATTOM call is made
+            pool.shutdown(wait=False, cancel_futures=True)
 
     def _extract_owner(self, json_data):
-        p = self._safe_get(json_data, ["property", 0], {})
-        o = self._safe_get(p, ["owner"], {}) or {}
-        
-        owner1 = self._safe_get(o, ["owner1", "fullname"])
-        owner2 = self._safe_get(o, ["owner2", "fullname"])
-        owners = [x for x in [owner1, owner2] if x]
+        o = extract_section("owner", json_data)
+        owners = [x for x in [o["owner1"], o["owner2"]] if x]
         
         return {
             "names": owners,
             "formatted_string": " & ".join(owners) if owners else "N/A",
-            "mailing_address": self._safe_get(o, ["mailingaddressoneline"]),
-            "is_corporate": self._safe_get(o, ["corporateindicator"]),
-            "is_absentee": self._safe_get(o, ["absenteeownerstatus"])
+            "mailing_address": o["mailing_address"],
+            "is_corporate": o["is_corporate"],
+            "is_absentee": o["is_absentee"]
         }
 
     def _extract_profile(self, json_data):
-        p = self._safe_get(json_data, ["property", 0], {})
-        summary = self._safe_get(p, ["summary"], {}) or {}
-        building = self._safe_get(p, ["building"], {}) or {}
-        size = self._safe_get(building, ["size"], {}) or {}
-        rooms = self._safe_get(building, ["rooms"], {}) or {}
-        lot = self._safe_get(p, ["lot"], {}) or {}
-
-        return {
-            "type": self._safe_get(summary, ["propertyType"]) or self._safe_get(summary, ["propclass"]),
-            "year_built": self._safe_get(summary, ["yearbuilt"]),
-            "beds": self._safe_get(rooms, ["beds"]),
-            "baths": self._safe_get(rooms, ["bathstotal"]),
-            "sqft": self._safe_get(size, ["livingsize"]) or self._safe_get(size, ["bldgsize"]),
-            "lot_acres": self._safe_get(lot, ["lotsize1"]),
-            "lot_sqft": self._safe_get(lot, ["lotsize2"]),
-            "pool": self._safe_get(lot, ["pooltype"])
-        }
+        return extract_section("profile", json_data)
 
     def _extract_mortgage(self, json_data):
-        p = self._safe_get(json_data, ["property", 0], {})
-        m = self._safe_get(p, ["mortgage"], {}) or {}
-        lender = self._safe_get(m, ["lender"], {}) or {}
-        title = self._safe_get(m, ["title"], {}) or {}
+        m = extract_section("mortgage", json_data)
 
         return {
-            "amount": self._safe_get(m, ["amount"]),
-            "date": self._safe_get(m, ["date"]),
-            "loan_type": self._safe_get(m, ["loantypecode"]),
-            "rate_type": self._safe_get(m, ["interestratetype"]),
+            "amount": m["amount"],
+            "date": m["date"],
+            "loan_type": m["loan_type"],
+            "rate_type": m["rate_type"],
             "lender": {
-                "name": self._safe_get(lender, ["lastname"]),
-                "city": self._safe_get(lender, ["city"]),
-                "state": self._safe_get(lender, ["state"])
+                "name": m["lender_name"],
+                "city": m["lender_city"],
+                "state": m["lender_state"]
             },
-            "title_company": self._safe_get(title, ["companyname"])
+            "title_company": m["title_company"]
         }
 
     def _extract_avm(self, json_data):
-        p = self._safe_get(json_data, ["property", 0], {})
-        avm = self._safe_get(p, ["avm"], {}) or {}
-        amt = self._safe_get(avm, ["amount"], {}) or {}
-
-        return {
-            "date": self._safe_get(avm, ["eventDate"]),
-            "value": self._safe_get(amt, ["value"]),
-            "low": self._safe_get(amt, ["low"]),
-            "high": self._safe_get(amt, ["high"]),
-            "confidence_score": self._safe_get(amt, ["scr"]),
-            "fsd": self._safe_get(amt, ["fsd"])
-        }
+        return extract_section("avm", json_data)
 
     def _extract_assessment(self, json_data):
-        p = self._safe_get(json_data, ["property", 0], {})
-        a = self._safe_get(p, ["assessment"], {}) or {}
-
-        return {
-            "assessed_value": self._safe_get(a, ["assessed", "assdTtlValue"]) or self._safe_get(a, ["assessedValue"]),
-            "tax_amount": self._safe_get(a, ["tax", "taxamt"]) or self._safe_get(a, ["taxAmount"]),
-            "tax_year": self._safe_get(a, ["tax", "taxyear"]) or self._safe_get(a, ["taxYear"])
-        }
+        return extract_section("assessment", json_data)
 
     def _extract_sale(self, json_data):
-        p = self._safe_get(json_data, ["property", 0], {})
-        sale = self._safe_get(p, ["sale"], {}) or {}
-
-        return {
-            "price": self._safe_get(sale, ["amount", "saleamt"]) or self._safe_get(sale, ["saleamt"]),
-            "date": self._safe_get(sale, ["saleTransDate"]) or self._safe_get(sale, ["salesearchdate"]) or self._safe_get(sale, ["date"])
-        }
+        return extract_section("sale", json_data)
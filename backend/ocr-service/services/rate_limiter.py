@@ -0,0 +1,77 @@
+"""
+Rate Limiting and Retry Backoff for Outbound API Calls
+
+TokenBucket paces requests to a provider's rate limit across every thread that
+shares it: tokens refill continuously at `rate` per second up to `burst`, and
+acquire() blocks until one is available. backoff_delay() gives the wait before
+retrying a throttled (429) or failed (5xx) call.
+"""
+import time
+import random
+import threading
+from typing import Optional
+
+# Status codes worth retrying: throttled or a transient upstream failure
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+
+class TokenBucket:
+    """Thread-safe token bucket; acquire() blocks until a request may be sent"""
+
+    def __init__(self, rate: float, burst: Optional[int] = None):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1, int(rate))
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+        self.waited_s = 0.0
+
+    def _refill_locked(self, now: float) -> None:
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """Take tokens, sleeping as needed; returns seconds waited"""
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill_locked(now)
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    self.waited_s += waited
+                    return waited
+                delay = (tokens - self._tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+    def try_acquire(self, tokens: float = 1.0) -> Optional[float]:
+        """Take tokens without waiting; None when taken, else seconds until they would be"""
+        with self._lock:
+            self._refill_locked(time.monotonic())
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return None
+            return (tokens - self._tokens) / self.rate
+
+    def penalize(self, seconds: float) -> None:
+        """Stop handing out tokens for a while (the provider said Retry-After)"""
+        with self._lock:
+            self._refill_locked(time.monotonic())
+            self._tokens = min(self._tokens, 0.0) - seconds * self.rate
+
+
+def backoff_delay(attempt: int, base: float = 0.5, cap: float = 30.0,
+                  retry_after: Optional[str] = None) -> float:
+    """
+    Seconds to wait before retry number `attempt` (0-based): the server's
+    Retry-After when it sent one, else capped exponential backoff with full jitter.
+    """
+    if retry_after:
+        try:
+            return min(cap, max(0.0, float(retry_after)))
+        except ValueError:
+            pass
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
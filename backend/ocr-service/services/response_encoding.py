@@ -0,0 +1,128 @@
+"""
+OCR Response Projection and Encoding
+
+Parses the client's `raw_ocr` options and serializes responses with the
+fastest available encoder, chosen from the request's Accept header:
+
+- application/msgpack (or application/x-msgpack) -> msgpack, if installed
+- anything else -> JSON via orjson, falling back to the stdlib json module
+"""
+import json
+import time
+import logging
+from typing import Any, Optional, Set
+
+from fastapi.responses import Response
+
+from services.metrics import metrics
+
+try:
+    import orjson
+except ImportError:  # optional speedup
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # optional binary encoding
+    msgpack = None
+
+logger = logging.getLogger(__name__)
+
+JSON_MEDIA_TYPE = "application/json"
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+MSGPACK_MEDIA_TYPES = (MSGPACK_MEDIA_TYPE, "application/x-msgpack")
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+SSE_MEDIA_TYPE = "text/event-stream"
+
+# Page filters are parsed before the document's page count is known, so pages
+# are capped at a fixed bound: "1-100000000" can't build a hundred-million-entry set
+MAX_FILTER_PAGE = 10000
+
+def parse_page_filter(spec: Optional[str]) -> Optional[Set[int]]:
+    """
+    Parse a 1-based page filter such as "1,3-5". Pages past MAX_FILTER_PAGE
+    are dropped; pages past the document's end simply match nothing.
+
+    Returns:
+        Set of page numbers, or None when no filter was given
+
+    Raises:
+        ValueError: If the spec is malformed
+    """
+    if spec is None or not spec.strip():
+        return None
+
+    pages: Set[int] = set()
+    for part in spec.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        if "-" in part:
+            start_str, end_str = part.split("-", 1)
+            start, end = int(start_str), int(end_str)
+            if start < 1 or end < start:
+                raise ValueError(f"Invalid page range: {part}")
+            pages.update(range(start, min(end, MAX_FILTER_PAGE) + 1))
+        else:
+            page = int(part)
+            if page < 1:
+                raise ValueError(f"Invalid page number: {part}")
+            if page <= MAX_FILTER_PAGE:
+                pages.add(page)
+    return pages
+
+
+def negotiate_media_type(accept: Optional[str]) -> str:
+    """Pick the response media type from an Accept header"""
+    if accept and msgpack is not None:
+        for media_range in accept.split(","):
+            media_type = media_range.split(";", 1)[0].strip().lower()
+            if media_type in MSGPACK_MEDIA_TYPES:
+                return MSGPACK_MEDIA_TYPE
+    return JSON_MEDIA_TYPE
+
+
+def _serialize(payload: Any, media_type: str) -> bytes:
+    if media_type == MSGPACK_MEDIA_TYPE:
+        return msgpack.packb(payload, use_bin_type=True, default=str)
+    if orjson is not None:
+        return orjson.dumps(payload, default=str)
+    return json.dumps(payload, separators=(",", ":"), default=str).encode("utf-8")
+
+
+def encode_response(payload: Any, accept: Optional[str], metric_prefix: str = "ocr") -> Response:
+    """
+    Serialize payload for the negotiated media type and record
+    serialization time and payload size in the service metrics.
+    """
+    media_type = negotiate_media_type(accept)
+
+    start = time.perf_counter()
+    body = _serialize(payload, media_type)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    encoding = "msgpack" if media_type == MSGPACK_MEDIA_TYPE else "json"
+    metrics.observe(f"{metric_prefix}.serialize_ms", elapsed_ms)
+    metrics.observe(f"{metric_prefix}.payload_bytes", len(body))
+    metrics.increment(f"{metric_prefix}.responses.{encoding}")
+    logger.debug(f"Serialized {len(body)} bytes as {encoding} in {elapsed_ms:.2f}ms")
+
+    return Response(
+        content=body,
+        media_type=media_type,
+        headers={
+            "X-Serialization-Ms": f"{elapsed_ms:.3f}",
+            "X-Payload-Bytes": str(len(body)),
+            "Vary": "Accept",
+        },
+    )
+
+
+def ndjson_line(payload: Any) -> bytes:
+    """One newline-terminated JSON record of a streamed (NDJSON) response"""
+    return _serialize(payload, JSON_MEDIA_TYPE) + b"\n"
+
+
+def sse_event(event: str, payload: Any) -> bytes:
+    """One server-sent event with a JSON data line"""
+    return b"event: " + event.encode("utf-8") + b"\ndata: " + _serialize(payload, JSON_MEDIA_TYPE) + b"\n\n"
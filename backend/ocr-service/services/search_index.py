@@ -0,0 +1,262 @@
+"""
+Full-Text Search over OCR Results
+
+Persists every OCR'd page into a local SQLite FTS5 index keyed by case and
+document, so questions like "which documents mention Midland" or "where's the
+401k loan" are answered from the index instead of re-running OCR.
+
+- pages: one row per page (case, document, page number), indexed by case and
+  by document so scoped searches and deletes touch only that case's pages
+- page_text: FTS5 over each page's text rebuilt in reading order, sharing the
+  rowid of its pages row
+- blocks: character span of each OCR block within its page text, with its box,
+  so highlight offsets map back to page coordinates
+
+Hits are ranked by bm25. The index lives at OCR_SEARCH_DB and outlives the
+in-memory document store.
+"""
+import os
+import time
+import sqlite3
+import threading
+from bisect import bisect_right
+from typing import Dict, List, Any, Optional, Tuple
+
+from services.metrics import metrics
+from services.ocr_document import OcrDocument
+from services.spatial_index import PageLayout
+
+DEFAULT_DB_PATH = "ocr-search.sqlite3"
+
+# Highlight spans returned per page hit
+MAX_HIGHLIGHTS = 20
+
+# Highlight markers; control characters never appear in OCR text
+MARK_START = "\x02"
+MARK_END = "\x03"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    document_id TEXT PRIMARY KEY,
+    case_id TEXT,
+    filename TEXT,
+    document_type TEXT,
+    page_count INTEGER,
+    indexed_at REAL
+);
+CREATE INDEX IF NOT EXISTS documents_case ON documents(case_id);
+CREATE TABLE IF NOT EXISTS pages (
+    id INTEGER PRIMARY KEY,
+    case_id TEXT,
+    document_id TEXT,
+    page INTEGER
+);
+CREATE INDEX IF NOT EXISTS pages_case ON pages(case_id);
+CREATE INDEX IF NOT EXISTS pages_document ON pages(document_id);
+CREATE VIRTUAL TABLE IF NOT EXISTS page_text USING fts5(
+    text,
+    tokenize = 'unicode61 remove_diacritics 2'
+);
+CREATE TABLE IF NOT EXISTS blocks (
+    document_id TEXT,
+    page INTEGER,
+    start INTEGER,
+    end INTEGER,
+    x0 INTEGER, y0 INTEGER, x1 INTEGER, y1 INTEGER
+);
+CREATE INDEX IF NOT EXISTS blocks_page ON blocks(document_id, page, start);
+"""
+
+
+def to_fts_query(text: str) -> str:
+    """
+    Turn user input into an FTS5 query: every word (or "quoted phrase") must
+    appear; a trailing * keeps prefix matching. FTS5 operators are not exposed.
+    """
+    terms: List[str] = []
+    parts = text.split('"')
+    for n, part in enumerate(parts):
+        if n % 2 == 1:
+            phrase = part.strip()
+            if phrase:
+                terms.append('"' + phrase.replace('"', "") + '"')
+            continue
+        for word in part.split():
+            prefix = word.endswith("*")
+            word = word.strip("*")
+            if word:
+                terms.append('"' + word + '"' + ("*" if prefix else ""))
+    return " ".join(terms)
+
+
+def _page_text(document: OcrDocument, page: int) -> Tuple[str, List[Tuple[int, int, Tuple[int, int, int, int]]]]:
+    """Reading-order page text plus (start, end, box) of every block in it"""
+    layout = PageLayout(document, page)
+    pieces: List[str] = []
+    spans = []
+    offset = 0
+    for line in layout.lines():
+        for n, i in enumerate(line):
+            if n:
+                pieces.append(" ")
+                offset += 1
+            text = document.texts[i]
+            spans.append((offset, offset + len(text), layout.boxes[i]))
+            pieces.append(text)
+            offset += len(text)
+        pieces.append("\n")
+        offset += 1
+    return "".join(pieces), spans
+
+
+def _marked_spans(marked: str) -> List[Tuple[int, int]]:
+    """(start, end) offsets in the unmarked text of every highlighted run"""
+    spans = []
+    offset = 0
+    start = None
+    for ch in marked:
+        if ch == MARK_START:
+            start = offset
+        elif ch == MARK_END:
+            if start is not None:
+                spans.append((start, offset))
+            start = None
+        else:
+            offset += 1
+    return spans
+
+
+class SearchIndex:
+    """SQLite FTS5 index of OCR'd pages"""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or os.getenv("OCR_SEARCH_DB", DEFAULT_DB_PATH)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(SCHEMA)
+
+    def index_document(self, document_id: str, ocr: OcrDocument, case_id: Optional[str] = None,
+                       filename: str = "", document_type: str = "unknown") -> int:
+        """
+        (Re)index every page of a document; returns the number of pages indexed.
+        """
+        start = time.perf_counter()
+        pages = []
+        for page in ocr.page_numbers():
+            text, spans = _page_text(ocr, page)
+            pages.append((page, text, spans))
+
+        with self._lock, self._conn:
+            self._delete_locked(document_id)
+            self._conn.execute(
+                "INSERT INTO documents VALUES (?, ?, ?, ?, ?, ?)",
+                (document_id, case_id, filename, document_type, ocr.page_count, time.time()),
+            )
+            for page, text, spans in pages:
+                rowid = self._conn.execute(
+                    "INSERT INTO pages (case_id, document_id, page) VALUES (?, ?, ?)",
+                    (case_id, document_id, page),
+                ).lastrowid
+                self._conn.execute("INSERT INTO page_text (rowid, text) VALUES (?, ?)", (rowid, text))
+                self._conn.executemany(
+                    "INSERT INTO blocks VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    [(document_id, page, s, e, *box) for s, e, box in spans],
+                )
+
+        metrics.observe("search.index_ms", (time.perf_counter() - start) * 1000)
+        metrics.increment("search.pages_indexed", len(pages))
+        return len(pages)
+
+    def delete_document(self, document_id: str) -> None:
+        with self._lock, self._conn:
+            self._delete_locked(document_id)
+
+    def search(self, query: str, case_id: Optional[str] = None, limit: int = 20) -> List[Dict[str, Any]]:
+        """
+        Ranked page hits for a query.
+
+        Returns:
+            [{document_id, filename, document_type, case_id, page, score, snippet,
+              highlights: [{start, end, text, bbox}]}], best first
+        """
+        fts_query = to_fts_query(query)
+        if not fts_query:
+            return []
+        start = time.perf_counter()
+
+        columns = (
+            "SELECT p.document_id, p.page, p.case_id, d.filename, d.document_type, "
+            "       bm25(page_text) AS rank, "
+            "       highlight(page_text, 0, ?, ?) AS marked, "
+            "       snippet(page_text, 0, '[', ']', '…', 12) AS snippet "
+        )
+        params: List[Any] = [MARK_START, MARK_END]
+        if case_id is not None:
+            # Drive from the case's pages (pages_case index) and match each by
+            # rowid, so a scoped search costs the case's size, not the corpus's
+            sql = columns + (
+                "FROM pages p CROSS JOIN page_text ON page_text.rowid = p.id "
+                "LEFT JOIN documents d ON d.document_id = p.document_id "
+                "WHERE p.case_id = ? AND page_text MATCH ?"
+            )
+            params += [case_id, fts_query]
+        else:
+            sql = columns + (
+                "FROM page_text JOIN pages p ON p.id = page_text.rowid "
+                "LEFT JOIN documents d ON d.document_id = p.document_id "
+                "WHERE page_text MATCH ?"
+            )
+            params.append(fts_query)
+        sql += " ORDER BY rank LIMIT ?"
+        params.append(limit)
+
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+            hits = [self._hit_locked(row) for row in rows]
+
+        metrics.observe("search.query_ms", (time.perf_counter() - start) * 1000)
+        return hits
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            documents = self._conn.execute("SELECT COUNT(*) FROM documents").fetchone()[0]
+            cases = self._conn.execute("SELECT COUNT(DISTINCT case_id) FROM documents").fetchone()[0]
+        return {"documents": documents, "cases": cases, "path": self.path}
+
+    # -- internals -----------------------------------------------------------
+
+    def _delete_locked(self, document_id: str) -> None:
+        self._conn.execute(
+            "DELETE FROM page_text WHERE rowid IN (SELECT id FROM pages WHERE document_id = ?)", (document_id,))
+        self._conn.execute("DELETE FROM pages WHERE document_id = ?", (document_id,))
+        self._conn.execute("DELETE FROM blocks WHERE document_id = ?", (document_id,))
+        self._conn.execute("DELETE FROM documents WHERE document_id = ?", (document_id,))
+
+    def _hit_locked(self, row: sqlite3.Row) -> Dict[str, Any]:
+        marked = row["marked"]
+        plain = marked.replace(MARK_START, "").replace(MARK_END, "")
+        blocks = self._conn.execute(
+            "SELECT start, end, x0, y0, x1, y1 FROM blocks WHERE document_id = ? AND page = ? ORDER BY start",
+            (row["document_id"], row["page"]),
+        ).fetchall()
+        starts = [block["start"] for block in blocks]
+
+        highlights = []
+        for s, e in _marked_spans(marked)[:MAX_HIGHLIGHTS]:
+            n = bisect_right(starts, s) - 1
+            bbox = [blocks[n]["x0"], blocks[n]["y0"], blocks[n]["x1"], blocks[n]["y1"]] if n >= 0 else None
+            highlights.append({"start": s, "end": e, "text": plain[s:e], "bbox": bbox})
+
+        return {
+            "document_id": row["document_id"],
+            "filename": row["filename"],
+            "document_type": row["document_type"],
+            "case_id": row["case_id"],
+            "page": row["page"],
+            "score": round(-row["rank"], 4),  # bm25 is lower-is-better
+            "snippet": row["snippet"],
+            "highlights": highlights,
+        }
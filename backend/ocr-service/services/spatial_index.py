@@ -0,0 +1,217 @@
+"""
+Spatial Index over OCR Text Blocks
+
+Buckets each page's blocks into a uniform grid (cell size derived from the
+median line height) so parsers can ask geometric questions without scanning
+the page:
+
+- the nearest block to the right of / below a label that matches a pattern
+- the block where a row label and a column header intersect (current vs YTD)
+- reading-order lines and column spans rebuilt from box geometry
+
+Detection order from the OCR engine interleaves columns on dense statements;
+pairing labels with values by geometry avoids reading the wrong amount.
+"""
+import re
+from statistics import median
+from typing import Dict, List, Optional, Pattern, Sequence, Tuple
+
+from services.ocr_document import OcrDocument
+
+Box = Tuple[int, int, int, int]
+
+
+def _vertical_overlap(a: Box, b: Box) -> float:
+    """Shared height as a fraction of the shorter box"""
+    shared = min(a[3], b[3]) - max(a[1], b[1])
+    shortest = min(a[3] - a[1], b[3] - b[1]) or 1
+    return max(0, shared) / shortest
+
+
+def _horizontal_overlap(a: Box, b: Box) -> float:
+    """Shared width as a fraction of the narrower box"""
+    shared = min(a[2], b[2]) - max(a[0], b[0])
+    narrowest = min(a[2] - a[0], b[2] - b[0]) or 1
+    return max(0, shared) / narrowest
+
+
+class PageLayout:
+    """Grid index over one page's blocks"""
+
+    def __init__(self, document: OcrDocument, page: int):
+        self.document = document
+        self.page = page
+        self.indices = list(document.page_range(page))
+        self.boxes: Dict[int, Box] = {i: document.box(i) for i in self.indices}
+
+        heights = [box[3] - box[1] for box in self.boxes.values() if box[3] > box[1]]
+        self.cell_size = max(8, int(median(heights) * 2)) if heights else 32
+
+        self.grid: Dict[Tuple[int, int], List[int]] = {}
+        self.max_cx = 0
+        for i, (x0, y0, x1, y1) in self.boxes.items():
+            for cx in range(x0 // self.cell_size, x1 // self.cell_size + 1):
+                for cy in range(y0 // self.cell_size, y1 // self.cell_size + 1):
+                    self.grid.setdefault((cx, cy), []).append(i)
+            self.max_cx = max(self.max_cx, x1 // self.cell_size)
+        self.max_cy = max((y1 // self.cell_size for _, _, _, y1 in self.boxes.values()), default=0)
+
+        self._lines: Optional[List[List[int]]] = None
+        self._line_of: Dict[int, int] = {}
+
+    def right_of(self, index: int, pattern: Optional[Pattern] = None) -> Optional[int]:
+        """Nearest block on the same line to the right of `index` (optionally matching pattern)"""
+        label = self.boxes[index]
+        texts = self.document.texts
+        rows = range(label[1] // self.cell_size, label[3] // self.cell_size + 1)
+        best, best_gap = None, None
+        for cx in range(label[2] // self.cell_size, self.max_cx + 1):
+            # Candidates further right cannot beat a hit found in an earlier column of cells
+            if best_gap is not None and cx * self.cell_size - label[2] > best_gap:
+                break
+            for cy in rows:
+                for i in self.grid.get((cx, cy), ()):
+                    box = self.boxes[i]
+                    if i == index or box[0] < label[2] - self.cell_size // 2:
+                        continue
+                    if _vertical_overlap(label, box) < 0.5:
+                        continue
+                    if pattern is not None and not pattern.search(texts[i]):
+                        continue
+                    gap = box[0] - label[2]
+                    if best_gap is None or gap < best_gap:
+                        best, best_gap = i, gap
+        return best
+
+    def below(self, index: int, pattern: Optional[Pattern] = None, max_rows: int = 3) -> Optional[int]:
+        """Nearest block under `index` that shares its horizontal span (within max_rows cells)"""
+        label = self.boxes[index]
+        texts = self.document.texts
+        columns = range(label[0] // self.cell_size, label[2] // self.cell_size + 1)
+        first_row = label[3] // self.cell_size
+        best, best_gap = None, None
+        for cy in range(first_row, min(first_row + max_rows, self.max_cy) + 1):
+            if best_gap is not None and cy * self.cell_size - label[3] > best_gap:
+                break
+            for cx in columns:
+                for i in self.grid.get((cx, cy), ()):
+                    box = self.boxes[i]
+                    if i == index or box[1] < label[3] - self.cell_size // 4:
+                        continue
+                    if _horizontal_overlap(label, box) <= 0:
+                        continue
+                    if pattern is not None and not pattern.search(texts[i]):
+                        continue
+                    gap = box[1] - label[3]
+                    if best_gap is None or gap < best_gap:
+                        best, best_gap = i, gap
+        return best
+
+    def lines(self) -> List[List[int]]:
+        """Blocks grouped into visual lines (top to bottom), each sorted left to right"""
+        if self._lines is None:
+            ordered = sorted(self.indices, key=lambda i: (self.boxes[i][1] + self.boxes[i][3]) / 2)
+            lines: List[List[int]] = []
+            line_box: Optional[Box] = None
+            for i in ordered:
+                box = self.boxes[i]
+                if line_box is not None and _vertical_overlap(line_box, box) >= 0.5:
+                    lines[-1].append(i)
+                    line_box = (line_box[0], min(line_box[1], box[1]), line_box[2], max(line_box[3], box[3]))
+                else:
+                    lines.append([i])
+                    line_box = box
+            self._lines = [sorted(line, key=lambda i: self.boxes[i][0]) for line in lines]
+            self._line_of = {i: n for n, line in enumerate(self._lines) for i in line}
+        return self._lines
+
+    def line_of(self, index: int) -> List[int]:
+        """The visual line containing a block"""
+        lines = self.lines()
+        return lines[self._line_of[index]] if index in self._line_of else [index]
+
+    def columns(self, min_gap: Optional[int] = None) -> List[Tuple[int, int]]:
+        """x-spans of text columns, split where no block covers a gap of at least min_gap"""
+        gap = min_gap if min_gap is not None else self.cell_size
+        spans = sorted((box[0], box[2]) for box in self.boxes.values())
+        columns: List[Tuple[int, int]] = []
+        for x0, x1 in spans:
+            if columns and x0 - columns[-1][1] < gap:
+                columns[-1] = (columns[-1][0], max(columns[-1][1], x1))
+            else:
+                columns.append((x0, x1))
+        return columns
+
+    def text(self) -> str:
+        """Page text in reading order: one line per visual line"""
+        texts = self.document.texts
+        return "\n".join(" ".join(texts[i] for i in line) for line in self.lines())
+
+
+class SpatialIndex:
+    """Per-page grid indexes for a whole OcrDocument"""
+
+    def __init__(self, document: OcrDocument):
+        self.document = document
+        self.pages: Dict[int, PageLayout] = {
+            page: PageLayout(document, page) for page in document.page_numbers()
+        }
+        self._folded = [text.casefold() for text in document.texts]
+
+    def add_page(self, page: int) -> None:
+        """Index a page appended to the document after this index was built"""
+        self.pages[page] = PageLayout(self.document, page)
+        texts = self.document.texts
+        self._folded.extend(text.casefold() for text in texts[len(self._folded):])
+
+    def reading_order_text(self) -> str:
+        """Document text rebuilt line by line from geometry"""
+        return "\n".join(layout.text() for layout in self.pages.values())
+
+    def find_labels(self, keywords: Sequence[str]) -> List[Tuple[int, int]]:
+        """(block index, end offset of keyword) for blocks containing any keyword, in keyword priority order"""
+        hits = []
+        for keyword in keywords:
+            for i, text in enumerate(self._folded):
+                position = text.find(keyword)
+                if position >= 0:
+                    hits.append((i, position + len(keyword)))
+        return hits
+
+    def value_for_label(self, keywords: Sequence[str], pattern: Pattern) -> Optional[re.Match]:
+        """
+        Value paired with the first label found: inline after the label, else the
+        nearest matching block to the right, else the nearest one below.
+        """
+        texts = self.document.texts
+        for index, label_end in self.find_labels(keywords):
+            match = pattern.search(texts[index], label_end)
+            if match:
+                return match
+            layout = self.pages[self.document.pages[index]]
+            neighbor = layout.right_of(index, pattern)
+            if neighbor is None:
+                neighbor = layout.below(index, pattern)
+            if neighbor is not None:
+                return pattern.search(texts[neighbor])
+        return None
+
+    def cell(self, row_keywords: Sequence[str], column_keywords: Sequence[str],
+             pattern: Pattern) -> Optional[re.Match]:
+        """Value on a row label's line that sits under a column header (e.g. Gross Pay x YTD)"""
+        texts = self.document.texts
+        headers = self.find_labels(column_keywords)
+        for row_index, _ in self.find_labels(row_keywords):
+            page = self.document.pages[row_index]
+            layout = self.pages[page]
+            for header_index, _ in headers:
+                if self.document.pages[header_index] != page:
+                    continue
+                header_box = layout.boxes[header_index]
+                for i in layout.line_of(row_index):
+                    if i == row_index or _horizontal_overlap(header_box, layout.boxes[i]) <= 0:
+                        continue
+                    match = pattern.search(texts[i])
+                    if match:
+                        return match
+        return None
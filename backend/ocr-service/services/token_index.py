@@ -0,0 +1,99 @@
+"""
+Normalized Token Index over OCR Results
+
+Built once per OCR result and cached with it in the document store. Every
+amount, date and word token is normalized and mapped back to the text block
+(and therefore page and box) it came from, so checking any number of candidate
+values is a handful of hash probes instead of rescanning the document text.
+"""
+from array import array
+from typing import Dict, List, Any, Tuple
+
+from services.ocr_document import OcrDocument
+from services.value_normalization import (
+    AMOUNT_PATTERN, TOKEN_PATTERN, iter_dates, normalize_currency,
+)
+
+# Token sequences up to this length are indexed directly; longer needles
+# probe their first n-gram and verify the remainder
+MAX_NGRAM = 4
+
+
+class IndexHit:
+    """Where a normalized value occurs: source text plus block index"""
+
+    __slots__ = ("source", "block")
+
+    def __init__(self, source: str, block: int):
+        self.source = source
+        self.block = block
+
+
+class TokenIndex:
+    """Hash index from normalized values to the OCR blocks they came from"""
+
+    def __init__(self, document: OcrDocument):
+        self.document = document
+        self.amounts: Dict[int, List[IndexHit]] = {}
+        self.dates: Dict[str, List[IndexHit]] = {}
+        self.ngrams: Dict[Tuple[str, ...], List[int]] = {}
+        self.tokens: List[str] = []
+        self.token_blocks = array("I")  # token position -> block index
+        self._build()
+
+    def _build(self) -> None:
+        tokens = self.tokens
+        for block, text in enumerate(self.document.texts):
+            for match in AMOUNT_PATTERN.finditer(text):
+                cents = normalize_currency(match.group(0))
+                if cents is not None:
+                    self.amounts.setdefault(cents, []).append(IndexHit(match.group(0).strip(), block))
+            for iso, source in iter_dates(text):
+                self.dates.setdefault(iso, []).append(IndexHit(source, block))
+            for token in TOKEN_PATTERN.findall(text.casefold()):
+                tokens.append(token)
+                self.token_blocks.append(block)
+
+        # Token positions run across block boundaries so a name split over two
+        # detected lines is still one sequence
+        for start in range(len(tokens)):
+            for width in range(1, MAX_NGRAM + 1):
+                if start + width > len(tokens):
+                    break
+                self.ngrams.setdefault(tuple(tokens[start:start + width]), []).append(start)
+
+    # ------------------------------------------------------------------
+    # Lookups
+    # ------------------------------------------------------------------
+
+    def find_amount(self, cents: int) -> List[IndexHit]:
+        return self.amounts.get(cents, [])
+
+    def find_date(self, iso: str) -> List[IndexHit]:
+        return self.dates.get(iso, [])
+
+    def find_tokens(self, needle: Tuple[str, ...]) -> List[List[int]]:
+        """
+        Occurrences of a token sequence.
+
+        Returns:
+            One list of block indices per occurrence (a sequence may span blocks)
+        """
+        if not needle:
+            return []
+        starts = self.ngrams.get(needle[:MAX_NGRAM], [])
+        width = len(needle)
+        occurrences = []
+        for start in starts:
+            if width > MAX_NGRAM and tuple(self.tokens[start:start + width]) != needle:
+                continue
+            blocks = sorted(set(self.token_blocks[start:start + width]))
+            occurrences.append(blocks)
+        return occurrences
+
+    def locations(self, blocks: List[int]) -> List[Dict[str, Any]]:
+        """Page and axis-aligned box for each block index"""
+        return [
+            {"page": self.document.pages[b], "bbox": list(self.document.box(b))}
+            for b in blocks
+        ]
@@ -0,0 +1,89 @@
+"""
+Value Normalization
+
+Type-aware normalizers shared by field validation and the token index:
+
+- currency -> integer cents ("$1,234.5" == "1234.50")
+- date -> ISO form ("01/05/24" == "Jan 5, 2024")
+- name / text -> case-folded token sequences
+"""
+import re
+from datetime import date
+from decimal import Decimal, InvalidOperation
+from typing import Optional, Tuple, Iterator
+
+AMOUNT_PATTERN = re.compile(r'(?<![\w./-])\(?-?\$?\s?\d[\d,]*(?:\.\d{1,2})?\)?(?!\.?\d)(?![\w/-])')
+TOKEN_PATTERN = re.compile(r'[^\W_]+')
+
+MONTHS = {
+    "jan": 1, "feb": 2, "mar": 3, "apr": 4, "may": 5, "jun": 6,
+    "jul": 7, "aug": 8, "sep": 9, "oct": 10, "nov": 11, "dec": 12,
+}
+
+NUMERIC_DATE_PATTERN = re.compile(r'\b(\d{1,2})[/-](\d{1,2})[/-](\d{4}|\d{2})\b')
+ISO_DATE_PATTERN = re.compile(r'\b(\d{4})-(\d{1,2})-(\d{1,2})\b')
+MONTH_DATE_PATTERN = re.compile(
+    r'\b(jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\.?\s+(\d{1,2}),?\s+(\d{4})\b',
+    re.IGNORECASE
+)
+
+
+# ---------------------------------------------------------------------------
+# Normalizers
+# ---------------------------------------------------------------------------
+
+def normalize_currency(value: str) -> Optional[int]:
+    """Parse a currency string into integer cents, or None if it is not an amount"""
+    s = value.strip()
+    negative = s.startswith("-") or (s.startswith("(") and s.endswith(")"))
+    s = s.strip("()-").replace("$", "").replace(",", "").replace(" ", "")
+    if not re.fullmatch(r'\d+(?:\.\d{1,2})?|\.\d{1,2}', s):
+        return None
+    try:
+        cents = int((Decimal(s) * 100).to_integral_value())
+    except InvalidOperation:
+        return None
+    return -cents if negative else cents
+
+
+def expand_year(year: int) -> int:
+    """Four-digit year for a two-digit one (00-69 -> 2000s, 70-99 -> 1900s)"""
+    if year < 100:
+        year += 2000 if year < 70 else 1900
+    return year
+
+
+def _to_iso(year: int, month: int, day: int) -> Optional[str]:
+    year = expand_year(year)
+    try:
+        return date(year, month, day).isoformat()
+    except ValueError:
+        return None
+
+
+def iter_dates(text: str) -> Iterator[Tuple[str, str]]:
+    """Yield (iso_date, source_text) for every recognizable date in text"""
+    for match in NUMERIC_DATE_PATTERN.finditer(text):
+        iso = _to_iso(int(match.group(3)), int(match.group(1)), int(match.group(2)))
+        if iso:
+            yield iso, match.group(0)
+    for match in ISO_DATE_PATTERN.finditer(text):
+        iso = _to_iso(int(match.group(1)), int(match.group(2)), int(match.group(3)))
+        if iso:
+            yield iso, match.group(0)
+    for match in MONTH_DATE_PATTERN.finditer(text):
+        iso = _to_iso(int(match.group(3)), MONTHS[match.group(1).lower()], int(match.group(2)))
+        if iso:
+            yield iso, match.group(0)
+
+
+def normalize_date(value: str) -> Optional[str]:
+    """Parse a date string into ISO form (YYYY-MM-DD), or None"""
+    for iso, _ in iter_dates(value.strip()):
+        return iso
+    return None
+
+
+def normalize_tokens(value: str) -> Tuple[str, ...]:
+    """Case-folded word tokens, punctuation dropped"""
+    return tuple(TOKEN_PATTERN.findall(value.casefold()))
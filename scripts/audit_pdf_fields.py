@@ -7,20 +7,92 @@ Reads a fillable (or filled) PDF and reports:
   - Every empty field
   - Coverage percentage
   - Per-page breakdown
+  - Which official form(s) it holds, and each form's required-field check
+
+Forms are recognised from the field inventories in docs/form-fields/*.json and
+checked against the required fields in docs/form-requirements/*.json. A packet
+of several forms is split into one section per form and every section is
+scored in the same pass.
+
+Given a directory, a glob or several PDFs it audits them all on a process
+pool and writes one aggregate report (a row per form found) as JSON or CSV.
 
 Usage:
-  python3 audit_pdf_fields.py <path_to_pdf>
+  python3 audit_pdf_fields.py <path_to_pdf> [--json]
+  python3 audit_pdf_fields.py <dir|glob|pdf>... [--workers N] [--out report.json|report.csv]
 
 Example:
   python3 audit_pdf_fields.py Official-Form-101-Nicholas-Wallace-2026-02-17.pdf
+  python3 audit_pdf_fields.py filing-packet.pdf
+  python3 audit_pdf_fields.py out/petitions/ --out audit-2026-02-17.csv
+  python3 audit_pdf_fields.py "out/**/Official-Form-101-*.pdf" --workers 8 --json
 """
 
+import os
 import sys
+import csv
+import glob
 import json
+import argparse
+from concurrent.futures import ProcessPoolExecutor
 from pypdf import PdfReader
 
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SPEC_DIR = os.path.join(REPO_ROOT, "docs", "form-fields")
+RULES_DIR = os.path.join(REPO_ROOT, "docs", "form-requirements")
 
-def audit_pdf(path: str, output_json: bool = False):
+# Resolve field type to human-readable
+TYPE_MAP = {"/Tx": "text", "/Btn": "checkbox", "/Ch": "dropdown"}
+
+# Field inventory (docs/form-fields/<key>.json) -> official form name
+FORM_LABELS = {
+    "b101": "B101",
+    "form_b_101_0624_fillable_clean": "B101",
+    "form_b106ab": "B106A/B",
+    "b_106c_0425-form": "B106C",
+    "form_b106d": "B106D",
+    "b_122a-1": "B122A-1",
+    "form_b122a-1supp": "B122A-1Supp",
+    "b_122a-2_0425-form": "B122A-2",
+    "form_b122c-1": "B122C-1",
+    "b_122c-2_0425-form": "B122C-2",
+}
+
+# Columns of the aggregate report (failed_checks is ";"-joined in CSV)
+REPORT_FIELDS = [
+    "file", "form", "first_page", "last_page", "total_fields", "filled_count", "empty_count",
+    "coverage_pct", "unknown_fields", "critical_passed", "critical_total", "court_fileable",
+    "failed_checks", "error",
+]
+
+
+def _resolve_widget(obj) -> tuple:
+    """
+    (qualified name, field type, value) of a widget. Name parts, /FT and /V
+    are inherited from parent fields, so radio options and multi-widget text
+    fields resolve to the field the form specs list. A checkbox or radio
+    widget's own appearance state (/AS) says whether that option is on.
+    """
+    parts = []
+    field_type = None
+    value = None
+    node = obj
+    while node is not None:
+        if "/T" in node:
+            parts.append(str(node["/T"]))
+        if field_type is None and "/FT" in node:
+            field_type = str(node["/FT"])
+        if value is None and "/V" in node:
+            value = node["/V"]
+        parent = node.get("/Parent")
+        node = parent.get_object() if parent is not None else None
+    if field_type == "/Btn" and "/AS" in obj:
+        value = obj["/AS"]
+    return ".".join(reversed(parts)), field_type, value
+
+
+def read_fields(path: str) -> dict:
+    """Every widget of a PDF, split into filled and empty, with per-page counts"""
     reader = PdfReader(path)
     filled = []
     empty = []
@@ -35,13 +107,12 @@ def audit_pdf(path: str, output_json: bool = False):
 
         for annot in page["/Annots"]:
             obj = annot.get_object()
-            field_name = str(obj.get("/T", "")) or "(unnamed)"
-            field_type = str(obj.get("/FT", ""))
-            value = obj.get("/V", None)
+            if obj.get("/Subtype") != "/Widget":
+                continue
+            field_name, field_type, value = _resolve_widget(obj)
+            field_name = field_name or "(unnamed)"
 
-            # Resolve field type to human-readable
-            type_map = {"/Tx": "text", "/Btn": "checkbox", "/Ch": "dropdown"}
-            friendly_type = type_map.get(field_type, field_type or "unknown")
+            friendly_type = TYPE_MAP.get(field_type, field_type or "unknown")
 
             # Check if field has a meaningful value
             has_value = (
@@ -64,6 +135,183 @@ def audit_pdf(path: str, output_json: bool = False):
                 empty.append(entry)
                 page_stats[p]["empty"] += 1
 
+    return {"pages": len(reader.pages), "filled": filled, "empty": empty, "per_page": page_stats}
+
+
+# ---------------------------------------------------------------------------
+# Form specs and required-field rules
+# ---------------------------------------------------------------------------
+
+class FormSpec:
+    """One official form: its field names and required-field checks, compiled to lookups"""
+
+    def __init__(self, key: str, source: str, fields: frozenset):
+        self.key = key
+        self.label = FORM_LABELS.get(key, key)
+        self.source = source
+        self.fields = fields
+        self.checks = []        # labels, in rule-file order
+        self.check_index = {}   # field name -> [check #] it satisfies
+
+    def add_check(self, label: str, names: list) -> None:
+        n = len(self.checks)
+        self.checks.append(label)
+        for name in names:
+            self.check_index.setdefault(name, []).append(n)
+
+    def evaluate(self, filled_names: set) -> list:
+        """[(label, passed)]: one hash lookup per filled field"""
+        passed = [False] * len(self.checks)
+        for name in filled_names:
+            for n in self.check_index.get(name, ()):
+                passed[n] = True
+        return list(zip(self.checks, passed))
+
+
+class FormCatalog:
+    """
+    Every form spec plus an inverted index field name -> forms that have it,
+    built once and used to tell which form each page belongs to.
+    """
+
+    def __init__(self, spec_dir: str = SPEC_DIR, rules_dir: str = RULES_DIR):
+        self.forms = {}
+        self.by_source = {}
+        seen = {}
+        for path in sorted(glob.glob(os.path.join(spec_dir, "*.json"))):
+            with open(path, encoding="utf-8") as f:
+                spec = json.load(f)
+            entries = spec.get("fields") if isinstance(spec, dict) else None
+            # Only the inspect-pdf-form-json.mjs dumps; manifests and position dumps key on pdfName
+            if not entries or "name" not in entries[0]:
+                continue
+            fields = frozenset(e["name"] for e in entries)
+            source = spec.get("source") or os.path.basename(path)
+            if fields in seen:
+                # Same template under another file name (e.g. b101.pdf and its fillable_clean copy)
+                self.by_source[source] = seen[fields]
+                continue
+            form = FormSpec(os.path.splitext(os.path.basename(path))[0], source, fields)
+            self.forms[form.key] = form
+            self.by_source[source] = form
+            seen[fields] = form
+
+        for path in sorted(glob.glob(os.path.join(rules_dir, "*.json"))):
+            with open(path, encoding="utf-8") as f:
+                rules = json.load(f)
+            if not isinstance(rules, dict) or "sections" not in rules:
+                continue
+            form = self.by_source.get(rules.get("templateSource"))
+            if form is None:
+                print(f"warning: {path}: no field spec for {rules.get('templateSource')}", file=sys.stderr)
+                continue
+            for section in rules["sections"]:
+                if not section.get("required", True):
+                    continue
+                for field in section.get("logicalFields", []):
+                    if field.get("required") and field.get("pdfNames"):
+                        form.add_check(field.get("notes") or field["id"], field["pdfNames"])
+
+        owners = {}
+        for form in self.forms.values():
+            for name in form.fields:
+                owners.setdefault(name, []).append(form.key)
+        # A name shared by k forms ("Case number", "Debtor 1") is worth 1/k of a vote
+        self.weights = {name: (keys, 1.0 / len(keys)) for name, keys in owners.items()}
+
+    def detect(self, names: set, current: str = None):
+        """
+        Form a page's field names point to. Returns (form key or None, decisive):
+        not decisive when the page has no fields or only names many forms share,
+        so it reads as a continuation of the form before it. A tie keeps the
+        current form (a signature page two forms share stays with its form).
+        """
+        votes = {}
+        known = False
+        for name in names:
+            hit = self.weights.get(name)
+            if hit is None:
+                continue
+            known = True
+            keys, weight = hit
+            for key in keys:
+                votes[key] = votes.get(key, 0.0) + weight
+        if votes:
+            key = max(votes, key=votes.get)
+            if current in votes and votes[current] == votes[key]:
+                key = current
+            if votes[key] >= 1.0:
+                return key, True
+        # Fields no spec knows: a form without an inventory (e.g. the BB intake packet)
+        return None, bool(names) and not known
+
+    def split(self, fields: dict) -> list:
+        """[(form key or None, first page, last page)] for consecutive pages of one form"""
+        names_by_page = {}
+        for entry in fields["filled"] + fields["empty"]:
+            names_by_page.setdefault(entry["page"], set()).add(entry["name"])
+        sections = []
+        for p in range(1, fields["pages"] + 1):
+            key, decisive = self.detect(names_by_page.get(p, set()), sections[-1][0] if sections else None)
+            if sections and (not decisive or key == sections[-1][0]):
+                sections[-1][2] = p
+            else:
+                sections.append([key, p, p])
+        return [tuple(s) for s in sections]
+
+    def score(self, fields: dict) -> list:
+        """One result per form section: coverage, fields outside the spec, required-field checks"""
+        results = []
+        for key, first, last in self.split(fields):
+            form = self.forms.get(key)
+            filled = [f for f in fields["filled"] if first <= f["page"] <= last]
+            empty = [f for f in fields["empty"] if first <= f["page"] <= last]
+            total = len(filled) + len(empty)
+            names = {f["name"] for f in filled} | {f["name"] for f in empty}
+            checks = form.evaluate({f["name"] for f in filled}) if form else []
+            passed = sum(1 for _, ok in checks if ok)
+            results.append({
+                "form": form.label if form else None,
+                "spec": key,
+                "first_page": first,
+                "last_page": last,
+                "total_fields": total,
+                "filled_count": len(filled),
+                "empty_count": len(empty),
+                "coverage_pct": round(len(filled) / total * 100, 1) if total else 0,
+                "unknown_fields": len(names - form.fields) if form else len(names),
+                "critical_passed": passed,
+                "critical_total": len(checks),
+                # None: no required-field rules for this form
+                "court_fileable": passed == len(checks) if checks else None,
+                "checks": checks,
+            })
+        return results
+
+
+_CATALOG = None
+
+
+def get_catalog() -> FormCatalog:
+    global _CATALOG
+    if _CATALOG is None:
+        _CATALOG = FormCatalog()
+    return _CATALOG
+
+
+def _set_catalog(catalog: FormCatalog) -> None:
+    """Worker initializer: the parent's compiled catalog, so workers don't re-read the specs"""
+    global _CATALOG
+    _CATALOG = catalog
+
+
+def audit_pdf(path: str, output_json: bool = False):
+    fields = read_fields(path)
+    filled = fields["filled"]
+    empty = fields["empty"]
+    page_stats = fields["per_page"]
+    forms = get_catalog().score(fields)
+
     total = len(filled) + len(empty)
     pct = (len(filled) / total * 100) if total > 0 else 0
 
@@ -77,6 +325,8 @@ def audit_pdf(path: str, output_json: bool = False):
             "filled": filled,
             "empty": empty,
             "per_page": page_stats,
+            "forms": [{**f, "checks": [{"label": label, "passed": ok} for label, ok in f["checks"]]}
+                      for f in forms],
         }, indent=2))
         return
 
@@ -84,11 +334,19 @@ def audit_pdf(path: str, output_json: bool = False):
     print(f"{'='*70}")
     print(f"PDF FORM AUDIT: {path}")
     print(f"{'='*70}")
-    print(f"Pages: {len(reader.pages)}")
+    print(f"Pages: {fields['pages']}")
     print(f"Total fields: {total}")
     print(f"Filled: {len(filled)}  |  Empty: {len(empty)}  |  Coverage: {pct:.1f}%")
     print()
 
+    # Forms found
+    print(f"{'FORM':<12}  {'PAGES':>7}  {'FILLED':>6}  {'EMPTY':>5}  {'COVERAGE':>8}")
+    for f in forms:
+        span = f"{f['first_page']}-{f['last_page']}"
+        print(f"{f['form'] or '(unknown)':<12}  {span:>7}  {f['filled_count']:>6}  {f['empty_count']:>5}"
+              f"  {f['coverage_pct']:>7.1f}%")
+    print()
+
     # Per-page summary
     print(f"{'PAGE':>4}  {'FILLED':>6}  {'EMPTY':>5}  {'COVERAGE':>8}")
     print(f"{'----':>4}  {'------':>6}  {'-----':>5}  {'--------':>8}")
@@ -122,53 +380,169 @@ def audit_pdf(path: str, output_json: bool = False):
     if unnamed_count > 0:
         print(f"\n  + {unnamed_count} unnamed checkbox/button fields (mapped by position)")
 
-    # Critical missing fields check (B101-specific)
-    print(f"\n{'='*70}")
-    print("B101 CRITICAL FIELD CHECK")
-    print(f"{'='*70}")
+    # Required fields per form found (rules from docs/form-requirements)
+    for f in forms:
+        print(f"\n{'='*70}")
+        print(f"{f['form'] or 'UNRECOGNIZED FORM'} REQUIRED FIELD CHECK (pages {f['first_page']}-{f['last_page']})")
+        print(f"{'='*70}")
+        if f["form"] is None:
+            print("  No field spec in docs/form-fields matches these pages")
+            continue
+        if not f["checks"]:
+            print(f"  No required-field rules in docs/form-requirements for {f['spec']}")
+            continue
 
-    critical_checks = [
-        ("Chapter selection", lambda: any("Check Box1" in f["name"] or "chapter" in f["name"].lower() for f in filled)),
-        ("Venue basis (Q6)", lambda: any("Check Box5" in f["name"] or "venue" in f["name"].lower() for f in filled)),
-        ("Fee payment (Q8)", lambda: any("Check Box7" in f["name"] or "fee" in f["name"].lower() for f in filled)),
-        ("Prior bankruptcy (Q9)", lambda: any("Check Box8" in f["name"] for f in filled)),
-        ("Credit counseling (Q15)", lambda: any("Check Box16" in f["name"] or "Check Box17" in f["name"] for f in filled)),
-        ("Debt type (Q16)", lambda: any("Check Box18" in f["name"] for f in filled)),
-        ("Creditor count (Q18)", lambda: any("Check Box21" in f["name"] for f in filled)),
-        ("Asset estimate (Q19)", lambda: any("Check Box22" in f["name"] for f in filled)),
-        ("Liability estimate (Q20)", lambda: any("Check Box23" in f["name"] for f in filled)),
-        ("Debtor 1 signature", lambda: any(f["name"] == "signature" and f["page"] == 7 for f in filled)),
-        ("Signature date", lambda: any(f["name"] == "Executed on" for f in filled)),
-        ("Attorney name", lambda: any(f["name"] == "Printed name" for f in filled)),
-        ("Attorney bar #", lambda: any(f["name"] == "Bar number" for f in filled)),
-        ("Attorney phone", lambda: any(f["name"] == "phone" for f in filled)),
-        ("Attorney email", lambda: any(f["name"] == "Email address" and f["page"] == 8 for f in filled)),
-        ("District dropdown", lambda: any(f["name"] == "Bankruptcy District Information" for f in filled)),
-        ("Debtor 1 first name", lambda: any(f["name"] == "First name" and f["page"] == 1 for f in filled)),
-        ("Debtor 1 SSN last 4", lambda: any(f["name"] == "SSNum" for f in filled)),
-        ("Debtor 1 address", lambda: any(f["name"] == "Street" and f["page"] == 2 for f in filled)),
-    ]
-
-    pass_count = 0
-    for label, check in critical_checks:
-        ok = check()
-        if ok:
-            pass_count += 1
-        status = "PASS" if ok else "FAIL"
-        icon = "✓" if ok else "✗"
-        print(f"  {icon} {status:4s}  {label}")
-
-    print(f"\n  Score: {pass_count}/{len(critical_checks)} critical checks passed")
-    court_ready = all(check() for _, check in critical_checks)
-    print(f"  Court-fileable: {'YES' if court_ready else 'NO'}")
+        for label, ok in f["checks"]:
+            status = "PASS" if ok else "FAIL"
+            icon = "✓" if ok else "✗"
+            print(f"  {icon} {status:4s}  {label}")
 
+        print(f"\n  Score: {f['critical_passed']}/{f['critical_total']} critical checks passed")
+        print(f"  Court-fileable: {'YES' if f['court_fileable'] else 'NO'}")
+        if f["unknown_fields"]:
+            print(f"  Note: {f['unknown_fields']} field names not in the {f['spec']} spec (template changed?)")
 
-if __name__ == "__main__":
-    if len(sys.argv) < 2:
-        print(f"Usage: python3 {sys.argv[0]} <path_to_pdf> [--json]")
+
+# ---------------------------------------------------------------------------
+# Batch mode
+# ---------------------------------------------------------------------------
+
+def summarize_pdf(path: str) -> list:
+    """Aggregate-report rows (one per form section); runs in a worker, so failures become an error row"""
+    try:
+        fields = read_fields(path)
+    except Exception as e:
+        row = dict.fromkeys(REPORT_FIELDS)
+        row.update({"file": path, "error": f"{type(e).__name__}: {e}"})
+        return [row]
+    rows = []
+    for section in get_catalog().score(fields):
+        row = dict.fromkeys(REPORT_FIELDS)
+        row.update({k: v for k, v in section.items() if k in row})
+        row["file"] = path
+        row["failed_checks"] = [label for label, ok in section["checks"] if not ok]
+        rows.append(row)
+    return rows
+
+
+def expand_inputs(inputs: list) -> list:
+    """PDF paths from files, directories (searched recursively) and globs; sorted, no repeats"""
+    paths = set()
+    for item in inputs:
+        if os.path.isdir(item):
+            for root, _, names in os.walk(item):
+                paths.update(os.path.join(root, n) for n in names if n.lower().endswith(".pdf"))
+        elif os.path.isfile(item):
+            paths.add(item)
+        else:
+            paths.update(p for p in glob.glob(item, recursive=True)
+                         if os.path.isfile(p) and p.lower().endswith(".pdf"))
+    return sorted(paths)
+
+
+def audit_many(paths: list, workers: int = None) -> list:
+    """Rows for every PDF, in input order. PDF parsing is CPU-bound, hence processes"""
+    catalog = get_catalog()
+    workers = max(1, min(workers or os.cpu_count() or 1, len(paths)))
+    if workers == 1:
+        per_file = [summarize_pdf(p) for p in paths]
+    else:
+        # Hand out files in chunks so a big batch isn't one IPC round trip per PDF
+        chunksize = max(1, len(paths) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers, initializer=_set_catalog, initargs=(catalog,)) as pool:
+            per_file = list(pool.map(summarize_pdf, paths, chunksize=chunksize))
+    return [row for rows in per_file for row in rows]
+
+
+def aggregate(rows: list) -> dict:
+    audited = [r for r in rows if not r["error"]]
+    checked = [r for r in audited if r["court_fileable"] is not None]
+    forms = {}
+    failures = {}
+    for r in audited:
+        form = r["form"] or "(unknown)"
+        forms[form] = forms.get(form, 0) + 1
+        for label in r["failed_checks"]:
+            key = f"{form}: {label}"
+            failures[key] = failures.get(key, 0) + 1
+    return {
+        "files": len({r["file"] for r in rows}),
+        "forms": len(audited),
+        "unreadable": len(rows) - len(audited),
+        "by_form": dict(sorted(forms.items())),
+        "checked": len(checked),
+        "court_fileable": sum(1 for r in checked if r["court_fileable"]),
+        "avg_coverage_pct": round(sum(r["coverage_pct"] for r in audited) / len(audited), 1) if audited else 0,
+        "check_failures": dict(sorted(failures.items(), key=lambda item: -item[1])),
+    }
+
+
+def write_report(rows: list, summary: dict, path: str) -> None:
+    """CSV (one row per form found) when the path ends in .csv, otherwise JSON with the summary"""
+    if path.lower().endswith(".csv"):
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=REPORT_FIELDS)
+            writer.writeheader()
+            for row in rows:
+                writer.writerow({**row, "failed_checks": ";".join(row["failed_checks"] or [])})
+        return
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"summary": summary, "files": rows}, f, indent=2)
+
+
+def print_batch(rows: list, summary: dict) -> None:
+    print(f"{'PASSED':>7}  {'COVERAGE':>8}  {'FORM':<12}  {'PAGES':>7}  FILE")
+    for r in rows:
+        if r["error"]:
+            print(f"{'ERROR':>7}  {'':>8}  {'':<12}  {'':>7}  {r['file']}  ({r['error']})")
+            continue
+        if r["court_fileable"] is None:
+            score = f"{'-':>7}"
+        else:
+            mark = "✓" if r["court_fileable"] else "✗"
+            score = f"{mark} {r['critical_passed']:>2}/{r['critical_total']:<2}"
+        span = f"{r['first_page']}-{r['last_page']}"
+        print(f"{score}  {r['coverage_pct']:>7.1f}%  {r['form'] or '(unknown)':<12}  {span:>7}  {r['file']}")
+    print()
+    print(f"  Files: {summary['files']}  |  Forms: {summary['forms']}  |  Unreadable: {summary['unreadable']}"
+          f"  |  Avg coverage: {summary['avg_coverage_pct']}%")
+    print(f"  Court-fileable: {summary['court_fileable']}/{summary['checked']} forms with required-field rules")
+    for label, count in summary["check_failures"].items():
+        print(f"  {count:>5} x FAIL  {label}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Audit filled bankruptcy form PDFs")
+    parser.add_argument("inputs", nargs="+", help="PDF file(s), directories or glob patterns")
+    parser.add_argument("--json", action="store_true", help="Print JSON instead of the readable report")
+    parser.add_argument("--workers", type=int, help="Worker processes for batch mode (default: CPU count)")
+    parser.add_argument("--out", help="Write the aggregate report here (.csv or .json)")
+    parser.add_argument("--specs", default=SPEC_DIR, help="Field inventories (default: docs/form-fields)")
+    parser.add_argument("--rules", default=RULES_DIR, help="Required-field rules (default: docs/form-requirements)")
+    args = parser.parse_args()
+
+    _set_catalog(FormCatalog(args.specs, args.rules))
+
+    # One plain file keeps the detailed single-PDF report
+    if len(args.inputs) == 1 and os.path.isfile(args.inputs[0]) and not args.out:
+        audit_pdf(args.inputs[0], output_json=args.json)
+        return
+
+    paths = expand_inputs(args.inputs)
+    if not paths:
+        print(f"No PDFs found in {' '.join(args.inputs)}")
         sys.exit(1)
+    rows = audit_many(paths, args.workers)
+    summary = aggregate(rows)
+    if args.out:
+        write_report(rows, summary, args.out)
+    if args.json:
+        print(json.dumps({"summary": summary, "files": rows}, indent=2))
+    else:
+        print_batch(rows, summary)
+        if args.out:
+            print(f"\n  Report written to {args.out}")
 
-    pdf_path = sys.argv[1]
-    json_mode = "--json" in sys.argv
 
-    audit_pdf(pdf_path, output_json=json_mode)
+if __name__ == "__main__":
+    main()
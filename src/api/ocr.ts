@@ -24,6 +24,7 @@ export interface OcrResult {
     suggestions: OcrSuggestion[];
     warnings: string[];
     document_type: string;
+    document_id?: string;
 }
 
 export interface ValidationResult {
@@ -31,6 +32,7 @@ export interface ValidationResult {
     extracted_value: string;
     confidence: number;
     message: string;
+    document_id?: string;
 }
 
 // OCR API base URL from environment